@@ -0,0 +1,48 @@
+"""Images/sec of MangaOcrProvider at different batch sizes.
+
+Usage:
+    python benchmarks/bench_manga_ocr_batch.py --images ./screenshots/Miharu/Prologue
+
+Loads the model once, warms it up on the first image, then times
+``extract_text_batch`` over the same images at each batch size.
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+
+from jp_anki_builder.ocr import MangaOcrProvider
+from jp_anki_builder.scan import _collect_images
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--images", required=True, help="Image file or directory.")
+    parser.add_argument("--batch-sizes", default="1,4,8,16", help="Comma-separated batch sizes.")
+    parser.add_argument("--limit", type=int, default=64, help="Max images to time.")
+    args = parser.parse_args()
+
+    images = _collect_images(Path(args.images))[: args.limit]
+    if not images:
+        raise SystemExit(f"No image files found at: {args.images}")
+
+    provider = MangaOcrProvider()
+    provider.extract_text(images[0])
+
+    baseline: list[str] | None = None
+    for batch_size in (int(value) for value in args.batch_sizes.split(",")):
+        start = time.perf_counter()
+        texts = provider.extract_text_batch(images, batch_size=batch_size)
+        elapsed = time.perf_counter() - start
+        if baseline is None:
+            baseline = texts
+        changed = sum(1 for a, b in zip(baseline, texts, strict=True) if a != b)
+        print(
+            f"batch_size={batch_size:>3}: {len(images) / elapsed:6.2f} images/sec "
+            f"({elapsed:.1f}s, {changed} text(s) differ from first batch size)"
+        )
+
+
+if __name__ == "__main__":
+    main()
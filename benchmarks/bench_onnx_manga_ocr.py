@@ -0,0 +1,75 @@
+"""Accuracy and speed of onnx-manga-ocr against the PyTorch manga-ocr model.
+
+Usage:
+    python benchmarks/bench_onnx_manga_ocr.py --images ./fixtures/labelled --threads 4
+
+Every image needs a sidecar ``.txt`` label next to it (the same files
+``--ocr-mode sidecar`` reads). Both providers OCR every labelled image after a
+warm-up; the script prints images/sec, exact-match rate and character error
+rate (CER) against the labels for each, plus how often the two agree.
+"""
+from __future__ import annotations
+
+import argparse
+import re
+import time
+from pathlib import Path
+
+from jp_anki_builder.ocr import MangaOcrProvider, SidecarOcrProvider
+from jp_anki_builder.onnx_ocr import OnnxMangaOcrProvider, onnx_model_dir
+from jp_anki_builder.scan import _collect_images
+
+
+def _edit_distance(a: str, b: str) -> int:
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, start=1):
+        current = [i]
+        for j, char_b in enumerate(b, start=1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        previous = current
+    return previous[-1]
+
+
+def _score(name: str, texts: list[str], labels: list[str], elapsed: float) -> None:
+    exact = sum(1 for text, label in zip(texts, labels, strict=True) if text == label)
+    errors = sum(_edit_distance(text, label) for text, label in zip(texts, labels, strict=True))
+    chars = sum(len(label) for label in labels) or 1
+    print(
+        f"{name:>15}: {len(texts) / elapsed:6.2f} images/sec  "
+        f"exact={exact}/{len(labels)}  CER={errors / chars:.2%}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--images", required=True, help="Directory of images with .txt sidecar labels.")
+    parser.add_argument("--data-dir", default="data", help="Data directory holding models/manga-ocr-onnx.")
+    parser.add_argument("--threads", type=int, default=0, help="ONNX Runtime intra-op threads (0 = default).")
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--limit", type=int, default=200, help="Max images to compare.")
+    args = parser.parse_args()
+
+    sidecar = SidecarOcrProvider()
+    images = [path for path in _collect_images(Path(args.images)) if path.with_suffix(".txt").exists()]
+    images = images[: args.limit]
+    if not images:
+        raise SystemExit(f"No sidecar-labelled images found at: {args.images}")
+    labels = [re.sub(r"\s+", "", sidecar.extract_text(path)) for path in images]
+
+    providers = {
+        "manga-ocr": MangaOcrProvider(),
+        "onnx-manga-ocr": OnnxMangaOcrProvider(model_dir=onnx_model_dir(args.data_dir), threads=args.threads),
+    }
+    outputs: dict[str, list[str]] = {}
+    for name, provider in providers.items():
+        provider.warm_up()
+        start = time.perf_counter()
+        outputs[name] = provider.extract_text_batch(images, batch_size=args.batch_size)
+        _score(name, outputs[name], labels, time.perf_counter() - start)
+
+    agree = sum(1 for a, b in zip(outputs["manga-ocr"], outputs["onnx-manga-ocr"], strict=True) if a == b)
+    print(f"images={len(images)} identical outputs: {agree}/{len(images)}")
+
+
+if __name__ == "__main__":
+    main()
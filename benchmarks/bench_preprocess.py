@@ -0,0 +1,87 @@
+"""Per-image time and peak variant memory of Tesseract preprocessing.
+
+Usage:
+    python benchmarks/bench_preprocess.py --images ./screenshots/Miharu/Prologue
+
+Compares the previous approach (three ``Image.point`` lambda thresholds of a
+2x upscale, all held for the whole sweep) against ``PreprocessedVariants``,
+which thresholds one NumPy array and releases each variant after use. Memory
+is the bytes of variant pixel buffers alive at the same time.
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+from pathlib import Path
+
+from PIL import Image
+
+from jp_anki_builder.ocr import PreprocessedVariants
+from jp_anki_builder.scan import _collect_images
+
+
+def _legacy_variants(image):
+    width, height = image.size
+    up2 = image.convert("L").resize((width * 2, height * 2))
+    return up2, [
+        up2.point(lambda p: 255 if p > 140 else 0),
+        up2.point(lambda p: 255 if p > 160 else 0),
+        up2.point(lambda p: 255 if p > 180 else 0),
+    ]
+
+
+def _time_legacy(image) -> tuple[float, int]:
+    start = time.perf_counter()
+    up2, variants = _legacy_variants(image)
+    elapsed = time.perf_counter() - start
+    live = sum(v.width * v.height for v in [up2, *variants])
+    return elapsed, live
+
+
+def _time_numpy(image) -> tuple[float, int]:
+    variants = PreprocessedVariants(image)
+    names = [name for name in variants.names if name != "orig"]
+    variants.schedule(names)
+    start = time.perf_counter()
+    for name in names:
+        variants.acquire(name)
+        variants.release(name)
+    return time.perf_counter() - start, variants.peak_bytes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--images", required=True, help="Image file or directory.")
+    parser.add_argument("--limit", type=int, default=50, help="Max images to time.")
+    args = parser.parse_args()
+
+    images = _collect_images(Path(args.images))[: args.limit]
+    if not images:
+        raise SystemExit(f"No image files found at: {args.images}")
+
+    legacy_times, legacy_peaks, numpy_times, numpy_peaks = [], [], [], []
+    for path in images:
+        with Image.open(path) as image:
+            image.load()
+            elapsed, peak = _time_legacy(image)
+            legacy_times.append(elapsed)
+            legacy_peaks.append(peak)
+            elapsed, peak = _time_numpy(image)
+            numpy_times.append(elapsed)
+            numpy_peaks.append(peak)
+
+    mb = 1024 * 1024
+    print(f"images={len(images)}")
+    print(
+        f"legacy (3 thresholds): median {statistics.median(legacy_times) * 1000:.1f} ms, "
+        f"peak variants {max(legacy_peaks) / mb:.1f} MB"
+    )
+    print(
+        f"numpy  (3 thresholds + otsu): median {statistics.median(numpy_times) * 1000:.1f} ms, "
+        f"peak variants {max(numpy_peaks) / mb:.1f} MB"
+    )
+
+
+if __name__ == "__main__":
+    main()
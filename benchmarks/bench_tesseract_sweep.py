@@ -0,0 +1,71 @@
+"""Per-image wall-clock of the Tesseract candidate sweep, serial vs. parallel.
+
+Usage:
+    python benchmarks/bench_tesseract_sweep.py --images ./screenshots/Miharu/Prologue --workers 4
+    python benchmarks/bench_tesseract_sweep.py --images ./screenshots/Miharu/Prologue --ocr-mode tesseract-api
+
+Runs every image through the serial ``tesseract`` CLI sweep once and through
+``--ocr-mode`` with ``--workers`` once, checks that the ranked output is
+identical, and prints the per-image speedup.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import time
+from pathlib import Path
+
+from jp_anki_builder.ocr import TesseractOcrProvider, build_ocr_provider
+from jp_anki_builder.scan import _collect_images
+
+
+def _time_sweep(provider: TesseractOcrProvider, image: Path) -> tuple[float, list[str]]:
+    start = time.perf_counter()
+    texts = provider.extract_text_candidates(image)
+    return time.perf_counter() - start, texts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--images", required=True, help="Image file or directory.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--ocr-mode", default="tesseract", choices=("tesseract", "tesseract-api"))
+    parser.add_argument("--language", default="jpn")
+    parser.add_argument("--tesseract-cmd", default=None)
+    parser.add_argument("--limit", type=int, default=20, help="Max images to time.")
+    args = parser.parse_args()
+
+    images = _collect_images(Path(args.images))[: args.limit]
+    if not images:
+        raise SystemExit(f"No image files found at: {args.images}")
+
+    serial = TesseractOcrProvider(language=args.language, tesseract_cmd=args.tesseract_cmd, workers=1)
+    parallel = build_ocr_provider(
+        args.ocr_mode,
+        language=args.language,
+        tesseract_cmd=args.tesseract_cmd,
+        tesseract_workers=args.workers,
+    )
+
+    serial_times: list[float] = []
+    parallel_times: list[float] = []
+    mismatches = 0
+    for image in images:
+        serial_s, serial_texts = _time_sweep(serial, image)
+        parallel_s, parallel_texts = _time_sweep(parallel, image)
+        serial_times.append(serial_s)
+        parallel_times.append(parallel_s)
+        if serial_texts != parallel_texts:
+            mismatches += 1
+        print(f"{image.name}: serial={serial_s:.2f}s parallel={parallel_s:.2f}s x{serial_s / parallel_s:.2f}")
+
+    serial_med = statistics.median(serial_times)
+    parallel_med = statistics.median(parallel_times)
+    print(f"images={len(images)} mode={args.ocr_mode} workers={args.workers} cpus={os.cpu_count()}")
+    print(f"median serial={serial_med:.2f}s parallel={parallel_med:.2f}s speedup=x{serial_med / parallel_med:.2f}")
+    print(f"ranked output mismatches: {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
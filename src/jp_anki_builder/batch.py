@@ -0,0 +1,127 @@
+"""Many runs in one process for ``jp-anki-build batch``.
+
+Working through a backlog with one ``run`` per chapter folder pays Python
+start-up, OCR model loading, Sudachi and dictionary loading for every
+chapter. ``batch`` finds the run folders under a root and scans, reviews and
+builds them one after another in one process, handing every run the same
+``SharedResources`` so those components load once. With ``--workers`` the
+scan worker pool is shared the same way.
+"""
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+from jp_anki_builder.build import NoBuildableWordsError
+from jp_anki_builder.discovery import iter_image_dirs
+from jp_anki_builder.path_inference import infer_source_and_run_id
+from jp_anki_builder.pipeline import Pipeline
+from jp_anki_builder.scan import IMAGE_EXTENSIONS
+from jp_anki_builder.shared import SharedResources
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BatchRun:
+    """One run folder: its images (not those of its subfolders), in the order
+    ``scan`` reads a folder, and where the run is stored."""
+
+    folder: Path
+    images: list[Path]
+    source: str
+    run_id: str
+
+
+@dataclass
+class BatchResult:
+    source: str
+    run_id: str
+    status: str = "ok"
+    image_count: int = 0
+    candidate_count: int = 0
+    approved_count: int = 0
+    note_count: int = 0
+    seconds: float = 0.0
+    error: str | None = None
+
+
+def discover_runs(root: Path) -> list[BatchRun]:
+    """Every folder under *root* that directly holds images, in natural order.
+
+    Source and run id follow the ``--images`` path inference: the folder's
+    parent and the folder itself. Two folders that would share a run raise
+    ValueError.
+    """
+    runs: list[BatchRun] = []
+    owners: dict[tuple[str, str], Path] = {}
+    for images in iter_image_dirs(root, IMAGE_EXTENSIONS):
+        folder = images[0].parent
+        source, run_id = infer_source_and_run_id(str(folder))
+        if source is None or run_id is None:
+            raise ValueError(f"Cannot infer source and run id for {folder}.")
+        if (source, run_id) in owners:
+            raise ValueError(
+                f"{owners[source, run_id]} and {folder} would both be run {source}/{run_id}; rename one of them."
+            )
+        owners[source, run_id] = folder
+        runs.append(BatchRun(folder=folder, images=sorted(images), source=source, run_id=run_id))
+    return runs
+
+
+def run_batch(runs: list[BatchRun], pipeline: Pipeline, options: Callable[[BatchRun], dict],
+              on_result: Callable[[BatchResult], None] | None = None, resume: bool = False,
+              on_progress: Callable[[str], None] | None = None) -> list[BatchResult]:
+    """Scan, review and build each of *runs* with shared components.
+
+    *options(run)* returns the run's ``ScanOptions`` under ``scan`` and its
+    ``build`` keyword arguments for *pipeline*; *resume* continues each
+    run's interrupted scan, and *on_progress* receives each scan's notices.
+    A run that fails is reported in its result and the batch moves on; its
+    shared components are closed and load again for the next run, since a
+    failed OCR backend or worker pool may be unusable.
+    """
+    shared = SharedResources()
+    results: list[BatchResult] = []
+    try:
+        for run in runs:
+            started = time.perf_counter()
+            result = BatchResult(source=run.source, run_id=run.run_id)
+            try:
+                settings = options(run)
+                scan_result = pipeline.scan(
+                    images=str(run.folder), source=run.source, run_id=run.run_id, options=settings["scan"],
+                    resume=resume, image_files=run.images, shared=shared, on_progress=on_progress,
+                )
+                result.image_count = scan_result["image_count"]
+                result.candidate_count = scan_result["candidate_count"]
+                if not result.candidate_count:
+                    result.status = "no candidates"
+                else:
+                    review_result = pipeline.review(source=run.source, run_id=run.run_id)
+                    result.approved_count = review_result["approved_count"]
+                    if not result.approved_count:
+                        result.status = "nothing approved"
+                    else:
+                        build_result = pipeline.build(
+                            source=run.source, run_id=run.run_id, shared=shared, **settings["build"]
+                        )
+                        result.note_count = build_result["note_count"]
+            except NoBuildableWordsError:
+                result.status = "no meanings"
+            except Exception as exc:
+                # Any failure, including an unexpected one, only costs this run.
+                logger.warning("run %s/%s failed: %s", run.source, run.run_id, exc)
+                result.status = "failed"
+                result.error = str(exc)
+                shared.close()
+            result.seconds = time.perf_counter() - started
+            results.append(result)
+            if on_result is not None:
+                on_result(result)
+    finally:
+        shared.close()
+    return results
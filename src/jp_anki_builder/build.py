@@ -8,8 +8,9 @@ from pathlib import Path
 
 from jp_anki_builder.cards import build_deck_name, build_note_fields
 from jp_anki_builder.config import RunPaths
-from jp_anki_builder.dictionary import WordExistsCache, build_offline_dictionary, build_online_dictionary
+from jp_anki_builder.dictionary import build_offline_dictionary, build_online_dictionary
 from jp_anki_builder.enrich import enrich_word
+from jp_anki_builder.shared import SharedResources
 
 logger = logging.getLogger(__name__)
 
@@ -56,6 +57,7 @@ def run_build(
     volume: str | None = None,
     chapter: str | None = None,
     online_dict: str = "off",
+    shared: SharedResources | None = None,
 ) -> BuildSummary:
     paths = RunPaths(base_dir=base_dir, source_id=source, run_id=run_id)
     if not paths.review_artifact.exists():
@@ -64,12 +66,11 @@ def run_build(
     payload = json.loads(paths.review_artifact.read_text(encoding="utf-8-sig"))
     approved_words = payload.get("approved_candidates", [])
 
-    offline = build_offline_dictionary(base_dir)
-    online = build_online_dictionary(online_dict)
-
-    # Pre-warm word existence cache from scan stage
-    cache = WordExistsCache(offline, online)
-    cache.load(paths.word_cache)
+    if shared is not None:
+        offline, online = shared.dictionaries(base_dir, online_dict)
+    else:
+        offline = build_offline_dictionary(base_dir)
+        online = build_online_dictionary(online_dict)
 
     logger.info("building deck for %d approved word(s)", len(approved_words))
     enriched = [enrich_word(word, offline=offline, online=online, max_meanings=3) for word in approved_words]
@@ -4,14 +4,25 @@ import typer
 
 from jp_anki_builder.build import NoBuildableWordsError
 from jp_anki_builder.dict_install import DEFAULT_JMDICT_E_URL, install_jmdict_offline_json, install_jlpt_from_file
+from jp_anki_builder.ocr_cache import DEFAULT_MAX_MB, OcrResultCache, ocr_cache_path
 from jp_anki_builder.path_inference import infer_source_and_run_id
 from jp_anki_builder.pipeline import Pipeline
-from jp_anki_builder.project_config import VALID_KEYS, get_config, load_project_config, set_config, unset_config
+from jp_anki_builder.project_config import (
+    VALID_KEYS,
+    get_config,
+    load_project_config,
+    parse_roi,
+    set_config,
+    unset_config,
+)
 from jp_anki_builder.review import prepare_review
+from jp_anki_builder.scan import ScanOptions
 
 app = typer.Typer()
 config_app = typer.Typer(help="View and update project/source configuration.")
 app.add_typer(config_app, name="config")
+cache_app = typer.Typer(help="Inspect and prune the shared OCR result cache.")
+app.add_typer(cache_app, name="cache")
 WORD_PREVIEW_LIMIT = 10
 
 
@@ -63,12 +74,111 @@ def _emit_empty_build_guidance(missing_meaning_words: list[str]) -> None:
     typer.echo("[NEXT] Or rerun with --online-dict jisho")
 
 
-def _resolve_defaults(images: str, source: str | None, run_id: str | None,
-                      data_dir: str, ocr_mode: str | None, ocr_language: str | None,
-                      online_dict: str | None, no_preprocess: bool | None,
-                      volume: str | None = None, chapter: str | None = None,
-                      ) -> dict:
-    """Resolve CLI args with config-file defaults and path inference."""
+def _emit_scan_progress(message: str) -> None:
+    typer.echo(f"[INFO] {message}")
+
+
+def _emit_scan_stats(result: dict) -> None:
+    stats = result.get("stats") or {}
+    if stats.get("daemon"):
+        typer.echo("[INFO] OCR and tokenization ran in the jp-anki-build serve daemon.")
+    if "discovery_listed" in stats:
+        typer.echo(
+            f"[INFO] Discovery: {int(stats['discovery_listed'])} folder(s) listed, "
+            f"{int(stats['discovery_reused'])} unchanged since the last run"
+        )
+    if "stage_ocr_util" in stats:
+        stages = []
+        for name in ("read", "ocr", "nlp", "write"):
+            threads = int(stats[f"stage_{name}_threads"])
+            suffix = f" ({threads} threads)" if threads > 1 else ""
+            stages.append(f"{name} {stats[f'stage_{name}_util']:.0%}{suffix}")
+        typer.echo(f"[INFO] Pipeline stage utilization: {', '.join(stages)}")
+    if "workers" in stats:
+        typer.echo(f"[INFO] Workers: OCR and tokenization ran in {int(stats['workers'])} worker processes.")
+    if "diff_unchanged" in stats:
+        typer.echo(
+            f"[INFO] Sequential diff: {int(stats['diff_unchanged'])} image(s) unchanged (OCR skipped), "
+            f"{int(stats['diff_partial'])} OCR'd on the changed box only, {int(stats['diff_full'])} OCR'd whole"
+        )
+    if "ocr_avoided" in stats:
+        typer.echo(
+            f"[INFO] OCR calls avoided: {int(stats['ocr_avoided'])} near-duplicate image(s) reused earlier results"
+        )
+    if "ocr_calls" in stats:
+        per_image = stats["ocr_calls"] / max(stats.get("ocr_images", 1), 1)
+        typer.echo(f"[INFO] OCR calls: {int(stats['ocr_calls'])} ({per_image:.1f} per image)")
+    if "ocr_cache_hits" in stats or "ocr_cache_misses" in stats:
+        typer.echo(
+            f"[INFO] OCR cache: {int(stats.get('ocr_cache_hits', 0))} hit(s), "
+            f"{int(stats.get('ocr_cache_misses', 0))} miss(es)"
+        )
+    if "video_frames" in stats:
+        typer.echo(
+            f"[INFO] Video: {int(stats.get('video_sampled', 0))} frame(s) with changed text sampled from "
+            f"{int(stats['video_frames'])} decoded ({stats.get('video_seconds', 0.0):.1f}s of video)"
+        )
+    if "autocrop_cropped" in stats:
+        typer.echo(
+            f"[INFO] Autocrop: {int(stats['autocrop_cropped'])} image(s) cropped to text, "
+            f"{int(stats['autocrop_full_frame'])} kept the full frame (low detection confidence)"
+        )
+    if "ocr_worker_restarts" in stats:
+        typer.echo(
+            f"[INFO] OCR timeouts: {int(stats.get('ocr_timeouts', 0))} image(s) skipped, "
+            f"{int(stats['ocr_worker_restarts'])} worker restart(s)"
+        )
+    if "ocr_crashes" in stats:
+        typer.echo(f"[INFO] OCR worker crashes: {int(stats['ocr_crashes'])} image(s) skipped")
+    if "cascade_images" in stats:
+        typer.echo(
+            f"[INFO] Cascade: {int(stats['cascade_escalated'])} of {int(stats['cascade_images'])} image(s) "
+            "escalated from Tesseract to manga-ocr"
+        )
+    if "sweep_learned_combos" in stats:
+        typer.echo(
+            f"[INFO] Learned sweep: top {int(stats['sweep_learned_combos'])} combo(s) on "
+            f"{int(stats.get('sweep_learned_images', 0))} image(s), full-sweep samples "
+            f"{int(stats.get('sweep_sample_images', 0))} ({int(stats.get('sweep_drift', 0))} drifted)"
+        )
+    if "orientation_checked" in stats:
+        typer.echo(
+            f"[INFO] Orientation: {int(stats['orientation_pruned'])} of {int(stats['orientation_checked'])} "
+            "image(s) ran a single Tesseract config"
+        )
+    if "roi_images" in stats:
+        typer.echo(
+            f"[INFO] ROI: {int(stats['roi_images'])} image(s) OCR'd by configured region, "
+            f"{int(stats['roi_full_frame'])} scanned whole (roi did not fit)"
+        )
+    if stats.get("ocr_timed_images"):
+        timed = stats["ocr_timed_images"]
+        pixels = f", {stats['ocr_pixels'] / timed / 1e6:.2f} MP per image" if "ocr_pixels" in stats else ""
+        typer.echo(
+            f"[INFO] OCR time: {stats['ocr_seconds']:.1f}s ({stats['ocr_seconds'] / timed:.2f}s per image){pixels}"
+        )
+    if "time_to_first_result_s" in stats:
+        typer.echo(
+            f"[INFO] Time to first result: {stats['time_to_first_result_s']:.2f}s "
+            f"(waited {stats.get('warmup_wait_s', 0.0):.2f}s for model warm-up)"
+        )
+
+
+def _scan_input(images: str | None, video: str | None) -> str:
+    """The path a scan reads: --images or --video, exactly one of them."""
+    if (images is None) == (video is None):
+        raise typer.BadParameter("Provide exactly one of --images or --video.", param_hint="--images")
+    return video if video is not None else images
+
+
+def _resolve_defaults(images: str, source: str | None, run_id: str | None, data_dir: str,
+                      volume: str | None = None, chapter: str | None = None, **flags) -> dict:
+    """Resolve CLI args with config-file defaults and path inference.
+
+    *flags* are the command's scan flags, named like their config keys and
+    None when not given. Returns the source, run id, volume and chapter, and
+    the resolved ``ScanOptions`` under ``"scan"``.
+    """
     # Load config-file defaults (project-level, then source-level)
     cfg = load_project_config(data_dir=data_dir, source=source)
 
@@ -91,35 +201,160 @@ def _resolve_defaults(images: str, source: str | None, run_id: str | None,
             param_hint="--run-id",
         )
 
+    def pick(key: str, default):
+        """The CLI flag, else the config value, else *default*."""
+        for value in (flags.get(key), getattr(cfg, key)):
+            if value is not None:
+                return value
+        return default
+
+    options = ScanOptions(
+        ocr_mode=pick("ocr_mode", "manga-ocr"),
+        ocr_language=pick("ocr_language", "jpn"),
+        tesseract_cmd=pick("tesseract_cmd", None),
+        tesseract_workers=pick("tesseract_workers", 1),
+        tesseract_search=pick("tesseract_search", "full"),
+        tesseract_min_score=pick("tesseract_min_score", 40.0),
+        preprocess=not pick("no_preprocess", False),
+        ocr_batch_size=pick("ocr_batch_size", 8),
+        ocr_cache=not pick("no_ocr_cache", False),
+        ocr_cache_max_mb=pick("ocr_cache_max_mb", DEFAULT_MAX_MB),
+        dedup_distance=pick("dedup_distance", None),
+        onnx_threads=pick("onnx_threads", 0),
+        use_daemon=not pick("no_daemon", False),
+        autocrop=pick("autocrop", False),
+        roi=pick("roi", None),
+        cascade_min_known=pick("cascade_min_known", 0.5),
+        sidecar_manifest=pick("sidecar_manifest", None),
+        ocr_timeout=pick("ocr_timeout", None),
+        tesseract_orientation=pick("tesseract_orientation", False),
+        tesseract_learned_k=pick("tesseract_learned_k", 2),
+        sequential_diff=pick("sequential_diff", False),
+        workers=pick("workers", 1),
+        pipelined=pick("pipelined", False),
+        ocr_threads=pick("ocr_threads", 1),
+        nlp_threads=pick("nlp_threads", 1),
+        stream_discovery=pick("stream_discovery", False),
+        online_dict=pick("online_dict", "off"),
+    )
     return {
         "source": source,
         "run_id": run_id,
-        "ocr_mode": ocr_mode or cfg.ocr_mode or "manga-ocr",
-        "ocr_language": ocr_language or cfg.ocr_language or "jpn",
-        "online_dict": online_dict or cfg.online_dict or "off",
-        "no_preprocess": no_preprocess if no_preprocess is not None else (cfg.no_preprocess or False),
         "volume": volume or cfg.volume,
         "chapter": chapter or cfg.chapter,
+        "scan": options,
     }
 
 
 @app.command()
 def scan(
-    images: str = typer.Option(..., help="Image file or directory path."),
+    images: str | None = typer.Option(None, help="Image file or directory path."),
+    video: str | None = typer.Option(
+        None,
+        help="Gameplay recording to OCR instead of --images; only frames where the text changed are scanned.",
+    ),
     source: str | None = typer.Option(None, help="Source id (auto-derived from path if omitted)."),
     run_id: str | None = typer.Option(None, help="Run id (auto-derived from path if omitted)."),
     data_dir: str = typer.Option("data", help="Data storage directory."),
-    ocr_mode: str | None = typer.Option(None, help="OCR backend: tesseract, manga-ocr, or sidecar."),
+    ocr_mode: str | None = typer.Option(None, help="OCR backend: manga-ocr, onnx-manga-ocr, tesseract, tesseract-api, cascade, or sidecar."),
     ocr_language: str | None = typer.Option(None, help="OCR language code (tesseract mode)."),
     tesseract_cmd: str | None = typer.Option(
         None,
         help="Optional full path to tesseract executable.",
     ),
+    tesseract_workers: int | None = typer.Option(
+        None,
+        help="Concurrent tesseract calls per image during the candidate sweep (tesseract mode).",
+    ),
+    tesseract_search: str | None = typer.Option(
+        None,
+        help="Tesseract candidate search: full (every config/variant), tiered (stop early on a confident match) "
+        "or quick (first tier only).",
+    ),
+    tesseract_min_score: float | None = typer.Option(
+        None,
+        help="Score a tiered-search candidate must reach before the sweep stops early.",
+    ),
     no_preprocess: bool | None = typer.Option(
         None,
         "--no-preprocess",
         help="Disable basic OCR image preprocessing.",
     ),
+    ocr_batch_size: int | None = typer.Option(
+        None,
+        help="Images per OCR forward pass for backends that support batching (manga-ocr).",
+    ),
+    no_ocr_cache: bool | None = typer.Option(
+        None,
+        "--no-ocr-cache",
+        help="Always re-run OCR instead of reusing results from data/cache/ocr.",
+    ),
+    dedup_distance: int | None = typer.Option(
+        None,
+        help="Reuse OCR for images whose perceptual hash is within this many bits of an earlier image (off if unset).",
+    ),
+    onnx_threads: int | None = typer.Option(
+        None,
+        help="ONNX Runtime intra-op threads for onnx-manga-ocr mode (0 = runtime default).",
+    ),
+    no_daemon: bool | None = typer.Option(
+        None,
+        "--no-daemon",
+        help="Run OCR and tokenization in this process even if a jp-anki-build serve daemon is running.",
+    ),
+    autocrop: bool | None = typer.Option(
+        None,
+        "--autocrop",
+        help="OCR only the detected text area of each frame (full frame when detection is unsure).",
+    ),
+    cascade_min_known: float | None = typer.Option(
+        None,
+        help="Cascade mode: escalate to manga-ocr when less than this share (0-1) of the Tesseract words are known.",
+    ),
+    sidecar_manifest: str | None = typer.Option(
+        None,
+        help="Sidecar mode: JSONL/TSV manifest mapping image paths or hashes to text, instead of one .txt per image.",
+    ),
+    ocr_timeout: float | None = typer.Option(
+        None,
+        help="Seconds allowed per image; OCR then runs in a worker process that is restarted on timeout (off if unset).",
+    ),
+    tesseract_orientation: bool | None = typer.Option(
+        None,
+        "--tesseract-orientation",
+        help="Classify each frame as horizontal or vertical text first and run only the matching Tesseract config.",
+    ),
+    tesseract_learned_k: int | None = typer.Option(
+        None,
+        help="Once a source has enough history, run only the K Tesseract sweep combos that won most often (0 = full sweep).",
+    ),
+    sequential_diff: bool | None = typer.Option(
+        None,
+        "--sequential-diff",
+        help="Diff each image against the previous one: reuse its OCR if unchanged, else OCR only the changed box.",
+    ),
+    workers: int | None = typer.Option(
+        None,
+        help="Scan in N worker processes, each loading its own OCR backend and normalizer (1 = in-process).",
+    ),
+    pipelined: bool | None = typer.Option(
+        None,
+        "--pipelined",
+        help="Overlap OCR, normalization and artifact writing in threaded stages with bounded queues.",
+    ),
+    ocr_threads: int | None = typer.Option(
+        None,
+        help="With --pipelined: OCR threads, each with its own OCR backend (always 1 for manga-ocr modes).",
+    ),
+    nlp_threads: int | None = typer.Option(
+        None,
+        help="With --pipelined: normalization threads, each with its own Sudachi tokenizer.",
+    ),
+    stream_discovery: bool | None = typer.Option(
+        None,
+        "--stream-discovery",
+        help="Walk the image folder in the background and scan each directory as soon as it is listed (natural file order).",
+    ),
     online_dict: str | None = typer.Option(None, help="Online fallback dictionary for compound detection: off or jisho."),
     resume: bool = typer.Option(
         False,
@@ -128,25 +363,31 @@ def scan(
     ),
 ) -> None:
     """Scan screenshots and produce OCR/candidate artifacts."""
+    images = _scan_input(images, video)
     d = _resolve_defaults(
         images=images, source=source, run_id=run_id, data_dir=data_dir,
-        ocr_mode=ocr_mode, ocr_language=ocr_language, online_dict=online_dict,
-        no_preprocess=no_preprocess,
+        ocr_mode=ocr_mode, ocr_language=ocr_language, tesseract_cmd=tesseract_cmd, online_dict=online_dict,
+        no_preprocess=no_preprocess, tesseract_workers=tesseract_workers,
+        tesseract_search=tesseract_search, tesseract_min_score=tesseract_min_score,
+        ocr_batch_size=ocr_batch_size, no_ocr_cache=no_ocr_cache,
+        dedup_distance=dedup_distance, onnx_threads=onnx_threads, no_daemon=no_daemon, autocrop=autocrop,
+        cascade_min_known=cascade_min_known, sidecar_manifest=sidecar_manifest, ocr_timeout=ocr_timeout,
+        tesseract_orientation=tesseract_orientation, tesseract_learned_k=tesseract_learned_k,
+        sequential_diff=sequential_diff, workers=workers, pipelined=pipelined, ocr_threads=ocr_threads,
+        nlp_threads=nlp_threads, stream_discovery=stream_discovery,
     )
     try:
         result = Pipeline(data_dir=data_dir).scan(
             images=images,
             source=d["source"],
             run_id=d["run_id"],
-            ocr_mode=d["ocr_mode"],
-            ocr_language=d["ocr_language"],
-            tesseract_cmd=tesseract_cmd,
-            preprocess=not d["no_preprocess"],
-            online_dict=d["online_dict"],
+            options=d["scan"],
+            video=video is not None,
             resume=resume,
+            on_progress=_emit_scan_progress,
         )
     except ValueError as exc:
-        raise typer.BadParameter(str(exc), param_hint="--images") from exc
+        raise typer.BadParameter(str(exc), param_hint="--video" if video else "--images") from exc
     except RuntimeError as exc:
         raise typer.BadParameter(str(exc), param_hint="--ocr-mode") from exc
 
@@ -156,6 +397,7 @@ def scan(
     typer.echo(f"[OK] I processed {result['image_count']} image(s).")
     typer.echo(f"[OK] I found {result['candidate_count']} candidate word(s).")
     typer.echo(f"[INFO] Candidate preview: {_format_word_preview(result.get('candidates', []))}")
+    _emit_scan_stats(result)
     typer.echo(f"[INFO] Saved scan results to: {result['artifact_path']}")
 
 
@@ -262,21 +504,113 @@ def build(
 
 @app.command()
 def run(
-    images: str = typer.Option(..., help="Image file or directory path."),
+    images: str | None = typer.Option(None, help="Image file or directory path."),
+    video: str | None = typer.Option(
+        None,
+        help="Gameplay recording to OCR instead of --images; only frames where the text changed are scanned.",
+    ),
     source: str | None = typer.Option(None, help="Source id (auto-derived from path if omitted)."),
     run_id: str | None = typer.Option(None, help="Run id (auto-derived from path if omitted)."),
     data_dir: str = typer.Option("data", help="Data storage directory."),
-    ocr_mode: str | None = typer.Option(None, help="OCR backend: tesseract, manga-ocr, or sidecar."),
+    ocr_mode: str | None = typer.Option(None, help="OCR backend: manga-ocr, onnx-manga-ocr, tesseract, tesseract-api, cascade, or sidecar."),
     ocr_language: str | None = typer.Option(None, help="OCR language code (tesseract mode)."),
     tesseract_cmd: str | None = typer.Option(
         None,
         help="Optional full path to tesseract executable.",
     ),
+    tesseract_workers: int | None = typer.Option(
+        None,
+        help="Concurrent tesseract calls per image during the candidate sweep (tesseract mode).",
+    ),
+    tesseract_search: str | None = typer.Option(
+        None,
+        help="Tesseract candidate search: full (every config/variant), tiered (stop early on a confident match) "
+        "or quick (first tier only).",
+    ),
+    tesseract_min_score: float | None = typer.Option(
+        None,
+        help="Score a tiered-search candidate must reach before the sweep stops early.",
+    ),
     no_preprocess: bool | None = typer.Option(
         None,
         "--no-preprocess",
         help="Disable basic OCR image preprocessing.",
     ),
+    ocr_batch_size: int | None = typer.Option(
+        None,
+        help="Images per OCR forward pass for backends that support batching (manga-ocr).",
+    ),
+    no_ocr_cache: bool | None = typer.Option(
+        None,
+        "--no-ocr-cache",
+        help="Always re-run OCR instead of reusing results from data/cache/ocr.",
+    ),
+    dedup_distance: int | None = typer.Option(
+        None,
+        help="Reuse OCR for images whose perceptual hash is within this many bits of an earlier image (off if unset).",
+    ),
+    onnx_threads: int | None = typer.Option(
+        None,
+        help="ONNX Runtime intra-op threads for onnx-manga-ocr mode (0 = runtime default).",
+    ),
+    no_daemon: bool | None = typer.Option(
+        None,
+        "--no-daemon",
+        help="Run OCR and tokenization in this process even if a jp-anki-build serve daemon is running.",
+    ),
+    autocrop: bool | None = typer.Option(
+        None,
+        "--autocrop",
+        help="OCR only the detected text area of each frame (full frame when detection is unsure).",
+    ),
+    cascade_min_known: float | None = typer.Option(
+        None,
+        help="Cascade mode: escalate to manga-ocr when less than this share (0-1) of the Tesseract words are known.",
+    ),
+    sidecar_manifest: str | None = typer.Option(
+        None,
+        help="Sidecar mode: JSONL/TSV manifest mapping image paths or hashes to text, instead of one .txt per image.",
+    ),
+    ocr_timeout: float | None = typer.Option(
+        None,
+        help="Seconds allowed per image; OCR then runs in a worker process that is restarted on timeout (off if unset).",
+    ),
+    tesseract_orientation: bool | None = typer.Option(
+        None,
+        "--tesseract-orientation",
+        help="Classify each frame as horizontal or vertical text first and run only the matching Tesseract config.",
+    ),
+    tesseract_learned_k: int | None = typer.Option(
+        None,
+        help="Once a source has enough history, run only the K Tesseract sweep combos that won most often (0 = full sweep).",
+    ),
+    sequential_diff: bool | None = typer.Option(
+        None,
+        "--sequential-diff",
+        help="Diff each image against the previous one: reuse its OCR if unchanged, else OCR only the changed box.",
+    ),
+    workers: int | None = typer.Option(
+        None,
+        help="Scan in N worker processes, each loading its own OCR backend and normalizer (1 = in-process).",
+    ),
+    pipelined: bool | None = typer.Option(
+        None,
+        "--pipelined",
+        help="Overlap OCR, normalization and artifact writing in threaded stages with bounded queues.",
+    ),
+    ocr_threads: int | None = typer.Option(
+        None,
+        help="With --pipelined: OCR threads, each with its own OCR backend (always 1 for manga-ocr modes).",
+    ),
+    nlp_threads: int | None = typer.Option(
+        None,
+        help="With --pipelined: normalization threads, each with its own Sudachi tokenizer.",
+    ),
+    stream_discovery: bool | None = typer.Option(
+        None,
+        "--stream-discovery",
+        help="Walk the image folder in the background and scan each directory as soon as it is listed (natural file order).",
+    ),
     exclude: list[str] = typer.Option(None, help="Words to exclude manually (repeatable)."),
     save_excluded_to_known: bool = typer.Option(
         False,
@@ -298,10 +632,19 @@ def run(
     ),
 ) -> None:
     """Run scan -> review -> build."""
+    images = _scan_input(images, video)
     d = _resolve_defaults(
         images=images, source=source, run_id=run_id, data_dir=data_dir,
-        ocr_mode=ocr_mode, ocr_language=ocr_language, online_dict=online_dict,
+        ocr_mode=ocr_mode, ocr_language=ocr_language, tesseract_cmd=tesseract_cmd, online_dict=online_dict,
         no_preprocess=no_preprocess, volume=volume, chapter=chapter,
+        tesseract_workers=tesseract_workers, tesseract_search=tesseract_search,
+        tesseract_min_score=tesseract_min_score, ocr_batch_size=ocr_batch_size,
+        no_ocr_cache=no_ocr_cache, dedup_distance=dedup_distance, onnx_threads=onnx_threads,
+        no_daemon=no_daemon, autocrop=autocrop, cascade_min_known=cascade_min_known,
+        sidecar_manifest=sidecar_manifest, ocr_timeout=ocr_timeout,
+        tesseract_orientation=tesseract_orientation, tesseract_learned_k=tesseract_learned_k,
+        sequential_diff=sequential_diff, workers=workers, pipelined=pipelined, ocr_threads=ocr_threads,
+        nlp_threads=nlp_threads, stream_discovery=stream_discovery,
     )
     pipeline = Pipeline(data_dir=data_dir)
     try:
@@ -309,12 +652,10 @@ def run(
             images=images,
             source=d["source"],
             run_id=d["run_id"],
-            ocr_mode=d["ocr_mode"],
-            ocr_language=d["ocr_language"],
-            tesseract_cmd=tesseract_cmd,
-            preprocess=not d["no_preprocess"],
-            online_dict=d["online_dict"],
+            options=d["scan"],
+            video=video is not None,
             resume=resume,
+            on_progress=_emit_scan_progress,
         )
         _emit_stage_header("SCAN")
         typer.echo(
@@ -322,6 +663,7 @@ def run(
         )
         typer.echo(f"[OK] I found {scan_result['candidate_count']} candidate word(s).")
         typer.echo(f"[INFO] Candidate preview: {_format_word_preview(scan_result.get('candidates', []))}")
+        _emit_scan_stats(scan_result)
         if scan_result["candidate_count"] == 0:
             typer.echo("[WARN] No candidates detected in scan stage.")
             raise typer.Exit(code=1)
@@ -370,7 +712,7 @@ def run(
             run_id=d["run_id"],
             volume=d["volume"],
             chapter=d["chapter"],
-            online_dict=d["online_dict"],
+            online_dict=d["scan"].online_dict,
         )
     except NoBuildableWordsError as exc:
         _emit_empty_build_guidance(exc.missing_meaning_words)
@@ -399,6 +741,233 @@ def run(
     )
 
 
+@app.command()
+def watch(
+    images: str = typer.Option(..., help="Screenshot folder to watch."),
+    source: str | None = typer.Option(None, help="Source id (auto-derived from path if omitted)."),
+    run_id: str | None = typer.Option(None, help="Run id (auto-derived from path if omitted)."),
+    data_dir: str = typer.Option("data", help="Data storage directory."),
+    ocr_mode: str | None = typer.Option(None, help="OCR backend: manga-ocr, onnx-manga-ocr, tesseract, tesseract-api, cascade, or sidecar."),
+    ocr_language: str | None = typer.Option(None, help="OCR language code (tesseract mode)."),
+    tesseract_cmd: str | None = typer.Option(
+        None,
+        help="Optional full path to tesseract executable.",
+    ),
+    online_dict: str | None = typer.Option(None, help="Online fallback dictionary for compound detection: off or jisho."),
+    rebuild: bool = typer.Option(
+        False,
+        "--rebuild",
+        help="Re-run review and build once no new screenshot has arrived for --debounce seconds.",
+    ),
+    debounce: float = typer.Option(10.0, help="Quiet seconds before --rebuild refreshes the deck."),
+    poll: bool = typer.Option(
+        False,
+        "--poll",
+        help="Check the folder every --poll-interval seconds instead of using inotify (e.g. on network shares).",
+    ),
+    poll_interval: float = typer.Option(0.5, help="Seconds between folder checks when polling."),
+    idle_exit: float | None = typer.Option(
+        None,
+        help="Stop after this many seconds without a new screenshot (default: run until Ctrl+C).",
+    ),
+) -> None:
+    """Scan new screenshots as they are saved, keeping OCR and Sudachi loaded."""
+    import statistics
+    import time
+    from pathlib import Path
+
+    from jp_anki_builder.discovery import DiscoveryManifest, discovery_manifest_path
+    from jp_anki_builder.scan import IMAGE_EXTENSIONS
+    from jp_anki_builder.watch import ImageWatcher
+
+    root = Path(images)
+    if not root.is_dir():
+        raise typer.BadParameter(f"Not a folder: {images}", param_hint="--images")
+    d = _resolve_defaults(
+        images=images, source=source, run_id=run_id, data_dir=data_dir,
+        ocr_mode=ocr_mode, ocr_language=ocr_language, tesseract_cmd=tesseract_cmd, online_dict=online_dict,
+    )
+    pipeline = Pipeline(data_dir=data_dir)
+    manifest = DiscoveryManifest.load(discovery_manifest_path(data_dir, root))
+    watcher = ImageWatcher(root, IMAGE_EXTENSIONS, manifest, poll_interval=poll_interval, use_inotify=not poll)
+    latencies: list[float] = []
+    state = {"existing": True, "dirty": False}
+
+    def refresh_deck() -> None:
+        state["dirty"] = False
+        try:
+            review_result = pipeline.review(source=d["source"], run_id=d["run_id"], keep_run_approved=True)
+            build_result = pipeline.build(
+                source=d["source"],
+                run_id=d["run_id"],
+                volume=d["volume"],
+                chapter=d["chapter"],
+                online_dict=d["scan"].online_dict,
+            )
+        except NoBuildableWordsError:
+            typer.echo("[WARN] Deck not rebuilt: no approved word has a meaning yet.")
+            return
+        except (ValueError, RuntimeError) as exc:
+            typer.echo(f"[WARN] Deck not rebuilt: {exc}")
+            return
+        typer.echo(
+            f"[OK] Deck rebuilt: {build_result['note_count']} note(s) from "
+            f"{review_result['approved_count']} approved word(s)."
+        )
+
+    def on_batch(records: list[dict]) -> None:
+        if state["existing"]:
+            state["existing"] = False
+            state["dirty"] = bool(records)
+            typer.echo(f"[OK] Caught up: scanned {len(records)} image(s) that were not in the run yet.")
+            typer.echo(f"[INFO] Watching {images} ({watcher.mode}); stop with Ctrl+C.")
+            return
+        if not records:
+            # The folder has been quiet for --debounce seconds.
+            if rebuild and state["dirty"]:
+                refresh_deck()
+            return
+        now = time.time()
+        state["dirty"] = True
+        for record in records:
+            image = Path(record["image"])
+            try:
+                latency = now - image.stat().st_mtime
+            except OSError:
+                continue
+            latencies.append(latency)
+            typer.echo(
+                f"[OK] {image.name}: {len(record['candidates'])} candidate(s), "
+                f"{latency:.2f}s after the file was written"
+            )
+
+    _emit_stage_header("WATCH")
+    try:
+        result = pipeline.scan(
+            images=images,
+            source=d["source"],
+            run_id=d["run_id"],
+            options=d["scan"],
+            resume=True,
+            batches=watcher.batches(tick=debounce if rebuild else None, idle_exit=idle_exit),
+            on_batch=on_batch,
+            on_progress=_emit_scan_progress,
+        )
+    except ValueError as exc:
+        raise typer.BadParameter(str(exc), param_hint="--images") from exc
+    except RuntimeError as exc:
+        raise typer.BadParameter(str(exc), param_hint="--ocr-mode") from exc
+    except KeyboardInterrupt as exc:
+        typer.echo("[INFO] Interrupted mid-image; run watch again to continue where it stopped.")
+        raise typer.Exit(code=130) from exc
+    finally:
+        watcher.close()
+        manifest.save()
+    if rebuild and state["dirty"]:
+        refresh_deck()
+
+    typer.echo(
+        f"[OK] Stopped watching: {result['image_count']} image(s) and "
+        f"{result['candidate_count']} candidate word(s) in the run."
+    )
+    if latencies:
+        typer.echo(
+            f"[INFO] Latency from file write to candidates: median {statistics.median(latencies):.2f}s, "
+            f"max {max(latencies):.2f}s over {len(latencies)} image(s)"
+        )
+    _emit_scan_stats(result)
+    typer.echo(f"[INFO] Saved scan results to: {result['artifact_path']}")
+
+
+def _emit_batch_table(results: list) -> None:
+    headers = ("Source", "Run", "Images", "Candidates", "Approved", "Notes", "Time", "Status")
+    rows = [
+        (r.source, r.run_id, str(r.image_count), str(r.candidate_count), str(r.approved_count),
+         str(r.note_count), f"{r.seconds:.1f}s", r.status)
+        for r in results
+    ]
+    widths = [max(len(cell) for cell in column) for column in zip(headers, *rows)]
+    for row in (headers, *rows):
+        typer.echo("  ".join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip())
+
+
+@app.command()
+def batch(
+    root: str = typer.Option(..., help="Folder whose subfolders (e.g. <source>/<run_id>/) hold the screenshots."),
+    data_dir: str = typer.Option("data", help="Data storage directory."),
+    ocr_mode: str | None = typer.Option(None, help="OCR backend: manga-ocr, onnx-manga-ocr, tesseract, tesseract-api, cascade, or sidecar."),
+    ocr_language: str | None = typer.Option(None, help="OCR language code (tesseract mode)."),
+    tesseract_cmd: str | None = typer.Option(
+        None,
+        help="Optional full path to tesseract executable.",
+    ),
+    workers: int | None = typer.Option(
+        None,
+        help="Scan in N worker processes shared by all runs (1 = in-process).",
+    ),
+    online_dict: str | None = typer.Option(None, help="Online fallback dictionary: off or jisho."),
+    resume: bool = typer.Option(
+        False,
+        "--resume",
+        help="Resume each run's interrupted scan, skipping already-processed images.",
+    ),
+) -> None:
+    """Scan, review and build every run folder under --root in one process."""
+    from pathlib import Path
+
+    from jp_anki_builder.batch import discover_runs, run_batch
+
+    root_path = Path(root)
+    if not root_path.is_dir():
+        raise typer.BadParameter(f"Not a folder: {root}", param_hint="--root")
+    try:
+        runs = discover_runs(root_path)
+    except ValueError as exc:
+        raise typer.BadParameter(str(exc), param_hint="--root") from exc
+    if not runs:
+        raise typer.BadParameter(f"No image files found under: {root}", param_hint="--root")
+
+    def options(run) -> dict:
+        # Resolved per run, so source-level config applies to each source.
+        d = _resolve_defaults(
+            images=str(run.folder), source=run.source, run_id=run.run_id, data_dir=data_dir,
+            ocr_mode=ocr_mode, ocr_language=ocr_language, tesseract_cmd=tesseract_cmd, online_dict=online_dict,
+            workers=workers,
+        )
+        build_options = {"volume": d["volume"], "chapter": d["chapter"], "online_dict": d["scan"].online_dict}
+        return {"scan": d["scan"], "build": build_options}
+
+    def on_result(result) -> None:
+        label = f"{result.source}/{result.run_id}"
+        if result.status == "ok":
+            typer.echo(
+                f"[OK] {label}: {result.image_count} image(s), {result.note_count} note(s) "
+                f"in {result.seconds:.1f}s"
+            )
+        elif result.status == "failed":
+            typer.echo(f"[WARN] {label}: failed: {result.error}")
+        else:
+            typer.echo(f"[WARN] {label}: {result.status}, no deck built")
+
+    _emit_stage_header("BATCH")
+    typer.echo(f"[INFO] Found {len(runs)} run folder(s) under {root}.")
+    results = run_batch(runs, Pipeline(data_dir=data_dir), options, on_result, resume=resume,
+                        on_progress=_emit_scan_progress)
+
+    _emit_stage_header("SUMMARY")
+    _emit_batch_table(results)
+    total = sum(r.seconds for r in results)
+    summary = f"[INFO] Total: {len(results)} run(s) in {total:.1f}s"
+    if len(results) > 1:
+        rest = (total - results[0].seconds) / (len(results) - 1)
+        summary += f"; first run {results[0].seconds:.1f}s (loads the models), then {rest:.1f}s per run"
+    typer.echo(summary)
+    failed = [r for r in results if r.status == "failed"]
+    if failed:
+        typer.echo(f"[WARN] {len(failed)} run(s) failed; fix them and run batch --resume again.")
+        raise typer.Exit(code=1)
+
+
 @app.command("install-dictionary")
 def install_dictionary(
     data_dir: str = typer.Option("data", help="Data storage directory."),
@@ -452,6 +1021,33 @@ def migrate_dictionary(
     typer.echo("[INFO] The SQLite dictionary will be used automatically.")
 
 
+@app.command("export-onnx-model")
+def export_onnx_model(
+    data_dir: str = typer.Option("data", help="Data storage directory."),
+    no_quantize: bool = typer.Option(
+        False,
+        "--no-quantize",
+        help="Keep fp32 weights instead of dynamic int8 quantization.",
+    ),
+) -> None:
+    """Export manga-ocr to ONNX under data/models/ for --ocr-mode onnx-manga-ocr."""
+    from jp_anki_builder.ocr import OcrError
+    from jp_anki_builder.onnx_ocr import export_manga_ocr_onnx
+
+    _emit_stage_header("EXPORT")
+    typer.echo("[INFO] Exporting manga-ocr to ONNX. This loads the PyTorch model and can take a few minutes.")
+    try:
+        summary = export_manga_ocr_onnx(base_dir=data_dir, quantize=not no_quantize)
+    except OcrError as exc:
+        typer.echo(f"[WARN] Export failed: {exc}")
+        raise typer.Exit(code=1) from exc
+
+    precision = "int8" if summary.quantized else "fp32"
+    size_mb = (summary.encoder_bytes + summary.decoder_bytes) / (1024 * 1024)
+    typer.echo(f"[OK] Exported {precision} encoder/decoder ({size_mb:.1f} MB): {summary.output_dir}")
+    typer.echo("[INFO] Use it with: --ocr-mode onnx-manga-ocr")
+
+
 @app.command("install-jlpt")
 def install_jlpt(
     source_file: str = typer.Option(..., help="Path to JLPT JSON file mapping words to levels 1-5."),
@@ -495,15 +1091,41 @@ def config_set(
     value: str = typer.Argument(help="Value to set."),
     data_dir: str = typer.Option("data", help="Data storage directory."),
     source: str | None = typer.Option(None, help="Set on source-level config instead of project-level."),
+    sample: str | None = typer.Option(None, help="Screenshot to check roi rectangles against before saving."),
 ) -> None:
     """Set a configuration value."""
     try:
+        boxes = _check_roi_sample(key, value, sample) if sample is not None else {}
         updated = set_config(key, value, data_dir=data_dir, source=source)
     except ValueError as exc:
         typer.echo(f"[WARN] {exc}")
         raise typer.Exit(code=1) from exc
     level = f"source ({source})" if source else "project"
     typer.echo(f"[OK] {level}: {key} = {updated[key]}")
+    for name, (box, share) in boxes.items():
+        typer.echo(f"[INFO] roi {name}: pixels {box}, {share:.0%} of the sample frame")
+
+
+def _check_roi_sample(key: str, value: str, sample: str) -> dict[str, tuple[tuple[int, int, int, int], float]]:
+    """Resolve ROI rectangles on a sample screenshot; raises ValueError if any does not fit."""
+    from pathlib import Path
+
+    from jp_anki_builder.imaging import image_size, resolve_roi
+
+    if key != "roi":
+        raise ValueError("--sample only applies to the roi key")
+    try:
+        width, height = image_size(Path(sample))
+    except OSError as exc:
+        raise ValueError(f"cannot read sample image {sample}: {exc}") from exc
+    boxes = {}
+    for name, rect in parse_roi(value).items():
+        try:
+            box = resolve_roi(rect, width, height)
+        except ValueError as exc:
+            raise ValueError(f"roi {name}: {exc}") from exc
+        boxes[name] = (box, (box[2] - box[0]) * (box[3] - box[1]) / (width * height))
+    return boxes
 
 
 @config_app.command("unset")
@@ -518,5 +1140,138 @@ def config_unset(
     typer.echo(f"[OK] {level}: removed {key}")
 
 
+def _open_ocr_cache(data_dir: str) -> OcrResultCache:
+    max_mb = load_project_config(data_dir=data_dir).ocr_cache_max_mb or DEFAULT_MAX_MB
+    return OcrResultCache(ocr_cache_path(data_dir), max_bytes=max_mb * 1024 * 1024)
+
+
+@cache_app.command("stats")
+def cache_stats(
+    data_dir: str = typer.Option("data", help="Data storage directory."),
+) -> None:
+    """Show OCR cache size and entry count."""
+    cache = _open_ocr_cache(data_dir)
+    stats = cache.stats()
+    cache.close()
+    _emit_stage_header("CACHE")
+    typer.echo(f"[INFO] Location: {stats.path}")
+    typer.echo(f"[OK] {stats.entry_count} cached image result(s)")
+    typer.echo(
+        f"[OK] {stats.total_bytes / (1024 * 1024):.1f} MB used of {stats.max_bytes / (1024 * 1024):.0f} MB limit"
+    )
+
+
+@cache_app.command("prune")
+def cache_prune(
+    data_dir: str = typer.Option("data", help="Data storage directory."),
+    max_mb: int | None = typer.Option(None, help="Evict least-recently-used entries down to this size."),
+    clear: bool = typer.Option(False, "--all", help="Remove every cached result."),
+) -> None:
+    """Evict least-recently-used OCR results."""
+    cache = _open_ocr_cache(data_dir)
+    limit = 0 if clear else (max_mb * 1024 * 1024 if max_mb is not None else None)
+    removed = cache.prune(limit)
+    stats = cache.stats()
+    cache.close()
+    _emit_stage_header("CACHE")
+    typer.echo(f"[OK] Removed {removed} cached image result(s).")
+    typer.echo(f"[INFO] {stats.entry_count} result(s) remain ({stats.total_bytes / (1024 * 1024):.1f} MB).")
+
+
+@app.command("sweep-stats")
+def sweep_stats(
+    source: str = typer.Option(..., help="Source whose Tesseract sweep statistics to show."),
+    data_dir: str = typer.Option("data", help="Data storage directory."),
+    reset: bool = typer.Option(False, "--reset", help="Forget the statistics so the source is learned again."),
+) -> None:
+    """Show which Tesseract sweep combos win most often for a source."""
+    from jp_anki_builder.config import RunPaths
+    from jp_anki_builder.sweep_stats import LEARN_MIN_IMAGES, SweepStats, combo_from_key
+
+    path = RunPaths(base_dir=data_dir, source_id=source, run_id="").ocr_sweep_stats
+    _emit_stage_header(f"SWEEP STATS ({source})")
+    if reset:
+        path.unlink(missing_ok=True)
+        typer.echo("[OK] Cleared the sweep statistics; the next scans run the full sweep.")
+        return
+    stats = SweepStats.load(path)
+    if not stats.full_sweeps:
+        typer.echo(f"[INFO] No Tesseract sweep statistics for {source} yet.")
+        return
+    cfg = load_project_config(data_dir=data_dir, source=source)
+    top_k = cfg.tesseract_learned_k if cfg.tesseract_learned_k is not None else 2
+    learned = stats.top(top_k)
+    typer.echo(f"[INFO] Location: {path}")
+    typer.echo(
+        f"[OK] {stats.full_sweeps} full-sweep image(s), {stats.learned} learned, "
+        f"{stats.sampled} drift sample(s) ({stats.drift} drifted)"
+    )
+    for key, count in stats.wins.most_common():
+        marker = "*" if combo_from_key(key) in learned else " "
+        typer.echo(f"  {marker} {key.replace('|', ' | ')}: {count} ({count / stats.full_sweeps:.0%})")
+    if learned:
+        typer.echo(f"[INFO] Scans run the {len(learned)} combo(s) marked * and a full sweep on sampled images.")
+    elif top_k <= 0:
+        typer.echo("[INFO] tesseract_learned_k is 0, so scans always run the full sweep.")
+    else:
+        remaining = LEARN_MIN_IMAGES - stats.full_sweeps
+        typer.echo(f"[INFO] Still learning: {remaining} more full-sweep image(s) before the sweep is restricted.")
+
+
+@app.command()
+def serve(
+    data_dir: str = typer.Option("data", help="Data storage directory."),
+    ocr_mode: str | None = typer.Option(None, help="OCR backend to preload (defaults to the configured ocr_mode)."),
+    stop: bool = typer.Option(False, "--stop", help="Stop the daemon serving --data-dir."),
+) -> None:
+    """Keep OCR and Sudachi loaded behind a local socket for faster scan/run."""
+    from jp_anki_builder.daemon import WorkerDaemon, daemon_supported, stop_daemon
+    from jp_anki_builder.ocr import OcrError
+
+    _emit_stage_header("DAEMON")
+    if stop:
+        if stop_daemon(data_dir):
+            typer.echo("[OK] Stopped the worker daemon.")
+        else:
+            typer.echo("[INFO] No worker daemon is running for this data directory.")
+        return
+    if not daemon_supported():
+        typer.echo("[WARN] The worker daemon needs Unix domain sockets, which this platform does not provide.")
+        raise typer.Exit(code=1)
+
+    cfg = load_project_config(data_dir=data_dir)
+    mode = ocr_mode or cfg.ocr_mode or "manga-ocr"
+    daemon = WorkerDaemon(base_dir=data_dir)
+    typer.echo(f"[INFO] Loading Sudachi and the {mode} OCR backend...")
+    try:
+        # Same provider settings a scan with config defaults asks for, so the
+        # first request reuses this instance.
+        # Cascade scans run their quick Tesseract pass locally and only send
+        # escalations (manga-ocr) to the daemon.
+        daemon.preload(
+            {"sidecar": None, "cascade": "manga-ocr"}.get(mode, mode),
+            language=cfg.ocr_language or "jpn",
+            tesseract_cmd=cfg.tesseract_cmd,
+            preprocess=not (cfg.no_preprocess or False),
+            tesseract_workers=cfg.tesseract_workers or 1,
+            tesseract_search=cfg.tesseract_search or "full",
+            tesseract_min_score=cfg.tesseract_min_score if cfg.tesseract_min_score is not None else 40.0,
+            tesseract_orientation=cfg.tesseract_orientation or False,
+            onnx_threads=cfg.onnx_threads or 0,
+            base_dir=data_dir,
+        )
+    except (OcrError, RuntimeError, ImportError) as exc:
+        typer.echo(f"[WARN] Preload failed, models will load on first request: {exc}")
+    typer.echo(f"[OK] Serving on {daemon.socket_path} (stop with Ctrl+C or serve --stop).")
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    except (OcrError, OSError) as exc:
+        typer.echo(f"[WARN] {exc}")
+        raise typer.Exit(code=1) from exc
+    typer.echo("[OK] Worker daemon stopped.")
+
+
 if __name__ == "__main__":
     app()
@@ -16,10 +16,18 @@ class RunPaths:
     def source_seen_words(self) -> Path:
         return Path(self.base_dir) / self.source_id / "seen_words.json"
 
+    @property
+    def ocr_sweep_stats(self) -> Path:
+        return Path(self.base_dir) / self.source_id / "ocr_sweep_stats.json"
+
     @property
     def scan_artifact(self) -> Path:
         return self.run_dir / "scan.json"
 
+    @property
+    def scan_journal(self) -> Path:
+        return self.run_dir / "scan.jsonl"
+
     @property
     def review_artifact(self) -> Path:
         return self.run_dir / "review.json"
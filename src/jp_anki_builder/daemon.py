@@ -0,0 +1,335 @@
+"""Opt-in local worker daemon that keeps OCR providers and Sudachi loaded.
+
+``jp-anki-build serve`` listens on a Unix socket under ``data/cache/daemon``.
+When the socket answers, ``run_scan`` sends OCR and tokenization work there
+instead of importing and loading the models itself, so short runs skip the
+several-second model start-up. Everything else (normalization rules,
+dictionary lookups, caches, artifacts) still runs in the CLI process.
+
+The protocol is one JSON object per line in each direction. Requests carry an
+``op`` field; responses carry ``ok`` plus either the result or ``error``.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import socket
+import socketserver
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from jp_anki_builder.ocr import OcrError
+
+logger = logging.getLogger(__name__)
+
+PROTOCOL_VERSION = 1
+_CONNECT_TIMEOUT_S = 1.0
+
+
+def daemon_socket_path(base_dir: str = "data") -> Path:
+    return Path(base_dir) / "cache" / "daemon" / "worker.sock"
+
+
+def daemon_supported() -> bool:
+    return hasattr(socket, "AF_UNIX")
+
+
+# -- server ------------------------------------------------------------------
+
+
+class WorkerDaemon:
+    """Holds warm providers and the Sudachi tokenizer and answers requests."""
+
+    def __init__(self, base_dir: str = "data"):
+        self.base_dir = base_dir
+        self.socket_path = daemon_socket_path(base_dir)
+        self._providers: dict[str, tuple[object, threading.Lock]] = {}
+        self._providers_lock = threading.Lock()
+        self._tokenizer = None
+        self._tokenizer_lock = threading.Lock()
+        self._server: socketserver.ThreadingUnixStreamServer | None = None
+
+    def preload(self, ocr_mode: str | None = None, **provider_kwargs) -> None:
+        with self._tokenizer_lock:
+            self._get_tokenizer()
+        if ocr_mode:
+            provider, lock = self._provider({"mode": ocr_mode, **provider_kwargs})
+            with lock:
+                warm_up = getattr(provider, "warm_up", None)
+                if warm_up is not None:
+                    warm_up()
+
+    def serve_forever(self) -> None:
+        if not daemon_supported():
+            raise OcrError("The worker daemon needs Unix domain sockets, which this platform does not provide.")
+        if ping(self.base_dir) is not None:
+            raise OcrError(f"A worker daemon is already listening on {self.socket_path}.")
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        # A socket file left behind by a daemon that did not exit cleanly.
+        self.socket_path.unlink(missing_ok=True)
+
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self) -> None:
+                for line in self.rfile:
+                    if not line.strip():
+                        continue
+                    try:
+                        response = daemon.handle(json.loads(line))
+                    except Exception as exc:
+                        logger.debug("daemon request failed", exc_info=True)
+                        response = {"ok": False, "error": str(exc), "kind": exc.__class__.__name__}
+                    self.wfile.write(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+                    self.wfile.flush()
+                    if response.get("shutdown"):
+                        threading.Thread(target=daemon.shutdown, daemon=True).start()
+                        return
+
+        self._server = socketserver.ThreadingUnixStreamServer(str(self.socket_path), Handler)
+        self._server.daemon_threads = True
+        logger.info("worker daemon listening on %s", self.socket_path)
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+            self.socket_path.unlink(missing_ok=True)
+
+    def shutdown(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+
+    def handle(self, request: dict) -> dict:
+        op = request.get("op")
+        if op == "ping":
+            return {"ok": True, "protocol": PROTOCOL_VERSION, "pid": os.getpid()}
+        if op == "shutdown":
+            return {"ok": True, "shutdown": True}
+        if op == "describe":
+            provider, lock = self._provider(request["provider"])
+            with lock:
+                version = provider.cache_version() if hasattr(provider, "cache_version") else None
+            return {"ok": True, "batch": hasattr(provider, "extract_text_batch"), "cache_version": version}
+        if op == "ocr":
+            return {"ok": True, "results": self._ocr(request)}
+        if op == "tokenize":
+            return {"ok": True, "morphemes": self._tokenize(request["text"], request.get("mode"))}
+        raise ValueError(f"unknown daemon op: {op!r}")
+
+    def _provider(self, spec: dict) -> tuple[object, threading.Lock]:
+        from jp_anki_builder.ocr import build_ocr_provider
+
+        key = json.dumps(spec, sort_keys=True)
+        with self._providers_lock:
+            if key not in self._providers:
+                kwargs = dict(spec)
+                self._providers[key] = (build_ocr_provider(kwargs.pop("mode"), **kwargs), threading.Lock())
+            return self._providers[key]
+
+    def _ocr(self, request: dict) -> list[dict]:
+        from jp_anki_builder.scan import _ocr_images
+
+        provider, lock = self._provider(request["provider"])
+        images = [Path(image) for image in request["images"]]
+        regions = [tuple(region) if region else None for region in request.get("regions") or [None] * len(images)]
+        # Providers keep per-call state (last_info, lazily loaded engines).
+        with lock:
+            return [
+                {"texts": texts, "info": info}
+                for _, texts, info in _ocr_images(provider, images, int(request.get("batch_size", 1)), regions=regions)
+            ]
+
+    def _get_tokenizer(self):
+        if self._tokenizer is None:
+            from sudachipy import dictionary
+
+            self._tokenizer = dictionary.Dictionary().create()
+        return self._tokenizer
+
+    def _tokenize(self, text: str, mode: str | None) -> list[list]:
+        with self._tokenizer_lock:
+            tokenizer = self._get_tokenizer()
+            if mode is None:
+                morphemes = tokenizer.tokenize(text)
+            else:
+                from sudachipy import tokenizer as sudachi_tokenizer
+
+                morphemes = tokenizer.tokenize(text, getattr(sudachi_tokenizer.Tokenizer.SplitMode, mode))
+            return [[m.surface(), list(m.part_of_speech()), m.dictionary_form()] for m in morphemes]
+
+
+# -- client ------------------------------------------------------------------
+
+
+class DaemonClient:
+    """One persistent connection to a running worker daemon."""
+
+    def __init__(self, sock: socket.socket, socket_path: Path):
+        self.socket_path = socket_path
+        self._sock = sock
+        self._reader = sock.makefile("rb")
+        self._lock = threading.Lock()
+
+    def request(self, payload: dict) -> dict:
+        with self._lock:
+            try:
+                self._sock.sendall(json.dumps(payload, ensure_ascii=False).encode("utf-8") + b"\n")
+                line = self._reader.readline()
+            except OSError as exc:
+                raise OcrError(f"Lost connection to the worker daemon at {self.socket_path}: {exc}") from exc
+        if not line:
+            raise OcrError(f"The worker daemon at {self.socket_path} closed the connection.")
+        response = json.loads(line)
+        if not response.get("ok"):
+            if response.get("kind") == "ValueError":
+                raise ValueError(response.get("error", "daemon request failed"))
+            raise OcrError(response.get("error", "daemon request failed"))
+        return response
+
+    def ocr_provider(self, spec: dict) -> RemoteOcrProvider:
+        description = self.request({"op": "describe", "provider": spec})
+        provider_cls = RemoteBatchOcrProvider if description["batch"] else RemoteOcrProvider
+        return provider_cls(client=self, spec=spec, version=description.get("cache_version"))
+
+    def tokenizer(self) -> RemoteSudachiTokenizer:
+        return RemoteSudachiTokenizer(self)
+
+    def close(self) -> None:
+        self._reader.close()
+        self._sock.close()
+
+
+def connect_daemon(base_dir: str = "data") -> DaemonClient | None:
+    """Connect to the daemon for *base_dir*, or return None if none is running."""
+    socket_path = daemon_socket_path(base_dir)
+    if not daemon_supported() or not socket_path.exists():
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(_CONNECT_TIMEOUT_S)
+    try:
+        sock.connect(str(socket_path))
+        client = DaemonClient(sock, socket_path)
+        pong = client.request({"op": "ping"})
+    except (OSError, OcrError, ValueError) as exc:
+        logger.debug("no usable worker daemon at %s: %s", socket_path, exc)
+        sock.close()
+        return None
+    if pong.get("protocol") != PROTOCOL_VERSION:
+        logger.warning("ignoring worker daemon at %s: protocol %s, expected %s",
+                       socket_path, pong.get("protocol"), PROTOCOL_VERSION)
+        client.close()
+        return None
+    # OCR requests can legitimately take minutes.
+    sock.settimeout(None)
+    return client
+
+
+def ping(base_dir: str = "data") -> dict | None:
+    client = connect_daemon(base_dir)
+    if client is None:
+        return None
+    try:
+        return client.request({"op": "ping"})
+    finally:
+        client.close()
+
+
+def stop_daemon(base_dir: str = "data") -> bool:
+    client = connect_daemon(base_dir)
+    if client is None:
+        return False
+    try:
+        client.request({"op": "shutdown"})
+    finally:
+        client.close()
+    return True
+
+
+@dataclass
+class RemoteOcrProvider:
+    """OCR provider whose work runs in the daemon; mirrors the local provider API."""
+
+    client: DaemonClient
+    spec: dict
+    version: str | None = None
+    last_info: dict = field(default_factory=dict, repr=False, compare=False)
+
+    def __getattr__(self, name: str):
+        # Only report cache_version when the daemon-side provider has one, so
+        # run_scan's result-cache check sees the same thing it would locally.
+        if name == "cache_version" and self.version is not None:
+            return lambda: self.version
+        raise AttributeError(name)
+
+    def extract_text(self, image_path: Path, region: tuple[int, int, int, int] | None = None) -> str:
+        texts = self.extract_text_candidates(image_path, top_n=1, region=region)
+        return texts[0] if texts else ""
+
+    def extract_text_candidates(self, image_path: Path, top_n: int = 8,
+                                region: tuple[int, int, int, int] | None = None) -> list[str]:
+        # The daemon may run from another working directory.
+        response = self.client.request({
+            "op": "ocr",
+            "provider": self.spec,
+            "images": [str(image_path.resolve())],
+            "regions": [region],
+        })
+        result = response["results"][0]
+        self.last_info = result["info"]
+        return result["texts"][:top_n]
+
+
+@dataclass
+class RemoteBatchOcrProvider(RemoteOcrProvider):
+    def extract_text_batch(self, image_paths: list[Path], batch_size: int = 8,
+                           regions: list[tuple[int, int, int, int] | None] | None = None) -> list[str]:
+        response = self.client.request({
+            "op": "ocr",
+            "provider": self.spec,
+            "images": [str(path.resolve()) for path in image_paths],
+            "regions": regions,
+            "batch_size": batch_size,
+        })
+        return [result["texts"][0] if result["texts"] else "" for result in response["results"]]
+
+
+class _RemoteMorpheme:
+    __slots__ = ("_surface", "_pos", "_dictionary_form")
+
+    def __init__(self, surface: str, pos: list[str], dictionary_form: str):
+        self._surface = surface
+        self._pos = tuple(pos)
+        self._dictionary_form = dictionary_form
+
+    def surface(self) -> str:
+        return self._surface
+
+    def part_of_speech(self) -> tuple[str, ...]:
+        return self._pos
+
+    def dictionary_form(self) -> str:
+        return self._dictionary_form
+
+
+class RemoteSudachiTokenizer:
+    """Stands in for a sudachipy tokenizer inside ``SudachiNormalizer``."""
+
+    def __init__(self, client: DaemonClient):
+        self._client = client
+
+    def tokenize(self, text: str, mode=None) -> list[_RemoteMorpheme]:
+        response = self._client.request({"op": "tokenize", "text": text, "mode": _split_mode_name(mode)})
+        return [_RemoteMorpheme(*morpheme) for morpheme in response["morphemes"]]
+
+
+def _split_mode_name(mode) -> str | None:
+    if mode is None:
+        return None
+    from sudachipy import tokenizer as sudachi_tokenizer
+
+    for name in ("A", "B", "C"):
+        if mode == getattr(sudachi_tokenizer.Tokenizer.SplitMode, name):
+            return name
+    return None
@@ -27,6 +27,9 @@ class OfflineJsonDictionary:
             logger.debug("offline hit: %s", word)
         return hit
 
+    def warm_up(self) -> None:
+        self._load_payload()
+
     def _load_payload(self) -> dict | None:
         if not self.path.exists():
             self._cache_payload = None
@@ -58,6 +61,12 @@ class OfflineSqliteDictionary:
         self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
         return self._conn
 
+    def warm_up(self) -> None:
+        conn = self._get_conn()
+        if conn is not None:
+            # Pulls the schema and first index pages into the page cache.
+            conn.execute("SELECT word FROM entries LIMIT 1").fetchone()
+
     def lookup(self, word: str, exact_match: bool = False):
         conn = self._get_conn()
         if conn is None:
@@ -188,8 +197,8 @@ def build_online_dictionary(mode: str):
 class WordExistsCache:
     """Caches word existence checks across pipeline stages.
 
-    Can be persisted to a JSON file so the build stage reuses
-    lookups performed during scan.
+    Can be persisted to a JSON file so a resumed scan (and its
+    worker processes) reuses the lookups already made.
     """
 
     def __init__(self, offline, online=None):
@@ -206,6 +215,16 @@ class WordExistsCache:
         self._cache[word] = hit
         return hit
 
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def view(self) -> WordCacheView:
+        """A view that records which words one run (or worker chunk) looked up."""
+        return WordCacheView(self)
+
+    def update(self, entries: dict[str, bool]) -> None:
+        self._cache.update(entries)
+
     def save(self, path: Path) -> None:
         path.parent.mkdir(parents=True, exist_ok=True)
         path.write_text(
@@ -220,3 +239,43 @@ class WordExistsCache:
         data = json.loads(path.read_text(encoding="utf-8-sig"))
         self._cache.update(data)
         logger.debug("loaded word_exists cache (%d entries) from %s", len(self._cache), path)
+
+
+class WordCacheView:
+    """One run's lookups through a longer-lived ``WordExistsCache``.
+
+    Answers come from, and go into, the underlying cache, but ``save`` writes
+    only the words this view touched, so a run's word_cache.json does not
+    collect the words of every other run that shared the cache.
+    """
+
+    def __init__(self, cache: WordExistsCache):
+        self._cache = cache
+        self._touched: dict[str, bool] = {}
+
+    def word_exists(self, word: str) -> bool:
+        hit = self._cache.word_exists(word)
+        self._touched[word] = hit
+        return hit
+
+    def __len__(self) -> int:
+        return len(self._touched)
+
+    def entries(self) -> dict[str, bool]:
+        return dict(self._touched)
+
+    def clear(self) -> None:
+        self._touched.clear()
+
+    def update(self, entries: dict[str, bool]) -> None:
+        self._cache.update(entries)
+        self._touched.update(entries)
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self._touched, ensure_ascii=False), encoding="utf-8")
+        logger.debug("saved word_exists cache view (%d entries) to %s", len(self._touched), path)
+
+    def load(self, path: Path) -> None:
+        if path.exists():
+            self.update(json.loads(path.read_text(encoding="utf-8-sig")))
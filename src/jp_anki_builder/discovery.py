@@ -0,0 +1,188 @@
+"""Streaming image discovery for ``scan --stream-discovery``.
+
+``_collect_images`` walks the whole tree, stats every entry and sorts the
+result before the first image is OCR'd; on a network share with tens of
+thousands of files that is minutes of idle time. Here the tree is walked with
+``os.scandir`` (whose entries usually carry their file type, so no extra stat
+per file) on a background thread, and each directory's images are handed to
+scan as soon as that directory has been listed: files first in natural order
+(``p2.png`` before ``p10.png``), then subdirectories, depth-first.
+
+Listings are remembered per directory in a manifest under
+``data/cache/discovery/``, keyed by the directory's modification time, which
+changes whenever an entry is added, removed or renamed; a repeat run only
+stats each directory instead of listing it again.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import queue
+import re
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+_DIGITS = re.compile(r"(\d+)")
+_DONE = object()
+# Batches the walk may run ahead of the scan, and how often a walk blocked on
+# a full queue re-checks whether the scan went away.
+_MAX_PENDING = 16
+_POLL_S = 0.1
+# Directory timestamps are only as fine as the kernel clock tick, so an entry
+# added right after a listing may leave the mtime unchanged; a listing taken
+# this soon after the directory changed is not reused.
+_SETTLED_NS = 2_000_000_000
+
+
+def natural_key(name: str) -> list:
+    """Sort key that orders embedded numbers by value: ``p2`` < ``p10``."""
+    return [int(part) if part.isdigit() else part.casefold() for part in _DIGITS.split(name)]
+
+
+def discovery_manifest_path(base_dir: str, root: Path) -> Path:
+    digest = hashlib.sha256(str(root.resolve()).encode("utf-8")).hexdigest()[:16]
+    return Path(base_dir) / "cache" / "discovery" / f"{digest}.json"
+
+
+@dataclass
+class DiscoveryManifest:
+    """Directory listings of one image tree from an earlier run."""
+
+    path: Path
+    dirs: dict[str, dict] = field(default_factory=dict)
+    reused: int = 0
+    listed: int = 0
+
+    @classmethod
+    def load(cls, path: Path) -> DiscoveryManifest:
+        manifest = cls(path=path)
+        if path.exists():
+            try:
+                manifest.dirs = json.loads(path.read_text(encoding="utf-8-sig"))["dirs"]
+            except (ValueError, KeyError, TypeError) as exc:
+                logger.warning("ignoring unreadable discovery manifest %s: %s", path, exc)
+        return manifest
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps({"dirs": self.dirs}, ensure_ascii=False), encoding="utf-8")
+
+
+def iter_image_dirs(root: Path, extensions: set[str],
+                    manifest: DiscoveryManifest | None = None) -> Iterator[list[Path]]:
+    """Yield the images of each directory under *root*, one list per directory.
+
+    Unreadable directories are logged and skipped. With *manifest*, a
+    directory whose modification time is unchanged is not listed again, and
+    fresh listings are recorded in it.
+    """
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        listing = _listing(directory, directory.relative_to(root).as_posix(), extensions, manifest)
+        if listing is None:
+            continue
+        images, subdirs = listing
+        if images:
+            yield [directory / name for name in images]
+        stack.extend(directory / name for name in reversed(subdirs))
+
+
+def _listing(directory: Path, key: str, extensions: set[str],
+             manifest: DiscoveryManifest | None) -> tuple[list[str], list[str]] | None:
+    try:
+        mtime_ns = os.stat(directory).st_mtime_ns
+        if manifest is not None:
+            known = manifest.dirs.get(key)
+            if (known is not None and known["mtime_ns"] == mtime_ns
+                    and known.get("listed_ns", 0) - mtime_ns >= _SETTLED_NS):
+                manifest.reused += 1
+                return known["images"], known["dirs"]
+        listed_ns = time.time_ns()
+        images: list[str] = []
+        subdirs: list[str] = []
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                # Like rglob, do not follow directory symlinks (no cycles).
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.name)
+                elif entry.is_file() and os.path.splitext(entry.name)[1].lower() in extensions:
+                    images.append(entry.name)
+    except OSError as exc:
+        logger.warning("skipping unreadable directory %s: %s", directory, exc)
+        return None
+    images.sort(key=natural_key)
+    subdirs.sort(key=natural_key)
+    if manifest is not None:
+        manifest.listed += 1
+        manifest.dirs[key] = {"mtime_ns": mtime_ns, "listed_ns": listed_ns, "images": images, "dirs": subdirs}
+    return images, subdirs
+
+
+def in_background(batches: Iterable[list[Path]]) -> Iterator[list[Path]]:
+    """Run *batches* on a daemon thread and yield its lists as they arrive,
+    so the walk continues while the caller works on earlier directories.
+
+    The walk runs at most ``_MAX_PENDING`` batches ahead, and stops at the
+    next batch once the caller closes this generator or stops reading it
+    because of an error.
+    """
+    found: queue.Queue = queue.Queue(maxsize=_MAX_PENDING)
+    stop = threading.Event()
+
+    def put(entry) -> bool:
+        """Put *entry* on the queue unless the caller stops first."""
+        while not stop.is_set():
+            try:
+                found.put(entry, timeout=_POLL_S)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def walk() -> None:
+        try:
+            for batch in batches:
+                if not put(batch):
+                    return
+        except Exception as exc:
+            put(exc)
+        finally:
+            put(_DONE)
+            close = getattr(batches, "close", None)
+            if close is not None:
+                close()
+
+    threading.Thread(target=walk, name="image-discovery", daemon=True).start()
+    held = None
+    try:
+        while True:
+            batch = held if held is not None else found.get()
+            held = None
+            if batch is _DONE:
+                return
+            if isinstance(batch, Exception):
+                raise batch
+            # Hand over everything discovered meanwhile as one batch.
+            while held is None and not found.empty():
+                more = found.get()
+                if more is _DONE or isinstance(more, Exception):
+                    held = more
+                else:
+                    batch = batch + more
+            yield batch
+    finally:
+        stop.set()
+        # Unblock a walk waiting on the full queue; it sees the stop within _POLL_S.
+        while True:
+            try:
+                found.get_nowait()
+            except queue.Empty:
+                break
@@ -0,0 +1,340 @@
+"""NumPy image helpers for scan: perceptual hashing, frame differencing,
+text-region detection, text orientation and OCR thresholding."""
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+# 16x16 = 256 bits: coarse enough to ignore a blinking cursor, fine enough that
+# a new line of dialogue in the same box still flips a handful of bits.
+DHASH_SIZE = 16
+
+
+def dhash(image_path: Path, hash_size: int = DHASH_SIZE) -> str:
+    """Difference hash of an image as a hex string of ``hash_size**2`` bits."""
+    with Image.open(image_path) as image:
+        # Lets JPEG decode at reduced scale; a no-op for other formats.
+        image.draft("L", (hash_size * 8, hash_size * 8))
+        small = image.convert("L").resize((hash_size + 1, hash_size), Image.Resampling.BOX)
+    pixels = np.asarray(small, dtype=np.int16)
+    bits = pixels[:, 1:] > pixels[:, :-1]
+    return np.packbits(bits).tobytes().hex()
+
+
+class NearDuplicateIndex:
+    """Finds the closest previously added hash within a Hamming distance."""
+
+    def __init__(self, max_distance: int):
+        self.max_distance = max_distance
+        self._hashes = np.zeros((0, 0), dtype=np.uint8)
+        self._owners: list[str] = []
+
+    def add(self, hash_hex: str, owner: str) -> None:
+        row = np.frombuffer(bytes.fromhex(hash_hex), dtype=np.uint8)
+        count = len(self._owners)
+        if count == 0:
+            self._hashes = np.zeros((64, row.size), dtype=np.uint8)
+        elif row.size != self._hashes.shape[1]:
+            return
+        elif count == len(self._hashes):
+            grown = np.zeros((count * 2, row.size), dtype=np.uint8)
+            grown[:count] = self._hashes
+            self._hashes = grown
+        self._hashes[count] = row
+        self._owners.append(owner)
+
+    def find(self, hash_hex: str) -> str | None:
+        count = len(self._owners)
+        row = np.frombuffer(bytes.fromhex(hash_hex), dtype=np.uint8)
+        if count == 0 or row.size != self._hashes.shape[1]:
+            return None
+        distances = np.unpackbits(self._hashes[:count] ^ row, axis=1).sum(axis=1)
+        best = int(distances.argmin())
+        if distances[best] > self.max_distance:
+            return None
+        return self._owners[best]
+
+
+def cell_difference(a: np.ndarray, b: np.ndarray, cell: int = 8) -> np.ndarray:
+    """Mean absolute difference of two same-sized grayscale frames per *cell* x *cell* block.
+
+    Averaging over blocks ignores compression noise and dithering while a
+    changed glyph still moves its block's mean by tens of levels.
+    """
+    rows, cols = a.shape[0] // cell, a.shape[1] // cell
+    if rows == 0 or cols == 0:
+        diff = np.abs(a.astype(np.float32) - b.astype(np.float32))
+        return np.full((1, 1), diff.mean() if diff.size else 0.0, dtype=np.float32)
+    diff = np.abs(a[: rows * cell, : cols * cell].astype(np.float32) - b[: rows * cell, : cols * cell])
+    return diff.reshape(rows, cell, cols, cell).mean(axis=(1, 3))
+
+
+# Sequential diff compares frames at this width; a changed cell's mean must
+# move by more than DIFF_CHANGE levels (0-255) to count.
+DIFF_WIDTH = 320
+DIFF_CELL = 8
+DIFF_CHANGE = 12.0
+
+
+def luma_thumbnail(image_path: Path, width: int = DIFF_WIDTH) -> tuple[np.ndarray, tuple[int, int]]:
+    """Grayscale copy of an image scaled to *width* pixels, plus the full (width, height)."""
+    with Image.open(image_path) as image:
+        size = image.size
+        height = max(1, round(size[1] * width / size[0]))
+        image.draft("L", (width, height))
+        small = image.convert("L").resize((width, height), Image.Resampling.BOX)
+    return np.asarray(small), size
+
+
+def changed_box(previous: np.ndarray, current: np.ndarray, size: tuple[int, int],
+                cell: int = DIFF_CELL, threshold: float = DIFF_CHANGE) -> tuple[int, int, int, int] | None:
+    """Full-resolution box over the rows of cells that differ between two
+    same-sized thumbnails of a *size* frame, padded by one cell; None when
+    nothing changed.
+
+    The box spans the full width of those rows: a line that grew keeps its
+    unchanged prefix, so OCR reads whole lines instead of the new fragment.
+    """
+    changed = cell_difference(previous, current, cell) > threshold
+    if not changed.any():
+        return None
+    rows = np.flatnonzero(changed.any(axis=1))
+    scale_y = size[1] / current.shape[0]
+    top = max(0, int((rows[0] - 1) * cell * scale_y))
+    bottom = min(size[1], int(np.ceil((rows[-1] + 2) * cell * scale_y)))
+    return 0, top, size[0], bottom
+
+
+def otsu_threshold(histogram) -> int:
+    """Otsu's global threshold from a 256-bin grayscale histogram.
+
+    Pixels strictly above the returned value become white, matching the
+    ``> threshold`` convention of the fixed threshold variants.
+    """
+    hist = np.asarray(histogram, dtype=np.float64)[:256]
+    levels = np.arange(256, dtype=np.float64)
+    weight_low = np.cumsum(hist)
+    weight_high = weight_low[-1] - weight_low
+    sum_low = np.cumsum(hist * levels)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean_low = sum_low / weight_low
+        mean_high = (sum_low[-1] - sum_low) / weight_high
+        between = weight_low * weight_high * (mean_low - mean_high) ** 2
+    return int(np.nanargmax(between)) if np.isfinite(between).any() else 127
+
+
+def load_image(image_path: Path, region: tuple[int, int, int, int] | None = None) -> Image.Image:
+    """Decode an image fully, cropped to *region* (left, top, right, bottom) if given."""
+    with Image.open(image_path) as image:
+        image.load()
+        return image.crop(region) if region is not None else image.copy()
+
+
+def image_pixels(image_path: Path, region: tuple[int, int, int, int] | None = None) -> int | None:
+    """Pixel count OCR will process: the region's area, else the frame size from the header."""
+    if region is not None:
+        return max(region[2] - region[0], 0) * max(region[3] - region[1], 0)
+    try:
+        with Image.open(image_path) as image:
+            return image.width * image.height
+    except (OSError, ValueError):
+        return None
+
+
+def resolve_roi(rect: list[float], width: int, height: int) -> tuple[int, int, int, int]:
+    """Pixel box for a configured ROI rectangle on a *width* x *height* frame.
+
+    Rectangles are ``[left, top, right, bottom]``; when every value lies in
+    0..1 they are fractions of the frame, otherwise absolute pixels. Raises
+    ValueError for malformed rectangles and ones that leave the frame.
+    """
+    if len(rect) != 4 or not all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in rect):
+        raise ValueError(f"ROI must be four numbers [left, top, right, bottom], got {rect!r}")
+    if all(0 <= v <= 1 for v in rect):
+        left, top, right, bottom = rect
+        box = (round(left * width), round(top * height), round(right * width), round(bottom * height))
+    else:
+        box = tuple(int(round(v)) for v in rect)
+    left, top, right, bottom = box
+    if left >= right or top >= bottom:
+        raise ValueError(f"ROI {rect!r} is empty (right/bottom must exceed left/top)")
+    if left < 0 or top < 0 or right > width or bottom > height:
+        raise ValueError(f"ROI {rect!r} extends past the {width}x{height} frame")
+    return box
+
+
+def image_size(image_path: Path) -> tuple[int, int]:
+    """Frame (width, height) from the image header, without decoding pixels."""
+    with Image.open(image_path) as image:
+        return image.size
+
+
+# Autocrop works on a downscaled frame split into square blocks; a block is
+# text-like when enough of its pixels sit on a strong horizontal/vertical edge.
+AUTOCROP_MIN_CONFIDENCE = 0.5
+_AUTOCROP_MAX_SIDE = 960
+_AUTOCROP_BLOCK = 8
+_EDGE_THRESHOLD = 40
+_TEXT_BLOCK_DENSITY = 0.1
+# Components holding at least this share of the largest one's edge mass are
+# kept too, so a speaker name box next to the dialogue box is not cut off.
+_KEEP_COMPONENT_SHARE = 0.25
+
+
+@dataclass(frozen=True)
+class TextRegion:
+    box: tuple[int, int, int, int]
+    confidence: float
+
+
+def detect_text_region(image_path: Path, padding: float = 0.02) -> TextRegion | None:
+    """Find the text-bearing part of a frame from edge density.
+
+    Returns the padded box in full-resolution pixels and a confidence in
+    [0, 1]: the share of text-like edge mass inside the box, discounted by the
+    share of the frame it covers. Returns None when nothing looks like text.
+    """
+    with Image.open(image_path) as image:
+        width, height = image.size
+        image.draft("L", (_AUTOCROP_MAX_SIDE, _AUTOCROP_MAX_SIDE))
+        gray = image.convert("L")
+    factor = -(-max(gray.size) // _AUTOCROP_MAX_SIDE)
+    if factor > 1:
+        gray = gray.reduce(factor)
+
+    pixels = np.asarray(gray, dtype=np.int16)
+    edges = np.zeros(pixels.shape, dtype=bool)
+    edges[:, 1:] |= np.abs(np.diff(pixels, axis=1)) > _EDGE_THRESHOLD
+    edges[1:, :] |= np.abs(np.diff(pixels, axis=0)) > _EDGE_THRESHOLD
+    block = _AUTOCROP_BLOCK
+    rows, cols = pixels.shape[0] // block, pixels.shape[1] // block
+    if rows == 0 or cols == 0:
+        return None
+    density = edges[: rows * block, : cols * block].reshape(rows, block, cols, block).mean(axis=(1, 3))
+    text = density >= _TEXT_BLOCK_DENSITY
+    if not text.any():
+        return None
+
+    # Bridge the gaps between characters and lines before grouping blocks.
+    bridged = text.copy()
+    bridged[:, 1:] |= text[:, :-1]
+    bridged[:, :-1] |= text[:, 1:]
+    bridged[1:, :] |= text[:-1, :]
+    bridged[:-1, :] |= text[1:, :]
+    mass = np.where(text, density, 0.0)
+    components = _connected_components(bridged, mass)
+    largest = components[0][0]
+    kept = [c for c in components if c[0] >= largest * _KEEP_COMPONENT_SHARE]
+    top = min(c[1] for c in kept)
+    left = min(c[2] for c in kept)
+    bottom = max(c[3] for c in kept) + 1
+    right = max(c[4] for c in kept) + 1
+
+    scale_x = width / pixels.shape[1]
+    scale_y = height / pixels.shape[0]
+    pad_x = max(padding * width, block * scale_x)
+    pad_y = max(padding * height, block * scale_y)
+    box = (
+        max(int(left * block * scale_x - pad_x), 0),
+        max(int(top * block * scale_y - pad_y), 0),
+        min(int(right * block * scale_x + pad_x + 0.5), width),
+        min(int(bottom * block * scale_y + pad_y + 0.5), height),
+    )
+    coverage = (box[2] - box[0]) * (box[3] - box[1]) / (width * height)
+    mass_share = sum(c[0] for c in kept) / float(mass.sum())
+    return TextRegion(box=box, confidence=round(float(mass_share * (1.0 - coverage)), 3))
+
+
+def _connected_components(mask: np.ndarray, mass: np.ndarray) -> list[tuple[float, int, int, int, int]]:
+    """4-connected components of *mask* as (mass, top, left, bottom, right), heaviest first."""
+    seen = np.zeros(mask.shape, dtype=bool)
+    rows, cols = mask.shape
+    components: list[tuple[float, int, int, int, int]] = []
+    for start in zip(*np.nonzero(mask), strict=True):
+        if seen[start]:
+            continue
+        seen[start] = True
+        queue = deque([start])
+        total = 0.0
+        top, left, bottom, right = start[0], start[1], start[0], start[1]
+        while queue:
+            r, c = queue.popleft()
+            total += mass[r, c]
+            top, bottom = min(top, r), max(bottom, r)
+            left, right = min(left, c), max(right, c)
+            for nr, nc in ((r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1)):
+                if 0 <= nr < rows and 0 <= nc < cols and mask[nr, nc] and not seen[nr, nc]:
+                    seen[nr, nc] = True
+                    queue.append((nr, nc))
+        components.append((total, int(top), int(left), int(bottom), int(right)))
+    components.sort(key=lambda component: component[0], reverse=True)
+    return components
+
+
+# Orientation works on the binarized frame's row and column ink profiles.
+ORIENTATION_MIN_CONFIDENCE = 0.6
+_ORIENTATION_MAX_SIDE = 800
+# Profiles this dense inside the ink bounding box are scenery, not text.
+_ORIENTATION_MAX_INK = 0.5
+
+
+@dataclass(frozen=True)
+class Orientation:
+    """Text direction guess: ``horizontal`` or ``vertical``, with the number of
+    text lines seen across it."""
+
+    direction: str
+    lines: int
+    confidence: float
+
+
+def classify_orientation(image: Image.Image) -> Orientation | None:
+    """Guess whether *image* holds horizontal or vertical text.
+
+    The image is binarized with Otsu (ink is the minority class) and
+    projected onto rows and columns. Horizontal text has fewer row runs
+    (lines) than column runs (characters), wider gaps between rows (line
+    spacing beats character spacing) and a wide ink bounding box; vertical
+    text is the transpose. The signed sum of those log-ratios becomes the
+    confidence. Returns None when there is no ink or it fills the frame.
+    """
+    gray = image.convert("L")
+    if max(gray.size) > _ORIENTATION_MAX_SIDE:
+        gray.thumbnail((_ORIENTATION_MAX_SIDE, _ORIENTATION_MAX_SIDE))
+    pixels = np.asarray(gray, dtype=np.uint8)
+    dark = pixels <= otsu_threshold(np.bincount(pixels.ravel(), minlength=256))
+    ink = dark if dark.mean() <= 0.5 else ~dark
+
+    rows = ink.sum(axis=1)
+    cols = ink.sum(axis=0)
+    row_active = rows > max(1, 0.01 * rows.max())
+    col_active = cols > max(1, 0.01 * cols.max())
+    if not row_active.any() or not col_active.any():
+        return None
+    top, bottom = np.flatnonzero(row_active)[[0, -1]]
+    left, right = np.flatnonzero(col_active)[[0, -1]]
+    if ink[top:bottom + 1, left:right + 1].mean() > _ORIENTATION_MAX_INK:
+        return None
+    row_runs, row_gaps = _runs_and_gaps(row_active[top:bottom + 1])
+    col_runs, col_gaps = _runs_and_gaps(col_active[left:right + 1])
+    if row_runs == col_runs == 1:
+        return None
+
+    score = np.log((col_runs + 1) / (row_runs + 1))
+    score += 0.5 * np.log((right - left + 1) / (bottom - top + 1))
+    if len(row_gaps) and len(col_gaps):
+        score += np.log((np.median(row_gaps) + 1) / (np.median(col_gaps) + 1))
+    direction = "horizontal" if score >= 0 else "vertical"
+    lines = row_runs if direction == "horizontal" else col_runs
+    return Orientation(direction=direction, lines=int(lines), confidence=round(float(1 - np.exp(-abs(score))), 3))
+
+
+def _runs_and_gaps(active: np.ndarray) -> tuple[int, np.ndarray]:
+    """Number of True runs in a 1-D mask and the lengths of the gaps between them."""
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], active.astype(np.int8), [0]))))
+    starts, ends = edges[::2], edges[1::2]
+    return len(starts), starts[1:] - ends[:-1]
@@ -87,8 +87,9 @@ _POS_AUX = "助動詞"
 class SudachiNormalizer:
     method_name = "sudachi_nlp"
 
-    def __init__(self) -> None:
-        self._tokenizer = None
+    def __init__(self, tokenizer=None) -> None:
+        # A pre-built tokenizer (e.g. the worker daemon's) skips loading Sudachi here.
+        self._tokenizer = tokenizer
         self._decompose_cache: dict[str, list[str]] = {}
 
     def _get_tokenizer(self):
@@ -105,6 +106,9 @@ class SudachiNormalizer:
         self._tokenizer = dictionary.Dictionary().create()
         return self._tokenizer
 
+    def warm_up(self) -> None:
+        self._get_tokenizer()
+
     def normalize_text(
         self,
         text: str,
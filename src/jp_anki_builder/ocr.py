@@ -1,16 +1,36 @@
 from __future__ import annotations
 
+import hashlib
+import json
 import os
 import re
+import threading
 import warnings
-from dataclasses import dataclass
+from collections import Counter
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from importlib.metadata import PackageNotFoundError
+from importlib.metadata import version as distribution_version
 from pathlib import Path
+from typing import ClassVar
+
+from jp_anki_builder.imaging import ORIENTATION_MIN_CONFIDENCE, Orientation, classify_orientation, load_image
+from jp_anki_builder.sweep_stats import SAMPLE_EVERY, combo_key
 
 
 class OcrError(RuntimeError):
     pass
 
 
+class OcrTimeout(OcrError):
+    """OCR of one image (or batch) overran its deadline and was abandoned."""
+
+
+class OcrWorkerCrash(OcrError):
+    """The OCR worker process died while reading one image (or batch)."""
+
+
 _MANGA_OCR_RUNTIME_CONFIGURED = False
 
 
@@ -72,14 +92,121 @@ def _configure_manga_ocr_runtime() -> None:
 
 @dataclass
 class SidecarOcrProvider:
-    """Reads OCR text from a sibling .txt file with the same stem."""
-
-    def extract_text(self, image_path: Path) -> str:
+    """Reads OCR text from a sibling .txt file with the same stem, or from one
+    manifest covering many images.
+
+    A manifest is JSONL (``{"image": ..., "text": ...}`` or ``{"hash": ...}``
+    per line) or TSV (``key<TAB>text`` with ``\\n``/``\\t`` escapes). Keys are
+    image paths (absolute, or relative to the manifest), bare file names, or
+    the image's SHA-256. It is streamed once into an in-memory index on first
+    use; images it does not cover fall back to their ``.txt`` file. The text
+    always describes the whole frame, so crop regions are ignored.
+    """
+
+    manifest: Path | None = None
+    _index: dict[str, str] | None = field(default=None, repr=False, compare=False)
+    _has_hash_keys: bool = field(default=False, repr=False, compare=False)
+    # Scan skips opening the image just to count its pixels.
+    reads_images: ClassVar[bool] = False
+
+    def extract_text(self, image_path: Path, region: tuple[int, int, int, int] | None = None) -> str:
+        if self.manifest is not None:
+            text = self._manifest_text(image_path)
+            if text is not None:
+                return text
         sidecar = image_path.with_suffix(".txt")
         if not sidecar.exists():
             return ""
         return sidecar.read_text(encoding="utf-8-sig")
 
+    def warm_up(self) -> None:
+        if self.manifest is not None:
+            self._load_manifest()
+
+    def _manifest_text(self, image_path: Path) -> str | None:
+        index = self._load_manifest()
+        for key in (str(image_path.resolve()), image_path.name):
+            if key in index:
+                return index[key]
+        if self._has_hash_keys:
+            from jp_anki_builder.ocr_cache import content_hash
+
+            return index.get(content_hash(image_path))
+        return None
+
+    def _load_manifest(self) -> dict[str, str]:
+        if self._index is not None:
+            return self._index
+        manifest = Path(self.manifest)
+        if not manifest.exists():
+            raise OcrError(f"Sidecar manifest not found: {manifest}")
+        parse = _parse_jsonl_line if manifest.suffix.lower() in (".jsonl", ".json") else _parse_tsv_line
+        index: dict[str, str] = {}
+        with manifest.open(encoding="utf-8-sig") as handle:
+            for line_number, line in enumerate(handle, start=1):
+                line = line.rstrip("\r\n")
+                if not line.strip() or line.startswith("#"):
+                    continue
+                try:
+                    entry = parse(line)
+                except ValueError as exc:
+                    raise OcrError(f"{manifest}:{line_number}: {exc}") from exc
+                if entry is None:
+                    continue
+                kind, key, text = entry
+                if kind == "hash":
+                    self._has_hash_keys = True
+                    index[key.lower()] = text
+                    continue
+                path = Path(key)
+                if not path.is_absolute() and len(path.parts) > 1:
+                    path = manifest.parent / path
+                # Bare file names match any image with that name.
+                index[str(path.resolve()) if len(path.parts) > 1 else key] = text
+        self._index = index
+        return index
+
+
+_SHA256_KEY = re.compile(r"[0-9a-fA-F]{64}")
+_TSV_ESCAPES = {"n": "\n", "t": "\t", "\\": "\\"}
+
+
+def _parse_jsonl_line(line: str) -> tuple[str, str, str]:
+    record = json.loads(line)
+    if not isinstance(record, dict) or not isinstance(record.get("text"), str):
+        raise ValueError("expected an object with a string 'text' field")
+    if isinstance(record.get("hash"), str):
+        return "hash", record["hash"], record["text"]
+    if isinstance(record.get("image"), str):
+        return "image", record["image"], record["text"]
+    raise ValueError("expected an 'image' or 'hash' field")
+
+
+def _parse_tsv_line(line: str) -> tuple[str, str, str] | None:
+    key, sep, raw = line.partition("\t")
+    if not sep:
+        raise ValueError("expected key<TAB>text")
+    if key in ("image", "hash") and raw == "text":
+        return None  # header row
+    text = re.sub(r"\\(.)", lambda m: _TSV_ESCAPES.get(m.group(1), m.group(0)), raw)
+    return ("hash" if _SHA256_KEY.fullmatch(key) else "image"), key, text
+
+
+def _package_version(name: str) -> str:
+    try:
+        return distribution_version(name)
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def _manga_post_process(text: str) -> str:
+    """Apply manga-ocr's own output cleanup when it is importable."""
+    try:
+        from manga_ocr.ocr import post_process
+    except ImportError:
+        return text
+    return post_process(text)
+
 
 @dataclass
 class MangaOcrProvider:
@@ -100,14 +227,134 @@ class MangaOcrProvider:
         cls._engine = MangaOcr()
         return cls._engine
 
-    def extract_text(self, image_path: Path) -> str:
+    def cache_version(self) -> str:
+        return f"manga-ocr/{_package_version('manga-ocr')}"
+
+    def warm_up(self) -> None:
+        self._get_engine()
+
+    def extract_text(self, image_path: Path, region: tuple[int, int, int, int] | None = None) -> str:
         engine = self._get_engine()
-        text = engine(str(image_path))
+        if region is None:
+            return self._clean_text(engine(str(image_path)))
+        return self._clean_text(engine(load_image(image_path, region)))
+
+    def extract_text_batch(self, image_paths: list[Path], batch_size: int = 8,
+                           regions: list[tuple[int, int, int, int] | None] | None = None) -> list[str]:
+        """OCR several images per forward pass; results are in input order."""
+        engine = self._get_engine()
+        regions = regions or [None] * len(image_paths)
+        step = max(batch_size, 1)
+        texts: list[str] = []
+        for start in range(0, len(image_paths), step):
+            texts.extend(self._run_batch(engine, image_paths[start : start + step], regions[start : start + step]))
+        return texts
+
+    def _run_batch(self, engine, image_paths: list[Path], regions: list | None = None) -> list[str]:
+        regions = regions or [None] * len(image_paths)
+        processor = getattr(engine, "processor", None) or getattr(engine, "feature_extractor", None)
+        model = getattr(engine, "model", None)
+        tokenizer = getattr(engine, "tokenizer", None)
+        if len(image_paths) == 1 or processor is None or model is None or tokenizer is None:
+            return [
+                self._clean_text(engine(str(path) if region is None else load_image(path, region)))
+                for path, region in zip(image_paths, regions, strict=True)
+            ]
+
+        images = []
+        for path, region in zip(image_paths, regions, strict=True):
+            # Same grayscale round-trip MangaOcr.__call__ applies per image.
+            images.append(load_image(path, region).convert("L").convert("RGB"))
+        pixel_values = processor(images, return_tensors="pt").pixel_values
+        token_ids = model.generate(
+            pixel_values.to(model.device),
+            max_length=300,
+            num_beams=1,
+            do_sample=False,
+        )
+        decoded = tokenizer.batch_decode(token_ids, skip_special_tokens=True)
+        return [self._clean_text(_manga_post_process(text)) for text in decoded]
+
+    @staticmethod
+    def _clean_text(text) -> str:
         if not isinstance(text, str):
             return ""
         return re.sub(r"\s+", "", text).strip()
 
 
+PREPROCESS_VARIANTS = ("orig", "up2_thr140", "up2_thr160", "up2_thr180", "up2_otsu")
+_FIXED_THRESHOLDS = {"up2_thr140": 140, "up2_thr160": 160, "up2_thr180": 180}
+
+
+class PreprocessedVariants:
+    """OCR input variants built on demand from one grayscale, 2x-upscaled array.
+
+    Different fonts/backgrounds favour different thresholds, so the sweep tries
+    several. A variant is built the first time a job needs it and dropped once
+    the last scheduled job using it has released it; the shared upscaled array
+    is dropped when no threshold variant is pending.
+    """
+
+    def __init__(self, image, preprocess: bool = True):
+        self.image = image
+        self.names = PREPROCESS_VARIANTS if preprocess else ("orig",)
+        self.peak_bytes = 0
+        self._up2 = None
+        self._histogram: list[int] = []
+        self._built: dict[str, object] = {}
+        self._pending: Counter[str] = Counter()
+        self._lock = threading.Lock()
+
+    def schedule(self, names) -> None:
+        with self._lock:
+            self._pending.update(names)
+
+    def acquire(self, name: str):
+        with self._lock:
+            if name not in self._built:
+                self._built[name] = self._build(name)
+                self.peak_bytes = max(self.peak_bytes, self._live_bytes())
+            return self._built[name]
+
+    def release(self, name: str) -> None:
+        with self._lock:
+            self._pending[name] -= 1
+            if self._pending[name] > 0:
+                return
+            self._built.pop(name, None)
+            if not any(self._pending[n] > 0 for n in self.names if n != "orig"):
+                self._up2 = None
+
+    def _build(self, name: str):
+        if name == "orig":
+            return self.image
+
+        import numpy as np
+        from PIL import Image
+
+        from jp_anki_builder.imaging import otsu_threshold
+
+        if self._up2 is None:
+            width, height = self.image.size
+            gray = self.image.convert("L")
+            self._up2 = np.asarray(gray.resize((width * 2, height * 2)))
+            # Upscaling barely changes the intensity distribution, so Otsu can
+            # use the 4x smaller source histogram.
+            self._histogram = gray.histogram()
+        if name in _FIXED_THRESHOLDS:
+            threshold = _FIXED_THRESHOLDS[name]
+        else:
+            threshold = otsu_threshold(self._histogram)
+        return Image.fromarray((self._up2 > threshold).view(np.uint8) * np.uint8(255))
+
+    def _live_bytes(self) -> int:
+        live = self._up2.nbytes if self._up2 is not None else 0
+        for name, variant in self._built.items():
+            if name != "orig":
+                live += variant.width * variant.height * len(variant.getbands())
+        return live
+
+
 @dataclass
 class OcrCandidate:
     text: str
@@ -115,6 +362,18 @@ class OcrCandidate:
     config: str
     preprocessed: bool
     language: str = ""
+    variant: str = ""
+
+
+TESSERACT_CONFIGS = ("--oem 1 --psm 6", "--oem 1 --psm 7", "--oem 1 --psm 11")
+TESSERACT_SEARCH_MODES = ("full", "tiered", "quick")
+
+# Config/variant pairs that win most often on clean dialogue boxes; the tiered
+# search tries these before widening to the rest of the sweep.
+_FIRST_TIER_CONFIG = TESSERACT_CONFIGS[0]
+_FIRST_TIER_VARIANTS = ("orig", "up2_thr160")
+# A single uniform block of vertically aligned text.
+_VERTICAL_CONFIG = "--oem 1 --psm 5"
 
 
 @dataclass
@@ -122,15 +381,61 @@ class TesseractOcrProvider:
     language: str = "jpn"
     tesseract_cmd: str | None = None
     preprocess: bool = True
+    workers: int = 1
+    search: str = "full"
+    min_score: float = 40.0
+    orientation: bool = False
+    # Learned (config, language, variant) jobs to run instead of the sweep;
+    # every ``sample_every``-th image still gets the full sweep.
+    combos: tuple[tuple[str, str, str], ...] = ()
+    sample_every: int = SAMPLE_EVERY
+    last_info: dict = field(default_factory=dict, repr=False, compare=False)
+    # Highest-ranked candidate of the last image, for callers that gate on its score.
+    last_best: OcrCandidate | None = field(default=None, repr=False, compare=False)
+    _pool: ThreadPoolExecutor | None = field(default=None, repr=False, compare=False)
+    _learned_images: int = field(default=0, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if self.search not in TESSERACT_SEARCH_MODES:
+            raise ValueError(
+                f"unsupported tesseract search mode: {self.search!r}. Use: {' or '.join(TESSERACT_SEARCH_MODES)}."
+            )
+        # JSON (daemon and worker specs) hands these over as lists.
+        self.combos = tuple(tuple(combo) for combo in self.combos)
+
+    def cache_version(self) -> str:
+        try:
+            import pytesseract
 
-    def extract_text(self, image_path: Path) -> str:
-        candidates = self.extract_text_candidates(image_path, top_n=1)
+            if self.tesseract_cmd:
+                pytesseract.pytesseract.tesseract_cmd = self.tesseract_cmd
+            engine_version = str(pytesseract.get_tesseract_version())
+        except Exception:
+            engine_version = "unknown"
+        return f"tesseract/{engine_version}/{self._search_tag()}"
+
+    def _search_tag(self) -> str:
+        """The search settings that change which text an image gets, for cache versions."""
+        search = self.search if self.search == "full" else f"{self.search}@{self.min_score:g}"
+        if self.orientation:
+            search += "+orientation"
+        if self.combos:
+            # Learned combos change with the statistics and drift, so they are part of the version.
+            learned = "\n".join(sorted(combo_key(combo) for combo in self.combos))
+            search += "+learned:" + hashlib.sha256(learned.encode("utf-8")).hexdigest()[:12]
+        return search
+
+    def extract_text(self, image_path: Path, region: tuple[int, int, int, int] | None = None) -> str:
+        candidates = self.extract_text_candidates(image_path, top_n=1, region=region)
         return candidates[0] if candidates else ""
 
-    def extract_text_candidates(self, image_path: Path, top_n: int = 8) -> list[str]:
+    def warm_up(self) -> None:
+        self._load_backend()
+
+    def _load_backend(self):
         try:
             import pytesseract
-            from PIL import Image
+            import PIL  # noqa: F401
         except ImportError as exc:
             raise OcrError(
                 "Tesseract OCR mode requires 'pytesseract' and 'Pillow'. "
@@ -139,38 +444,91 @@ class TesseractOcrProvider:
 
         if self.tesseract_cmd:
             pytesseract.pytesseract.tesseract_cmd = self.tesseract_cmd
-
-        image = Image.open(image_path)
-        variants = self._preprocess_variants(image) if self.preprocess else [("orig", image)]
-        configs = ["--oem 1 --psm 6", "--oem 1 --psm 7", "--oem 1 --psm 11"]
+        return pytesseract
+
+    def extract_text_candidates(self, image_path: Path, top_n: int = 8,
+                                region: tuple[int, int, int, int] | None = None) -> list[str]:
+        backend = self._load_backend()
+        # Decode once up front so worker threads never race on PIL's lazy load.
+        image = load_image(image_path, region)
+        variants = PreprocessedVariants(image, preprocess=self.preprocess)
+        configs = TESSERACT_CONFIGS
         languages = self._language_variants(self.language)
+        orientation_info = None
+        if self.orientation:
+            guess = classify_orientation(image)
+            orientation_info = {
+                "direction": guess.direction if guess else None,
+                "confidence": guess.confidence if guess else 0.0,
+                "pruned": guess is not None and guess.confidence >= ORIENTATION_MIN_CONFIDENCE,
+            }
+            if orientation_info["pruned"]:
+                config, language = self._oriented_job(guess, languages)
+                configs, languages = (config,), [language]
+        jobs = [
+            (config, lang, variant_name)
+            for config in configs
+            for lang in languages
+            for variant_name in variants.names
+        ]
+        sweep = None
+        if self.combos and not (orientation_info and orientation_info["pruned"]):
+            self._learned_images += 1
+            learned = [job for job in jobs if job in self.combos]
+            if self.sample_every and self._learned_images % self.sample_every == 0:
+                sweep = "sample"
+            elif learned:
+                sweep = "learned"
+                jobs = learned
+        if self.search == "full" or sweep == "sample":
+            # A drift sample runs every job, like a full search.
+            tiers = [list(range(len(jobs)))]
+        else:
+            tiers = self._search_tiers(jobs)
+            if self.search == "quick":
+                tiers = tiers[:1]
+            if sweep is None:
+                # Tiered and quick winners come from a partial sweep.
+                sweep = self.search
+
+        # Results are keyed by position in the full sweep so ranking sees
+        # candidates in the same order whichever tiers actually ran.
+        results: dict[int, tuple[OcrCandidate | None, Exception | None]] = {}
         candidates: list[OcrCandidate] = []
-        errors: list[Exception] = []
-
-        for config in configs:
-            for lang in languages:
-                for variant_name, variant in variants:
-                    try:
-                        candidate = self._ocr_candidate(
-                            pytesseract,
-                            variant,
-                            config,
-                            preprocessed=(variant_name != "orig"),
-                            language=lang,
-                        )
-                    except Exception as exc:
-                        errors.append(exc)
-                        continue
-                    if candidate.text:
-                        candidates.append(candidate)
+        for tier in tiers:
+            # Run each variant's jobs together so its buffer can be dropped early.
+            tier = sorted(tier, key=lambda i: (variants.names.index(jobs[i][2]), i))
+            tier_results = self._run_jobs(backend, [jobs[i] for i in tier], variants)
+            results.update(zip(tier, tier_results, strict=True))
+            candidates = [
+                candidate
+                for _, (candidate, _) in sorted(results.items())
+                if candidate is not None and candidate.text
+            ]
+            if self._good_enough(candidates):
+                break
 
+        self.last_info = {"calls": len(results)}
+        if orientation_info is not None:
+            self.last_info["orientation"] = orientation_info
+        self.last_best = None
         if not candidates:
+            errors = [error for _, (_, error) in sorted(results.items()) if error is not None]
             if errors:
                 self._raise_with_context(errors[-1])
             return []
 
         # Highest-scoring text first, unique by normalized output.
         ranked = sorted(candidates, key=self._score_candidate, reverse=True)
+        self.last_best = ranked[0]
+        winner = (ranked[0].config, ranked[0].language, ranked[0].variant)
+        self.last_info["winner"] = list(winner)
+        if sweep is not None:
+            self.last_info["sweep"] = sweep
+        if sweep == "sample" and winner not in self.combos:
+            # Drift: adopt the new winner for the rest of this run.
+            self.last_info["drift"] = True
+            self.combos += (winner,)
         seen: set[str] = set()
         texts: list[str] = []
         for item in ranked:
@@ -183,17 +541,90 @@ class TesseractOcrProvider:
         return texts
 
     @staticmethod
-    def _preprocess_variants(image):
-        # Try multiple threshold variants; different fonts/backgrounds behave differently.
-        width, height = image.size
-        gray = image.convert("L")
-        up2 = gray.resize((width * 2, height * 2))
-        return [
-            ("orig", image),
-            ("up2_thr140", up2.point(lambda p: 255 if p > 140 else 0)),
-            ("up2_thr160", up2.point(lambda p: 255 if p > 160 else 0)),
-            ("up2_thr180", up2.point(lambda p: 255 if p > 180 else 0)),
-        ]
+    def _oriented_job(guess: Orientation, languages: list[str]) -> tuple[str, str]:
+        """Config and language for text whose direction is known: --psm 5 with
+        the vertical model, else --psm 7 for one line and --psm 6 for a block."""
+        if guess.direction == "vertical":
+            return _VERTICAL_CONFIG, languages[-1]
+        return (TESSERACT_CONFIGS[1] if guess.lines == 1 else TESSERACT_CONFIGS[0]), languages[0]
+
+    def _search_tiers(self, jobs: list[tuple]) -> list[list[int]]:
+        """Split sweep job indices into tiers: the usual winners, the rest of the
+        primary language at --psm 6/7, then --psm 11 and the vertical variants."""
+        tiers: list[list[int]] = [[], [], []]
+        for index, (config, lang, variant_name) in enumerate(jobs):
+            if lang != self.language or config == TESSERACT_CONFIGS[-1]:
+                tiers[2].append(index)
+            elif config == _FIRST_TIER_CONFIG and variant_name in _FIRST_TIER_VARIANTS:
+                tiers[0].append(index)
+            else:
+                tiers[1].append(index)
+        return [tier for tier in tiers if tier]
+
+    def _good_enough(self, candidates: list[OcrCandidate]) -> bool:
+        """Early-exit test for the tiered search: the best candidate clears
+        ``min_score`` and at least two calls agree on its text."""
+        if self.search != "tiered" or not candidates:
+            return False
+        best = max(candidates, key=self._score_candidate)
+        if self._score_candidate(best) < self.min_score:
+            return False
+        agreeing = sum(1 for candidate in candidates if candidate.text == best.text)
+        return agreeing >= min(2, len(candidates))
+
+    def _run_jobs(self, backend, jobs: list[tuple], variants: PreprocessedVariants,
+                  ) -> list[tuple[OcrCandidate | None, Exception | None]]:
+        """Run sweep jobs, returning (candidate, error) pairs in job order.
+
+        Each pytesseract call is a separate tesseract process (and tesserocr
+        releases the GIL while recognizing), so threads are enough to overlap
+        them. Results keep the job order, and callers rank
+        by full-sweep position, so the output matches the serial sweep.
+        """
+        variants.schedule(variant_name for _, _, variant_name in jobs)
+
+        def run(job):
+            config, lang, variant_name = job
+            try:
+                candidate = self._ocr_candidate(
+                    backend,
+                    variants.acquire(variant_name),
+                    config,
+                    preprocessed=(variant_name != "orig"),
+                    language=lang,
+                )
+            except Exception as exc:
+                return None, exc
+            finally:
+                variants.release(variant_name)
+            candidate.variant = variant_name
+            return candidate, None
+
+        if self.workers <= 1 or len(jobs) <= 1:
+            return [run(job) for job in jobs]
+        # One pool for the provider's lifetime keeps per-thread engine state
+        # (see TesseractApiOcrProvider) alive across tiers and images.
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="tesseract")
+        return list(self._pool.map(run, jobs))
+
+    def close(self) -> None:
+        """Shut down the sweep thread pool; a later sweep starts a new one."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    def __enter__(self) -> TesseractOcrProvider:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __del__(self) -> None:
+        # Providers dropped without close() still let their threads exit.
+        pool = getattr(self, "_pool", None)
+        if pool is not None:
+            pool.shutdown(wait=False)
 
     @staticmethod
     def _normalize_text(text: str) -> str:
@@ -218,10 +649,18 @@ class TesseractOcrProvider:
             config=config,
             output_type=pytesseract.Output.DICT,
         )
+        words = zip(data.get("text", []), data.get("conf", []), strict=False)
+        return self._candidate_from_words(words, config, preprocessed, language)
+
+    def _candidate_from_words(self, words, config: str, preprocessed: bool, language: str) -> OcrCandidate:
+        """Join (token, confidence) pairs into a scored candidate.
+
+        Shared by both Tesseract backends so their candidates rank identically.
+        """
         tokens: list[str] = []
         confs: list[float] = []
 
-        for token, conf in zip(data.get("text", []), data.get("conf", []), strict=False):
+        for token, conf in words:
             token = (token or "").strip()
             if not token:
                 continue
@@ -282,20 +721,180 @@ class TesseractOcrProvider:
         raise OcrError(f"Tesseract OCR failed: {message}") from exc
 
 
+_CONFIG_FLAG = re.compile(r"--(oem|psm)\s+(\d+)")
+
+
+@dataclass
+class TesseractApiOcrProvider(TesseractOcrProvider):
+    """Tesseract through the tesserocr bindings instead of the CLI.
+
+    Each worker thread keeps one initialized engine per (language, --oem), so
+    the traineddata load is paid once per thread rather than once per sweep
+    call, and images are handed over in memory instead of through temp files.
+    Candidates go through the same scoring as ``TesseractOcrProvider``.
+    """
+
+    _engines: threading.local = field(default_factory=threading.local, repr=False, compare=False)
+
+    def cache_version(self) -> str:
+        try:
+            import tesserocr
+
+            engine_version = str(tesserocr.tesseract_version()).splitlines()[0]
+        except Exception:
+            engine_version = "unknown"
+        return f"tesseract/{engine_version}/{self._search_tag()}"
+
+    def _load_backend(self):
+        try:
+            import PIL  # noqa: F401
+            import tesserocr
+        except ImportError as exc:
+            raise OcrError(
+                "tesseract-api OCR mode requires 'tesserocr' and 'Pillow'. "
+                "Install with: pip install -e .[tesseract_api] "
+                "(tesserocr needs the Tesseract development libraries), or use --ocr-mode tesseract."
+            ) from exc
+        return tesserocr
+
+    def _engine(self, tesserocr, language: str, oem: int):
+        engines = getattr(self._engines, "by_key", None)
+        if engines is None:
+            engines = self._engines.by_key = {}
+        key = (language, oem)
+        api = engines.get(key)
+        if api is None:
+            api = tesserocr.PyTessBaseAPI(lang=language, oem=oem)
+            engines[key] = api
+        return api
+
+    def _ocr_candidate(self, tesserocr, image, config: str, preprocessed: bool, language: str) -> OcrCandidate:
+        flags = {name: int(value) for name, value in _CONFIG_FLAG.findall(config)}
+        api = self._engine(tesserocr, language, flags.get("oem", 1))
+        api.SetPageSegMode(flags.get("psm", 6))
+        api.SetImage(image)
+        words = api.MapWordConfidences()
+        return self._candidate_from_words(words, config, preprocessed, language)
+
+    def _raise_with_context(self, exc: Exception) -> None:
+        if "Failed to init API" in str(exc):
+            raise OcrError(
+                f"Tesseract language data not available for '{self.language}'. "
+                "Install matching traineddata files in your tessdata directory (or set TESSDATA_PREFIX)."
+            ) from exc
+        super()._raise_with_context(exc)
+
+
+@dataclass
+class CascadeOcrProvider:
+    """Quick Tesseract pass first; manga-ocr only for images it reads poorly.
+
+    An image is escalated when the fast pass finds no text, its best
+    candidate scores below ``min_score``, or ``known_ratio`` (set by the
+    caller, who owns the dictionary) says too few of its words are real.
+    ``last_info`` keeps the fast text next to the escalation decision.
+    """
+
+    fast: TesseractOcrProvider
+    slow: object
+    min_score: float = 40.0
+    min_known_ratio: float = 0.5
+    known_ratio: Callable[[str], float] | None = field(default=None, repr=False, compare=False)
+    last_info: dict = field(default_factory=dict, repr=False, compare=False)
+
+    def cache_version(self) -> str:
+        slow_version = self.slow.cache_version() if hasattr(self.slow, "cache_version") else "unknown"
+        return (
+            f"cascade/{self.fast.cache_version()}+{slow_version}"
+            f"/{self.min_score:g}/{self.min_known_ratio:g}"
+        )
+
+    def warm_up(self) -> None:
+        # manga-ocr loads on the first escalation, so runs the fast pass
+        # handles on its own never pay for the model.
+        self.fast.warm_up()
+
+    def close(self) -> None:
+        self.fast.close()
+        if hasattr(self.slow, "close"):
+            self.slow.close()
+
+    def extract_text(self, image_path: Path, region: tuple[int, int, int, int] | None = None) -> str:
+        texts = self.extract_text_candidates(image_path, top_n=1, region=region)
+        return texts[0] if texts else ""
+
+    def extract_text_candidates(self, image_path: Path, top_n: int = 8,
+                                region: tuple[int, int, int, int] | None = None) -> list[str]:
+        kwargs = {"region": region} if region is not None else {}
+        texts = self.fast.extract_text_candidates(image_path, top_n=top_n, **kwargs)
+        best = self.fast.last_best
+        score = TesseractOcrProvider._score_candidate(best) if best is not None else None
+        info = {"calls": self.fast.last_info.get("calls", 0), "fast_text": texts[0] if texts else ""}
+        if "orientation" in self.fast.last_info:
+            info["orientation"] = self.fast.last_info["orientation"]
+        if score is not None:
+            info["fast_score"] = round(score, 1)
+        escalate = score is None or score < self.min_score
+        if texts and self.known_ratio is not None:
+            info["known_ratio"] = round(self.known_ratio(texts[0]), 2)
+            escalate = escalate or info["known_ratio"] < self.min_known_ratio
+        info["escalated"] = escalate
+        self.last_info = info
+        if not escalate:
+            return texts
+        slow_text = self.slow.extract_text(image_path, **kwargs)
+        return [slow_text] if slow_text else []
+
+
 def build_ocr_provider(
     mode: str,
     language: str = "jpn",
     tesseract_cmd: str | None = None,
     preprocess: bool = True,
+    tesseract_workers: int = 1,
+    tesseract_search: str = "full",
+    tesseract_min_score: float = 40.0,
+    onnx_threads: int = 0,
+    base_dir: str = "data",
+    tesseract_orientation: bool = False,
+    tesseract_combos: list | None = None,
+    cascade_min_known: float = 0.5,
+    sidecar_manifest: str | None = None,
 ):
     if mode == "sidecar":
-        return SidecarOcrProvider()
+        return SidecarOcrProvider(manifest=Path(sidecar_manifest) if sidecar_manifest else None)
     if mode == "manga-ocr":
         return MangaOcrProvider()
-    if mode == "tesseract":
-        return TesseractOcrProvider(
+    if mode == "onnx-manga-ocr":
+        from jp_anki_builder.onnx_ocr import OnnxMangaOcrProvider, onnx_model_dir
+
+        return OnnxMangaOcrProvider(model_dir=onnx_model_dir(base_dir), threads=onnx_threads)
+    if mode in ("tesseract", "tesseract-api"):
+        provider_cls = TesseractApiOcrProvider if mode == "tesseract-api" else TesseractOcrProvider
+        return provider_cls(
+            language=language,
+            tesseract_cmd=tesseract_cmd,
+            preprocess=preprocess,
+            workers=tesseract_workers,
+            search=tesseract_search,
+            min_score=tesseract_min_score,
+            orientation=tesseract_orientation,
+            combos=tesseract_combos or (),
+        )
+    if mode == "cascade":
+        fast = TesseractOcrProvider(
             language=language,
             tesseract_cmd=tesseract_cmd,
             preprocess=preprocess,
+            workers=tesseract_workers,
+            search="quick",
+            min_score=tesseract_min_score,
+            orientation=tesseract_orientation,
+        )
+        return CascadeOcrProvider(
+            fast=fast,
+            slow=MangaOcrProvider(),
+            min_score=tesseract_min_score,
+            min_known_ratio=cascade_min_known,
         )
     raise ValueError(f"Unsupported OCR mode: {mode}")
@@ -0,0 +1,152 @@
+"""Content-addressed OCR result cache shared across sources and runs.
+
+Entries are keyed by a hash of the image bytes plus every OCR setting that
+changes the output (mode, language, preprocessing, provider version), so a
+renamed or moved screenshot, a new run id, or a normalizer change still hits
+the cache. Storage is a single SQLite file under ``data/cache/ocr`` bounded by
+size with least-recently-used eviction.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_MB = 512
+_HASH_CHUNK_BYTES = 1 << 20
+
+
+def ocr_cache_path(base_dir: str = "data") -> Path:
+    return Path(base_dir) / "cache" / "ocr" / "ocr_cache.db"
+
+
+def content_hash(path: Path) -> str:
+    """SHA-256 of a file's bytes, read in chunks."""
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        while chunk := handle.read(_HASH_CHUNK_BYTES):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_key(digest: str, ocr_mode: str, language: str, preprocess: bool, provider_version: str,
+              region: tuple[int, int, int, int] | None = None) -> str:
+    key = f"{digest}:{ocr_mode}:{language}:{int(preprocess)}:{provider_version}"
+    if region is not None:
+        key += ":" + ",".join(str(v) for v in region)
+    return key
+
+
+@dataclass
+class OcrCacheStats:
+    path: Path
+    entry_count: int
+    total_bytes: int
+    max_bytes: int
+
+
+class OcrResultCache:
+    """SQLite-backed store of OCR candidate texts with LRU eviction."""
+
+    def __init__(self, path: Path, max_bytes: int = DEFAULT_MAX_MB * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        # Cleared by a caller whose results stop matching their keys; put then
+        # does nothing while get keeps working.
+        self.writable = True
+        self._conn: sqlite3.Connection | None = None
+        self._total_bytes = 0
+
+    def _get_conn(self) -> sqlite3.Connection:
+        if self._conn is not None:
+            return self._conn
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        # WAL keeps the per-image commits cheap and lets concurrent runs read.
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "  key TEXT PRIMARY KEY,"
+            "  texts TEXT NOT NULL,"
+            "  size INTEGER NOT NULL,"
+            "  last_used REAL NOT NULL"
+            ")"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used)")
+        self._total_bytes = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        self._conn = conn
+        return conn
+
+    def get(self, key: str) -> list[str] | None:
+        conn = self._get_conn()
+        row = conn.execute("SELECT texts FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        conn.execute("UPDATE entries SET last_used = ? WHERE key = ?", (time.time(), key))
+        conn.commit()
+        return json.loads(row[0])
+
+    def put(self, key: str, texts: list[str]) -> None:
+        if not self.writable:
+            return
+        conn = self._get_conn()
+        payload = json.dumps(texts, ensure_ascii=False)
+        size = len(key) + len(payload.encode("utf-8"))
+        previous = conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+        conn.execute(
+            "INSERT OR REPLACE INTO entries (key, texts, size, last_used) VALUES (?, ?, ?, ?)",
+            (key, payload, size, time.time()),
+        )
+        self._total_bytes += size - (previous[0] if previous else 0)
+        if self._total_bytes > self.max_bytes:
+            self._evict(self.max_bytes)
+        conn.commit()
+
+    def prune(self, max_bytes: int | None = None) -> int:
+        """Evict least-recently-used entries until the cache fits *max_bytes*.
+
+        Returns the number of entries removed.
+        """
+        self._get_conn()
+        removed = self._evict(self.max_bytes if max_bytes is None else max_bytes)
+        self._conn.commit()
+        if removed:
+            self._conn.execute("VACUUM")
+        return removed
+
+    def _evict(self, limit: int) -> int:
+        conn = self._get_conn()
+        removed: list[tuple[str]] = []
+        freed = 0
+        for key, size in conn.execute("SELECT key, size FROM entries ORDER BY last_used"):
+            if self._total_bytes - freed <= limit:
+                break
+            removed.append((key,))
+            freed += size
+        conn.executemany("DELETE FROM entries WHERE key = ?", removed)
+        self._total_bytes -= freed
+        if removed:
+            logger.debug("evicted %d OCR cache entries (%d bytes)", len(removed), freed)
+        return len(removed)
+
+    def stats(self) -> OcrCacheStats:
+        conn = self._get_conn()
+        count = conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        return OcrCacheStats(
+            path=self.path,
+            entry_count=count,
+            total_bytes=self._total_bytes,
+            max_bytes=self.max_bytes,
+        )
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
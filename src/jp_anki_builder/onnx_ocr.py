@@ -0,0 +1,285 @@
+"""ONNX Runtime backend for the manga-ocr model.
+
+``export_manga_ocr_onnx`` converts the PyTorch manga-ocr model once into an
+encoder graph and a decoder graph under ``data/models/manga-ocr-onnx``, with
+dynamic int8 weight quantization by default. ``OnnxMangaOcrProvider`` then runs
+greedy decoding with onnxruntime and NumPy only, so scanning needs neither
+torch nor transformers.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import shutil
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from jp_anki_builder.imaging import load_image
+from jp_anki_builder.ocr import (
+    MangaOcrProvider,
+    OcrError,
+    _configure_manga_ocr_runtime,
+    _manga_post_process,
+    _package_version,
+)
+
+logger = logging.getLogger(__name__)
+
+MODEL_DIRNAME = "manga-ocr-onnx"
+META_FILENAME = "model.json"
+ENCODER_FILENAME = "encoder.onnx"
+DECODER_FILENAME = "decoder.onnx"
+VOCAB_FILENAME = "vocab.txt"
+# Same cap MangaOcr uses for generate().
+DEFAULT_MAX_LENGTH = 300
+
+
+def onnx_model_dir(base_dir: str = "data") -> Path:
+    return Path(base_dir) / "models" / MODEL_DIRNAME
+
+
+@dataclass
+class OnnxExportSummary:
+    output_dir: Path
+    quantized: bool
+    encoder_bytes: int
+    decoder_bytes: int
+
+
+def export_manga_ocr_onnx(base_dir: str = "data", quantize: bool = True, opset: int = 17) -> OnnxExportSummary:
+    """Export manga-ocr to ONNX (encoder + decoder) and optionally quantize to int8."""
+    try:
+        import torch
+        from manga_ocr import MangaOcr
+    except ImportError as exc:
+        raise OcrError(
+            "Exporting the ONNX model requires 'manga-ocr' (and its torch dependency). "
+            "Install with: .\\.venv\\Scripts\\python -m pip install -e \".[manga_ocr,onnx_ocr]\""
+        ) from exc
+    try:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+    except ImportError as exc:
+        raise OcrError(
+            "Exporting the ONNX model requires 'onnxruntime'. Install with: "
+            ".\\.venv\\Scripts\\python -m pip install -e \".[onnx_ocr]\""
+        ) from exc
+
+    _configure_manga_ocr_runtime()
+    engine = MangaOcr(force_cpu=True)
+    model = engine.model.eval()
+    processor = getattr(engine, "processor", None) or engine.feature_extractor
+    tokenizer = engine.tokenizer
+
+    class EncoderGraph(torch.nn.Module):
+        def __init__(self):
+            super().__init__()
+            self.encoder = model.encoder
+            self.proj = getattr(model, "enc_to_dec_proj", None)
+
+        def forward(self, pixel_values):
+            hidden = self.encoder(pixel_values=pixel_values).last_hidden_state
+            return self.proj(hidden) if self.proj is not None else hidden
+
+    class DecoderGraph(torch.nn.Module):
+        def __init__(self):
+            super().__init__()
+            self.decoder = model.decoder
+
+        def forward(self, input_ids, encoder_hidden_states):
+            return self.decoder(
+                input_ids=input_ids,
+                encoder_hidden_states=encoder_hidden_states,
+                use_cache=False,
+                return_dict=False,
+            )[0]
+
+    size = processor.size
+    height, width = (size["height"], size["width"]) if isinstance(size, dict) else (size, size)
+    start_token_id = int(model.config.decoder_start_token_id)
+    eos_token_id = int(model.config.eos_token_id if model.config.eos_token_id is not None else tokenizer.sep_token_id)
+    pad_token_id = int(model.config.pad_token_id if model.config.pad_token_id is not None else tokenizer.pad_token_id)
+
+    output_dir = onnx_model_dir(base_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    with tempfile.TemporaryDirectory() as tmp:
+        raw = {name: Path(tmp) / name for name in (ENCODER_FILENAME, DECODER_FILENAME)}
+        pixel_values = torch.zeros(1, 3, height, width)
+        encoder_graph = EncoderGraph().eval()
+        decoder_graph = DecoderGraph().eval()
+        with torch.no_grad():
+            torch.onnx.export(
+                encoder_graph,
+                (pixel_values,),
+                str(raw[ENCODER_FILENAME]),
+                input_names=["pixel_values"],
+                output_names=["encoder_hidden_states"],
+                dynamic_axes={"pixel_values": {0: "batch"}, "encoder_hidden_states": {0: "batch"}},
+                opset_version=opset,
+            )
+            hidden = encoder_graph(pixel_values)
+            input_ids = torch.full((1, 2), start_token_id, dtype=torch.long)
+            torch.onnx.export(
+                decoder_graph,
+                (input_ids, hidden),
+                str(raw[DECODER_FILENAME]),
+                input_names=["input_ids", "encoder_hidden_states"],
+                output_names=["logits"],
+                dynamic_axes={
+                    "input_ids": {0: "batch", 1: "sequence"},
+                    "encoder_hidden_states": {0: "batch"},
+                    "logits": {0: "batch", 1: "sequence"},
+                },
+                opset_version=opset,
+            )
+        for name, source in raw.items():
+            target = output_dir / name
+            if quantize:
+                logger.info("quantizing %s to int8", name)
+                quantize_dynamic(str(source), str(target), weight_type=QuantType.QInt8)
+            else:
+                shutil.copyfile(source, target)
+
+    vocab = [token for token, _ in sorted(tokenizer.get_vocab().items(), key=lambda item: item[1])]
+    (output_dir / VOCAB_FILENAME).write_text("\n".join(vocab) + "\n", encoding="utf-8")
+    meta = {
+        "manga_ocr_version": _package_version("manga-ocr"),
+        "quantized": quantize,
+        "exported_at": int(time.time()),
+        "image_size": [height, width],
+        "image_mean": [float(v) for v in processor.image_mean],
+        "image_std": [float(v) for v in processor.image_std],
+        "rescale_factor": float(getattr(processor, "rescale_factor", 1 / 255)),
+        "decoder_start_token_id": start_token_id,
+        "eos_token_id": eos_token_id,
+        "pad_token_id": pad_token_id,
+        "special_token_ids": sorted(int(i) for i in tokenizer.all_special_ids),
+    }
+    (output_dir / META_FILENAME).write_text(json.dumps(meta, indent=2), encoding="utf-8")
+    return OnnxExportSummary(
+        output_dir=output_dir,
+        quantized=quantize,
+        encoder_bytes=(output_dir / ENCODER_FILENAME).stat().st_size,
+        decoder_bytes=(output_dir / DECODER_FILENAME).stat().st_size,
+    )
+
+
+@dataclass
+class OnnxMangaOcrProvider:
+    model_dir: Path
+    threads: int = 0
+    max_length: int = DEFAULT_MAX_LENGTH
+    _sessions: tuple | None = field(default=None, repr=False, compare=False)
+    _meta: dict | None = field(default=None, repr=False, compare=False)
+    _vocab: list[str] = field(default_factory=list, repr=False, compare=False)
+
+    def _read_meta(self) -> dict:
+        if self._meta is None:
+            meta_path = self.model_dir / META_FILENAME
+            if not meta_path.exists():
+                raise OcrError(
+                    f"No exported ONNX manga-ocr model in {self.model_dir}. "
+                    "Create it once with: jp-anki-build export-onnx-model"
+                )
+            self._meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        return self._meta
+
+    def _get_sessions(self) -> tuple:
+        if self._sessions is not None:
+            return self._sessions
+        try:
+            import onnxruntime as ort
+        except ImportError as exc:
+            raise OcrError(
+                "onnx-manga-ocr mode requires 'onnxruntime'. Install with: "
+                ".\\.venv\\Scripts\\python -m pip install -e \".[onnx_ocr]\""
+            ) from exc
+        self._read_meta()
+        options = ort.SessionOptions()
+        if self.threads > 0:
+            options.intra_op_num_threads = self.threads
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        providers = ["CPUExecutionProvider"]
+        encoder = ort.InferenceSession(str(self.model_dir / ENCODER_FILENAME), sess_options=options, providers=providers)
+        decoder = ort.InferenceSession(str(self.model_dir / DECODER_FILENAME), sess_options=options, providers=providers)
+        self._vocab = (self.model_dir / VOCAB_FILENAME).read_text(encoding="utf-8").splitlines()
+        self._sessions = (encoder, decoder)
+        return self._sessions
+
+    def cache_version(self) -> str:
+        try:
+            meta = self._read_meta()
+        except (OcrError, OSError, ValueError):
+            return "onnx-manga-ocr/unknown"
+        precision = "int8" if meta.get("quantized") else "fp32"
+        return f"onnx-manga-ocr/{meta.get('manga_ocr_version')}/{precision}/{meta.get('exported_at')}"
+
+    def warm_up(self) -> None:
+        self._get_sessions()
+
+    def extract_text(self, image_path: Path, region: tuple[int, int, int, int] | None = None) -> str:
+        return self.extract_text_batch([image_path], batch_size=1, regions=[region])[0]
+
+    def extract_text_batch(self, image_paths: list[Path], batch_size: int = 8,
+                           regions: list[tuple[int, int, int, int] | None] | None = None) -> list[str]:
+        """OCR several images per encoder/decoder call; results are in input order."""
+        sessions = self._get_sessions()
+        regions = regions or [None] * len(image_paths)
+        step = max(batch_size, 1)
+        texts: list[str] = []
+        for start in range(0, len(image_paths), step):
+            texts.extend(self._run_batch(sessions, image_paths[start : start + step], regions[start : start + step]))
+        return texts
+
+    def _run_batch(self, sessions: tuple, image_paths: list[Path], regions: list) -> list[str]:
+        import numpy as np
+
+        encoder, decoder = sessions
+        meta = self._meta
+        pixel_values = np.stack([
+            self._preprocess(path, region) for path, region in zip(image_paths, regions, strict=True)
+        ])
+        hidden = encoder.run(None, {"pixel_values": pixel_values})[0]
+
+        # Greedy decoding without a KV cache: the decoder re-reads the whole
+        # prefix each step, which is cheap for dialogue-length outputs.
+        input_ids = np.full((len(image_paths), 1), meta["decoder_start_token_id"], dtype=np.int64)
+        finished = np.zeros(len(image_paths), dtype=bool)
+        for _ in range(self.max_length - 1):
+            logits = decoder.run(None, {"input_ids": input_ids, "encoder_hidden_states": hidden})[0]
+            next_ids = logits[:, -1, :].argmax(axis=-1).astype(np.int64)
+            next_ids[finished] = meta["pad_token_id"]
+            input_ids = np.concatenate([input_ids, next_ids[:, None]], axis=1)
+            finished |= next_ids == meta["eos_token_id"]
+            if finished.all():
+                break
+        return [self._decode(row) for row in input_ids[:, 1:]]
+
+    def _preprocess(self, image_path: Path, region: tuple[int, int, int, int] | None = None):
+        """NumPy version of the ViT image processor manga-ocr ships with."""
+        import numpy as np
+        from PIL import Image
+
+        meta = self._meta
+        height, width = meta["image_size"]
+        image = load_image(image_path, region)
+        # Same grayscale round-trip MangaOcr.__call__ applies per image.
+        rgb = image.convert("L").convert("RGB").resize((width, height), Image.Resampling.BILINEAR)
+        pixels = np.asarray(rgb, dtype=np.float32) * np.float32(meta["rescale_factor"])
+        mean = np.asarray(meta["image_mean"], dtype=np.float32)
+        std = np.asarray(meta["image_std"], dtype=np.float32)
+        return ((pixels - mean) / std).transpose(2, 0, 1)
+
+    def _decode(self, token_ids) -> str:
+        meta = self._meta
+        special = set(meta["special_token_ids"])
+        tokens: list[str] = []
+        for token_id in token_ids.tolist():
+            if token_id == meta["eos_token_id"]:
+                break
+            if token_id in special or token_id >= len(self._vocab):
+                continue
+            token = self._vocab[token_id]
+            tokens.append(token[2:] if token.startswith("##") else token)
+        return MangaOcrProvider._clean_text(_manga_post_process("".join(tokens)))
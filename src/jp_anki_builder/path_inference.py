@@ -9,11 +9,14 @@ Examples:
     C:/imgs/GameX/Ch01                -> source=GameX, run_id=Ch01
     ./screenshots/single_folder       -> source=single_folder, run_id=single_folder
     ./screenshot.png                  -> None, None (single file, can't infer)
+    ./recordings/GameX/ch01.mp4       -> source=GameX, run_id=ch01 (one run per video)
 """
 from __future__ import annotations
 
 from pathlib import Path
 
+from jp_anki_builder.video import VIDEO_EXTENSIONS
+
 
 def infer_source_and_run_id(images_path: str) -> tuple[str | None, str | None]:
     """Infer source and run_id from the images path.
@@ -23,6 +26,8 @@ def infer_source_and_run_id(images_path: str) -> tuple[str | None, str | None]:
     p = Path(images_path).resolve()
 
     if p.is_file():
+        if p.suffix.lower() in VIDEO_EXTENSIONS:
+            return p.parent.name or None, p.stem
         # Single file: use parent directory structure
         p = p.parent
 
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+from collections.abc import Callable, Iterable
 from dataclasses import dataclass
+from pathlib import Path
 
 from jp_anki_builder.build import run_build
 from jp_anki_builder.review import run_review
-from jp_anki_builder.scan import run_scan
+from jp_anki_builder.scan import ScanOptions, run_scan
+from jp_anki_builder.shared import SharedResources
 
 
 @dataclass
@@ -16,24 +19,28 @@ class Pipeline:
         images: str,
         source: str,
         run_id: str,
-        ocr_mode: str = "sidecar",
-        ocr_language: str = "jpn",
-        tesseract_cmd: str | None = None,
-        preprocess: bool = True,
-        online_dict: str = "off",
+        options: ScanOptions | None = None,
+        video: bool = False,
         resume: bool = False,
+        batches: Iterable[list[Path]] | None = None,
+        on_batch: Callable[[list[dict]], None] | None = None,
+        shared: SharedResources | None = None,
+        on_progress: Callable[[str], None] | None = None,
+        image_files: list[Path] | None = None,
     ) -> dict:
         summary = run_scan(
             images=images,
             source=source,
             run_id=run_id,
+            options=options,
             base_dir=self.data_dir,
-            ocr_mode=ocr_mode,
-            ocr_language=ocr_language,
-            tesseract_cmd=tesseract_cmd,
-            preprocess=preprocess,
-            online_dict=online_dict,
+            video=video,
             resume=resume,
+            batches=batches,
+            on_batch=on_batch,
+            shared=shared,
+            on_progress=on_progress,
+            image_files=image_files,
         )
         return {
             "stage": "scan",
@@ -43,6 +50,7 @@ class Pipeline:
             "candidates": summary.candidates,
             "artifact_path": str(summary.artifact_path),
             "resumed": summary.resumed,
+            "stats": summary.stats,
         }
 
     def review(
@@ -51,6 +59,7 @@ class Pipeline:
         run_id: str,
         exclude: list[str] | None = None,
         save_excluded_to_known: bool = False,
+        keep_run_approved: bool = False,
     ) -> dict:
         summary = run_review(
             source=source,
@@ -58,6 +67,7 @@ class Pipeline:
             base_dir=self.data_dir,
             exclude=exclude,
             save_excluded_to_known=save_excluded_to_known,
+            keep_run_approved=keep_run_approved,
         )
         return {
             "stage": "review",
@@ -79,6 +89,7 @@ class Pipeline:
         volume: str | None = None,
         chapter: str | None = None,
         online_dict: str = "off",
+        shared: SharedResources | None = None,
     ) -> dict:
         summary = run_build(
             source=source,
@@ -87,6 +98,7 @@ class Pipeline:
             volume=volume,
             chapter=chapter,
             online_dict=online_dict,
+            shared=shared,
         )
         return {
             "stage": "build",
@@ -106,26 +118,21 @@ class Pipeline:
         images: str,
         source: str,
         run_id: str,
-        ocr_mode: str = "sidecar",
-        ocr_language: str = "jpn",
-        tesseract_cmd: str | None = None,
-        preprocess: bool = True,
+        options: ScanOptions | None = None,
+        video: bool = False,
         exclude: list[str] | None = None,
         save_excluded_to_known: bool = False,
         volume: str | None = None,
         chapter: str | None = None,
-        online_dict: str = "off",
         resume: bool = False,
     ) -> dict:
+        options = options or ScanOptions()
         scan_result = self.scan(
             images=images,
             source=source,
             run_id=run_id,
-            ocr_mode=ocr_mode,
-            ocr_language=ocr_language,
-            tesseract_cmd=tesseract_cmd,
-            preprocess=preprocess,
-            online_dict=online_dict,
+            options=options,
+            video=video,
             resume=resume,
         )
         review_result = self.review(
@@ -139,7 +146,7 @@ class Pipeline:
             run_id=run_id,
             volume=volume,
             chapter=chapter,
-            online_dict=online_dict,
+            online_dict=options.online_dict,
         )
         return {
             "scan": scan_result,
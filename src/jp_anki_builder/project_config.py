@@ -14,6 +14,8 @@ import logging
 from dataclasses import dataclass, field, fields
 from pathlib import Path
 
+from jp_anki_builder.ocr import TESSERACT_SEARCH_MODES
+
 logger = logging.getLogger(__name__)
 
 CONFIG_FILENAME = ".jp-anki.json"
@@ -29,6 +31,28 @@ class ProjectDefaults:
     no_preprocess: bool | None = None
     volume: str | None = None
     chapter: str | None = None
+    tesseract_workers: int | None = None
+    tesseract_search: str | None = None
+    tesseract_min_score: float | None = None
+    ocr_batch_size: int | None = None
+    no_ocr_cache: bool | None = None
+    ocr_cache_max_mb: int | None = None
+    dedup_distance: int | None = None
+    onnx_threads: int | None = None
+    no_daemon: bool | None = None
+    autocrop: bool | None = None
+    roi: dict[str, list[float]] | None = None
+    cascade_min_known: float | None = None
+    sidecar_manifest: str | None = None
+    ocr_timeout: float | None = None
+    tesseract_orientation: bool | None = None
+    tesseract_learned_k: int | None = None
+    sequential_diff: bool | None = None
+    workers: int | None = None
+    pipelined: bool | None = None
+    ocr_threads: int | None = None
+    nlp_threads: int | None = None
+    stream_discovery: bool | None = None
 
     def merge(self, other: ProjectDefaults) -> ProjectDefaults:
         """Return a new ProjectDefaults with non-None values from *other* taking precedence."""
@@ -86,6 +110,44 @@ def apply_defaults(defaults: ProjectDefaults, **cli_kwargs) -> dict:
 
 
 VALID_KEYS = {f.name for f in fields(ProjectDefaults)}
+_BOOL_KEYS = {
+    "no_preprocess", "no_ocr_cache", "no_daemon", "autocrop", "tesseract_orientation", "sequential_diff", "pipelined",
+    "stream_discovery",
+}
+_INT_KEYS = {
+    "tesseract_workers", "ocr_batch_size", "ocr_cache_max_mb", "dedup_distance", "onnx_threads", "tesseract_learned_k",
+    "workers", "ocr_threads", "nlp_threads",
+}
+_FLOAT_KEYS = {"tesseract_min_score", "cascade_min_known", "ocr_timeout"}
+# Keys that take one of a fixed set of values, checked like the matching CLI flags.
+_CHOICE_KEYS = {"tesseract_search": TESSERACT_SEARCH_MODES}
+
+
+def parse_roi(value: str) -> dict[str, list[float]]:
+    """Parse ``name=left,top,right,bottom[;name=...]`` into named ROI rectangles.
+
+    A rectangle without a name is called ``roi``. Values in 0..1 are read as
+    fractions of the frame, anything larger as pixels (see ``resolve_roi``).
+    """
+    rois: dict[str, list[float]] = {}
+    for part in filter(None, (p.strip() for p in value.split(";"))):
+        name, _, coords = part.rpartition("=")
+        name = name.strip() or "roi"
+        try:
+            rect = [float(v) for v in coords.split(",")]
+        except ValueError as exc:
+            raise ValueError(f"ROI {part!r} must be numbers like dialogue=0.05,0.7,0.95,0.98") from exc
+        if len(rect) != 4:
+            raise ValueError(f"ROI {part!r} needs four values: left,top,right,bottom")
+        if rect[0] >= rect[2] or rect[1] >= rect[3] or min(rect) < 0:
+            raise ValueError(f"ROI {part!r} is empty or negative (right/bottom must exceed left/top)")
+        if name in rois:
+            raise ValueError(f"ROI name {name!r} is used twice")
+        pixels = max(rect) > 1 and all(v.is_integer() for v in rect)
+        rois[name] = [int(v) for v in rect] if pixels else rect
+    if not rois:
+        raise ValueError("ROI value is empty; expected name=left,top,right,bottom")
+    return rois
 
 
 def _config_path(data_dir: str, source: str | None) -> Path:
@@ -114,9 +176,25 @@ def set_config(key: str, value: str, data_dir: str = "data", source: str | None
     path = _config_path(data_dir, source)
     current = get_config(data_dir, source)
 
-    # Coerce booleans
-    if key == "no_preprocess":
+    # Coerce booleans and numbers
+    if key in _BOOL_KEYS:
         current[key] = value.lower() in ("true", "1", "yes")
+    elif key in _INT_KEYS:
+        try:
+            current[key] = int(value)
+        except ValueError as exc:
+            raise ValueError(f"config key {key!r} expects an integer, got {value!r}") from exc
+    elif key in _FLOAT_KEYS:
+        try:
+            current[key] = float(value)
+        except ValueError as exc:
+            raise ValueError(f"config key {key!r} expects a number, got {value!r}") from exc
+    elif key in _CHOICE_KEYS:
+        if value not in _CHOICE_KEYS[key]:
+            raise ValueError(f"config key {key!r} expects one of {', '.join(_CHOICE_KEYS[key])}, got {value!r}")
+        current[key] = value
+    elif key == "roi":
+        current[key] = parse_roi(value)
     else:
         current[key] = value
 
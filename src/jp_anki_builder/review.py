@@ -55,6 +55,13 @@ def _load_seen_words(path) -> set[str]:
     return set(payload.get("seen_words", []))
 
 
+def _load_approved_words(path) -> set[str]:
+    if not path.exists():
+        return set()
+    payload = json.loads(path.read_text(encoding="utf-8-sig"))
+    return set(payload.get("approved_candidates", []))
+
+
 def _save_seen_words(path, words: set[str]) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
     payload = {"seen_words": sorted(words)}
@@ -77,9 +84,12 @@ def run_review(
     exclude: list[str] | None = None,
     save_excluded_to_known: bool = False,
     review_plan: ReviewPlan | None = None,
+    keep_run_approved: bool = False,
 ) -> ReviewSummary:
     paths = RunPaths(base_dir=base_dir, source_id=source, run_id=run_id)
-    plan = review_plan or prepare_review(source=source, run_id=run_id, base_dir=base_dir)
+    plan = review_plan or prepare_review(
+        source=source, run_id=run_id, base_dir=base_dir, keep_run_approved=keep_run_approved
+    )
     candidates = plan.initial_candidates
     deduped = plan.filtered_candidates
     seen_words = _load_seen_words(paths.source_seen_words)
@@ -122,7 +132,7 @@ def run_review(
     )
 
 
-def prepare_review(source: str, run_id: str, base_dir: str = "data") -> ReviewPlan:
+def prepare_review(source: str, run_id: str, base_dir: str = "data", keep_run_approved: bool = False) -> ReviewPlan:
     paths = RunPaths(base_dir=base_dir, source_id=source, run_id=run_id)
     if not paths.scan_artifact.exists():
         raise ValueError(f"scan artifact not found: {paths.scan_artifact}")
@@ -131,6 +141,10 @@ def prepare_review(source: str, run_id: str, base_dir: str = "data") -> ReviewPl
     candidates = scan_payload.get("candidates", [])
     known_words = _load_words_file(paths.known_words)
     seen_words = _load_seen_words(paths.source_seen_words)
+    if keep_run_approved:
+        # watch re-reviews a run as screenshots arrive: words it approved in
+        # an earlier pass stay approved instead of counting as already seen.
+        seen_words -= _load_approved_words(paths.review_artifact)
     local_seen: set[str] = set()
     excluded_known: list[str] = []
     excluded_particles: list[str] = []
@@ -1,20 +1,53 @@
 from __future__ import annotations
 
+import functools
 import json
 import logging
-from dataclasses import asdict, dataclass
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
 
 from jp_anki_builder.config import RunPaths
+from jp_anki_builder.daemon import connect_daemon
 from jp_anki_builder.dictionary import WordExistsCache, build_offline_dictionary, build_online_dictionary
-from jp_anki_builder.normalization import get_default_normalizer
-from jp_anki_builder.ocr import build_ocr_provider
+from jp_anki_builder.discovery import DiscoveryManifest, discovery_manifest_path, in_background, iter_image_dirs
+from jp_anki_builder.imaging import (
+    AUTOCROP_MIN_CONFIDENCE,
+    NearDuplicateIndex,
+    changed_box,
+    detect_text_region,
+    dhash,
+    image_pixels,
+    image_size,
+    luma_thumbnail,
+    resolve_roi,
+)
+from jp_anki_builder.normalization import SudachiNormalizer, get_default_normalizer
+from jp_anki_builder.ocr import OcrTimeout, OcrWorkerCrash, build_ocr_provider
+from jp_anki_builder.ocr_cache import DEFAULT_MAX_MB, OcrResultCache, cache_key, content_hash, ocr_cache_path
+from jp_anki_builder.scan_journal import ScanJournal, read_journal
+from jp_anki_builder.scan_pool import ScanItem, WorkerConfig, scan_in_pool, start_scan_pool
+from jp_anki_builder.shared import SharedResources
+from jp_anki_builder.stages import Stage, run_stages
+from jp_anki_builder.sweep_stats import SweepStats
 from jp_anki_builder.tokenize import extract_token_sequence, is_candidate_token
+from jp_anki_builder.video import SampledFrame, decode_video, sample_frames
+from jp_anki_builder.warmup import Warmup
+from jp_anki_builder.watchdog import supervised_ocr_provider
 
 logger = logging.getLogger(__name__)
 
 
 IMAGE_EXTENSIONS = {".png", ".jpg", ".jpeg", ".webp", ".bmp"}
+# Above this share of the frame, a changed box is not worth cropping to.
+_DIFF_MAX_PARTIAL_SHARE = 0.6
+# Modes that run the manga-ocr model get one OCR stage thread: MangaOcrProvider
+# keeps a single model per process, which is not safe to call from several
+# threads, and the ONNX export already spreads each call over --onnx-threads,
+# so more threads would only load more copies of the model.
+_SINGLE_OCR_THREAD_MODES = frozenset({"manga-ocr", "onnx-manga-ocr", "cascade"})
 
 
 @dataclass
@@ -25,6 +58,7 @@ class ScanSummary:
     candidates: list[str]
     artifact_path: Path
     resumed: bool = False
+    stats: dict[str, float] = field(default_factory=dict)
 
 
 def _collect_images(images_path: Path) -> list[Path]:
@@ -39,12 +73,16 @@ def _collect_images(images_path: Path) -> list[Path]:
     return []
 
 
-def _load_partial_scan(scan_path: Path) -> tuple[list[dict], set[str]]:
-    """Load previously completed records from a partial scan artifact."""
-    if not scan_path.exists():
+def _load_partial_scan(paths: RunPaths) -> tuple[list[dict], set[str]]:
+    """Load previously completed records: the journal of an interrupted scan,
+    else the artifact of a finished one."""
+    if paths.scan_journal.exists():
+        records = read_journal(paths.scan_journal)
+        return records, {r["image"] for r in records}
+    if not paths.scan_artifact.exists():
         return [], set()
     try:
-        payload = json.loads(scan_path.read_text(encoding="utf-8-sig"))
+        payload = json.loads(paths.scan_artifact.read_text(encoding="utf-8-sig"))
         records = payload.get("records", [])
         done = {r["image"] for r in records}
         return records, done
@@ -52,126 +90,187 @@ def _load_partial_scan(scan_path: Path) -> tuple[list[dict], set[str]]:
         return [], set()
 
 
-def _write_scan_artifact(paths: RunPaths, records: list[dict], source: str, run_id: str,
-                         ocr_mode: str, ocr_language: str, normalization_method: str,
-                         online_dict: str, image_count: int) -> None:
-    all_candidates: list[str] = []
-    for r in records:
-        all_candidates.extend(r["candidates"])
-    dedup_candidates = list(dict.fromkeys(all_candidates))
-
+def _write_scan_artifact(paths: RunPaths, records: list[dict], candidates: list[str], source: str, run_id: str,
+                         options: ScanOptions, normalization_method: str, image_count: int) -> None:
     payload = {
         "source": source,
         "run_id": run_id,
-        "ocr_mode": ocr_mode,
-        "ocr_language": ocr_language,
+        "ocr_mode": options.ocr_mode,
+        "ocr_language": options.ocr_language,
         "normalization_method": normalization_method,
-        "online_dict": online_dict,
+        "online_dict": options.online_dict,
         "image_count": image_count,
         "records": records,
-        "candidates": dedup_candidates,
+        "candidates": candidates,
     }
-    paths.scan_artifact.write_text(
+    # Written once per scan; replace rather than truncate so a crash mid-write
+    # cannot leave a half-written artifact behind.
+    partial = paths.scan_artifact.with_suffix(".json.tmp")
+    partial.write_text(
         json.dumps(payload, ensure_ascii=False, indent=2),
         encoding="utf-8",
     )
+    partial.replace(paths.scan_artifact)
+
+
+@dataclass
+class ScanOptions:
+    """How a scan reads its images: OCR backend, planning and concurrency.
+
+    Resolved once from the project/source config and the command-line flags
+    (``cli._resolve_defaults``) and handed through ``Pipeline`` to
+    ``run_scan``; ``batch`` resolves one per run.
+    """
+
+    ocr_mode: str = "sidecar"
+    ocr_language: str = "jpn"
+    tesseract_cmd: str | None = None
+    tesseract_workers: int = 1
+    tesseract_search: str = "full"
+    tesseract_min_score: float = 40.0
+    preprocess: bool = True
+    ocr_batch_size: int = 8
+    ocr_cache: bool = True
+    ocr_cache_max_mb: int = DEFAULT_MAX_MB
+    dedup_distance: int | None = None
+    onnx_threads: int = 0
+    use_daemon: bool = True
+    autocrop: bool = False
+    roi: dict[str, list[float]] | None = None
+    cascade_min_known: float = 0.5
+    sidecar_manifest: str | None = None
+    ocr_timeout: float | None = None
+    tesseract_orientation: bool = False
+    tesseract_learned_k: int = 2
+    sequential_diff: bool = False
+    workers: int = 1
+    pipelined: bool = False
+    ocr_threads: int = 1
+    nlp_threads: int = 1
+    stream_discovery: bool = False
+    online_dict: str = "off"
 
 
 def run_scan(
     images: str,
     source: str,
     run_id: str,
+    options: ScanOptions | None = None,
     base_dir: str = "data",
-    ocr_mode: str = "sidecar",
-    ocr_language: str = "jpn",
-    tesseract_cmd: str | None = None,
-    preprocess: bool = True,
-    online_dict: str = "off",
+    video: bool = False,
     resume: bool = False,
+    batches: Iterable[list[Path]] | None = None,
+    on_batch: Callable[[list[dict]], None] | None = None,
+    shared: SharedResources | None = None,
+    on_progress: Callable[[str], None] | None = None,
+    image_files: list[Path] | None = None,
 ) -> ScanSummary:
-    images_path = Path(images)
-    files = _collect_images(images_path)
-    if not files:
-        raise ValueError(f"No image files found at: {images}")
+    """Scan *images* (a video file with *video*) into the run's ``scan.json``.
 
+    *batches* replaces discovery of *images* with the given image batches
+    (``watch`` passes the folder's images, then each batch of new ones).
+    ``scan.json`` is then rewritten after every batch, and *on_batch* is
+    called with the records each batch added, also for empty batches.
+    With *shared*, OCR providers, the worker pool, dictionaries and the word
+    cache come from it and stay open for the next run. *on_progress*
+    receives notices for the user while the scan runs, such as the image
+    count as streaming discovery finds more images. *image_files* scans
+    exactly those images, in that order, instead of discovering *images*
+    (``batch`` passes each run folder's own images).
+    """
+    options = options or ScanOptions()
     paths = RunPaths(base_dir=base_dir, source_id=source, run_id=run_id)
-    paths.run_dir.mkdir(parents=True, exist_ok=True)
-
-    # Resume support: load previously completed records
-    records: list[dict] = []
-    done_images: set[str] = set()
-    resumed = False
-    if resume:
-        records, done_images = _load_partial_scan(paths.scan_artifact)
-        if done_images:
-            resumed = True
-            logger.info("resuming scan: %d image(s) already processed", len(done_images))
-
-    provider = build_ocr_provider(
-        ocr_mode,
-        language=ocr_language,
-        tesseract_cmd=tesseract_cmd,
-        preprocess=preprocess,
-    )
-    offline = build_offline_dictionary(base_dir)
-    online = build_online_dictionary(online_dict)
-    cache = WordExistsCache(offline, online)
-    if resume:
-        cache.load(paths.word_cache)
-    word_exists = cache.word_exists
-    normalizer = get_default_normalizer()
-    normalization_method = getattr(normalizer, "method_name", "sudachi_nlp")
-
-    pending = [f for f in files if str(f) not in done_images]
-    logger.info("scanning %d image(s) (%d pending) with ocr=%s normalizer=%s",
-                len(files), len(pending), ocr_mode, normalization_method)
+    # Build the heavy components first and start loading their models in the
+    # background, so discovery and resume loading below overlap with it.
+    components = _ScanComponents(options, paths, base_dir, shared, on_progress)
+    stats = components.stats
+    journal: ScanJournal | None = None
+    waves: Iterable[list[Path]] = ()
+    try:
+        waves, video_info, discovery = _discover_waves(
+            images, options, paths, base_dir, video, batches, stats, image_files
+        )
 
-    for image_path in pending:
-        if hasattr(provider, "extract_text_candidates"):
-            texts = provider.extract_text_candidates(image_path, top_n=8)
-        else:
-            texts = [provider.extract_text(image_path)]
-
-        text = texts[0] if texts else ""
-        candidates: list[str] = []
-        normalized_records: list[dict] = []
-        primary_surface_tokens: list[str] = []
-        for candidate_text in texts:
-            sequence = extract_token_sequence(candidate_text)
-            if not primary_surface_tokens:
-                primary_surface_tokens = sequence
-            normalized = normalizer.normalize_text(candidate_text, word_exists=word_exists)
-            base = [entry.lemma for entry in normalized]
-            candidates.extend(base)
-            normalized_records.extend(asdict(entry) for entry in normalized)
-            surface_candidates = {token for token in sequence if is_candidate_token(token)}
-            candidates.extend(_merge_compound_candidates(sequence, surface_candidates, word_exists))
-        candidates = list(dict.fromkeys(candidates))
-        logger.debug("image %s: text=%r candidates=%s", image_path.name, text[:80], candidates)
-        records.append(
-            {
-                "image": str(image_path),
-                "text": text,
-                "alternate_texts": texts[1:6],
-                "surface_tokens": primary_surface_tokens,
-                "normalized_candidates": normalized_records,
-                "candidates": candidates,
-            }
+        paths.run_dir.mkdir(parents=True, exist_ok=True)
+
+        # Resume support: load previously completed records
+        records: list[dict] = []
+        done_images: set[str] = set()
+        if resume:
+            records, done_images = _load_partial_scan(paths)
+            if done_images:
+                logger.info("resuming scan: %d image(s) already processed", len(done_images))
+        components.prepare(resume)
+        if options.roi and options.autocrop:
+            components.notice("Configured roi rectangles replace --autocrop for this scan")
+        duplicate_index = (
+            _duplicate_index(records, options.dedup_distance) if options.dedup_distance is not None else None
         )
 
-        # Write incrementally after each image so partial progress is saved
-        _write_scan_artifact(paths, records, source, run_id, ocr_mode, ocr_language,
-                             normalization_method, online_dict, len(files))
+        records_by_image = {r["image"]: r for r in records}
+        journal = ScanJournal(paths.scan_journal, records)
+        # Insertion-ordered set of every record's candidates, kept up to date per image.
+        candidates = dict.fromkeys(c for r in records for c in r["candidates"])
+        files: list[Path] = []
+        for wave in waves:
+            if not wave:
+                if on_batch is not None:
+                    on_batch([])
+                continue
+            previous = files[-1:]
+            files.extend(wave)
+            if discovery is not None:
+                components.notice(f"Discovered {len(files)} image(s) so far")
+            plan = _plan_wave(wave, previous, done_images, options, duplicate_index, stats)
+            logger.info("scanning %d image(s) (%d pending) with ocr=%s normalizer=%s",
+                        len(files), len(plan.pending), options.ocr_mode, components.normalization_method)
+            if plan.pending and "warmup_wait_s" not in stats:
+                stats["warmup_wait_s"] = components.warmup.wait()
+            ocr_results = components.ocr(plan)
+            for image_path in plan.pending:
+                record = _assemble_record(image_path, plan, ocr_results, components, records_by_image)
+                if image_path in video_info:
+                    record.update(video_info[image_path])
+                records.append(record)
+                records_by_image[record["image"]] = record
+                candidates.update(dict.fromkeys(record["candidates"]))
+                if "time_to_first_result_s" not in stats:
+                    stats["time_to_first_result_s"] = time.perf_counter() - components.warmup.started
+
+                # Journal each image so partial progress survives an interruption.
+                journal.append(record)
 
-    # Final write (also covers the case where all images were already done)
-    _write_scan_artifact(paths, records, source, run_id, ocr_mode, ocr_language,
-                         normalization_method, online_dict, len(files))
-    cache.save(paths.word_cache)
+            if batches is not None:
+                # Let review/build see the new records without ending the scan.
+                _write_scan_artifact(paths, records, list(candidates), source, run_id, options,
+                                     components.normalization_method, len(files))
+                if on_batch is not None:
+                    on_batch(records[len(records) - len(plan.pending):])
 
-    all_candidates: list[str] = []
-    for r in records:
-        all_candidates.extend(r["candidates"])
-    dedup_candidates = list(dict.fromkeys(all_candidates))
+        if discovery is not None:
+            discovery.save()
+            stats["discovery_listed"] = discovery.listed
+            stats["discovery_reused"] = discovery.reused
+        if not files and batches is None:
+            journal.close(remove=True)
+            raise ValueError(f"No image files found at: {images}")
+
+        # Materialize the artifact once (also covers the case where all images were already done)
+        dedup_candidates = list(candidates)
+        _write_scan_artifact(paths, records, dedup_candidates, source, run_id, options,
+                             components.normalization_method, len(files))
+        journal.close(remove=True)
+        components.save()
+    finally:
+        # Also on failure: the pool, daemon client, OCR cache and watchdog
+        # worker are released, a background discovery walk is stopped, and a
+        # journal with progress is kept for --resume.
+        close_waves = getattr(waves, "close", None)
+        if close_waves is not None:
+            close_waves()
+        if journal is not None:
+            journal.close()
+        components.close()
 
     return ScanSummary(
         run_id=run_id,
@@ -179,10 +278,857 @@ def run_scan(
         candidate_count=len(dedup_candidates),
         candidates=dedup_candidates,
         artifact_path=paths.scan_artifact,
-        resumed=resumed,
+        resumed=bool(done_images),
+        stats=stats,
     )
 
 
+class _ScanComponents:
+    """The OCR backend, normalizer, dictionaries and caches of one scan.
+
+    Built before discovery, so model loading overlaps it. ``prepare`` adds
+    the word and result caches and the OCR workers once resume state is
+    known, ``ocr`` runs a wave's OCR, and ``close`` releases what this scan
+    owns; components from *shared* stay open for the next run.
+    """
+
+    def __init__(self, options: ScanOptions, paths: RunPaths, base_dir: str, shared: SharedResources | None,
+                 on_progress: Callable[[str], None] | None = None):
+        self.options = options
+        self.on_progress = on_progress
+        self.paths = paths
+        self.base_dir = base_dir
+        self.shared = shared
+        self.stats: dict[str, float] = {}
+        self.provider_kwargs = {
+            "language": options.ocr_language,
+            "tesseract_cmd": options.tesseract_cmd,
+            "preprocess": options.preprocess,
+            "tesseract_workers": options.tesseract_workers,
+            "tesseract_search": options.tesseract_search,
+            "tesseract_min_score": options.tesseract_min_score,
+            "tesseract_orientation": options.tesseract_orientation,
+            "onnx_threads": options.onnx_threads,
+            "base_dir": base_dir,
+        }
+        ocr_mode = options.ocr_mode
+        # Established sources run only the sweep jobs that usually win for them.
+        self.sweep_stats = None
+        if ocr_mode in ("tesseract", "tesseract-api") and options.tesseract_learned_k > 0:
+            self.sweep_stats = SweepStats.load(paths.ocr_sweep_stats)
+            learned = self.sweep_stats.top(options.tesseract_learned_k)
+            if learned:
+                self.provider_kwargs["tesseract_combos"] = [list(combo) for combo in learned]
+                self.stats["sweep_learned_combos"] = len(learned)
+        self.mode_kwargs = {"cascade_min_known": options.cascade_min_known} if ocr_mode == "cascade" else {}
+        if ocr_mode == "sidecar":
+            self.mode_kwargs = {"sidecar_manifest": options.sidecar_manifest}
+        # With a worker pool every worker loads its own models, and a single
+        # daemon would serialize them again.
+        self.parallel = options.workers > 1
+        self.daemon = None
+        if options.use_daemon and not self.parallel:
+            # A running `jp-anki-build serve` daemon already has the models loaded.
+            self.daemon = connect_daemon(base_dir)
+            if self.daemon is not None:
+                self.stats["daemon"] = 1
+        if self.parallel:
+            self.stats["workers"] = options.workers
+            # Only names the cache version here; the workers build their own.
+            self.provider = self._reuse(
+                "version-provider", lambda: build_ocr_provider(ocr_mode, **self.mode_kwargs, **self.provider_kwargs)
+            )
+        else:
+            self.provider = self._reuse("provider", self._build_provider)
+        # Shared OCR workers may have restarted in earlier runs.
+        self.restarts_before = {0: getattr(self.provider, "restarts", 0)}
+        self.pipelined = options.pipelined
+        self.ocr_threads = options.ocr_threads
+        if self.pipelined and self.parallel:
+            self.notice("--workers runs OCR and normalization in worker processes; ignoring --pipelined")
+            self.pipelined = False
+        if self.pipelined and self.ocr_threads > 1 and ocr_mode in _SINGLE_OCR_THREAD_MODES:
+            self.notice(f"{ocr_mode} runs one model per process; using 1 OCR thread instead of {self.ocr_threads}")
+            self.ocr_threads = 1
+        if shared is not None:
+            self.offline, self.online = shared.dictionaries(base_dir, options.online_dict)
+        else:
+            self.offline = build_offline_dictionary(base_dir)
+            self.online = build_online_dictionary(options.online_dict)
+        self.normalizer = get_default_normalizer()
+        if self.daemon is not None and isinstance(self.normalizer, SudachiNormalizer):
+            self.normalizer = SudachiNormalizer(tokenizer=self.daemon.tokenizer())
+        self.normalization_method = getattr(self.normalizer, "method_name", "sudachi_nlp")
+
+        self.warmup = Warmup()
+        if not self.parallel:
+            self.warmup.start("ocr", self.provider)
+            self.warmup.start("normalizer", self.normalizer)
+            self.warmup.start("dictionary", self.offline)
+
+        self.cache = None
+        self.word_exists = None
+        self.result_cache: OcrResultCache | None = None
+        self.cache_key_fn = None
+        self.pool = None
+        self._stage_providers: dict[int, object] = {0: self.provider}
+        self._stage_normalizers: dict[int, object] = {0: self.normalizer}
+
+    def notice(self, message: str) -> None:
+        """Log *message* and pass it on to the user through ``on_progress``."""
+        logger.info("%s", message)
+        if self.on_progress is not None:
+            self.on_progress(message)
+
+    def _reuse(self, kind: str, build):
+        # Daemon-backed providers hold this run's connection, so they are not shared.
+        if self.shared is None or self.daemon is not None:
+            return build()
+        options = self.options
+        key = (kind, options.ocr_mode, repr(self.provider_kwargs), repr(self.mode_kwargs), options.ocr_timeout)
+        return self.shared.get(key, build)
+
+    def _build_provider(self):
+        return _build_scan_provider(self.options.ocr_mode, self.provider_kwargs, self.mode_kwargs,
+                                    self.options.ocr_timeout, self.daemon)
+
+    def fresh_normalizer(self):
+        # Sudachi tokenizers are not thread-safe, so pipelined threads other than
+        # the first each get their own; the daemon client serializes requests itself.
+        if isinstance(self.normalizer, SudachiNormalizer) and self.daemon is None:
+            return SudachiNormalizer()
+        return self.normalizer
+
+    def prepare(self, resume: bool) -> None:
+        """Open the word and OCR result caches and start the worker pool."""
+        options, paths, shared = self.options, self.paths, self.shared
+        if shared is not None:
+            # Lookups go through the shared cache; this run's file keeps only its own words.
+            self.cache = shared.word_cache(self.base_dir, options.online_dict).view()
+        else:
+            self.cache = WordExistsCache(self.offline, self.online)
+        if resume:
+            self.cache.load(paths.word_cache)
+        self.word_exists = self.cache.word_exists
+        if options.ocr_mode == "cascade" and not options.ocr_timeout and not self.parallel:
+            self.provider.known_ratio = functools.partial(
+                _known_word_ratio, normalizer=self.fresh_normalizer() if self.pipelined else self.normalizer,
+                word_exists=self.word_exists,
+            )
+
+        # Sidecar text is cheaper to read than the image is to hash, so only real
+        # OCR backends (which report a cache_version) go through the result cache.
+        if options.ocr_cache and hasattr(self.provider, "cache_version"):
+            self.result_cache = OcrResultCache(ocr_cache_path(self.base_dir),
+                                               max_bytes=options.ocr_cache_max_mb * 1024 * 1024)
+            provider_version = self.provider.cache_version()
+
+            @functools.lru_cache(maxsize=64)
+            def digest(image_path: Path) -> str:
+                return content_hash(image_path)
+
+            def cache_key_fn(image_path: Path, region: tuple[int, int, int, int] | None = None) -> str:
+                return cache_key(digest(image_path), options.ocr_mode, options.ocr_language, options.preprocess,
+                                 provider_version, region)
+
+            self.cache_key_fn = cache_key_fn
+
+        if self.parallel:
+            worker_kwargs = {**self.provider_kwargs, **self.mode_kwargs}
+            if shared is not None:
+                # Workers outlive the run, so their lookups carry over instead of this run's cache file.
+                config = WorkerConfig(options.ocr_mode, worker_kwargs, options.ocr_timeout, self.base_dir,
+                                      options.online_dict)
+                self.pool = shared.get(("pool", options.workers, repr(config)),
+                                       lambda: start_scan_pool(options.workers, config))
+            else:
+                config = WorkerConfig(options.ocr_mode, worker_kwargs, options.ocr_timeout, self.base_dir,
+                                      options.online_dict, paths.word_cache if resume else None)
+                self.pool = start_scan_pool(options.workers, config)
+
+    def stage_provider(self, index: int):
+        if index not in self._stage_providers:
+            extra = self._reuse(f"stage-provider-{index}", self._build_provider)
+            self.restarts_before[index] = getattr(extra, "restarts", 0)
+            if self.options.ocr_mode == "cascade" and not self.options.ocr_timeout:
+                extra.known_ratio = functools.partial(
+                    _known_word_ratio, normalizer=self.fresh_normalizer(), word_exists=self.word_exists
+                )
+            self._stage_providers[index] = extra
+        return self._stage_providers[index]
+
+    def stage_normalizer(self, index: int):
+        if index not in self._stage_normalizers:
+            if self.shared is not None and self.daemon is None:
+                self._stage_normalizers[index] = self.shared.get(("stage-normalizer", index), self.fresh_normalizer)
+            else:
+                self._stage_normalizers[index] = self.fresh_normalizer()
+        return self._stage_normalizers[index]
+
+    def ocr(self, plan: _WavePlan) -> Iterator:
+        """OCR the images *plan* sends to OCR, in order.
+
+        With a worker pool or pipelined stages, yields (results, record) per
+        image, already normalized; otherwise one (image, texts, ocr_info)
+        result per OCR job.
+        """
+        options = self.options
+        if self.parallel or self.pipelined:
+            items = [ScanItem(path, regions, plan.roi_boxes.get(path)) for path, regions in plan.job_regions.items()]
+        if self.parallel:
+            return scan_in_pool(items, self.pool, options.workers, options.ocr_batch_size, self.result_cache,
+                                self.cache_key_fn, self.cache)
+        if self.pipelined:
+            return _scan_pipelined(
+                items, self.stage_provider, self.stage_normalizer, self.word_exists, options.ocr_batch_size,
+                self.result_cache, self.cache_key_fn, self.ocr_threads, options.nlp_threads, self.stats,
+            )
+        jobs = [(image_path, region) for image_path, regions in plan.job_regions.items() for region in regions]
+        regions = [region for _, region in jobs] if plan.roi_boxes or plan.crops or plan.diff_boxes else None
+        return _ocr_images(self.provider, [path for path, _ in jobs], options.ocr_batch_size,
+                           self.result_cache, self.cache_key_fn, regions)
+
+    def save(self) -> None:
+        """Persist the run's word lookups and the source's sweep statistics."""
+        self.cache.save(self.paths.word_cache)
+        if self.sweep_stats is not None:
+            self.sweep_stats.save()
+
+    def close(self) -> None:
+        """Release the pool, caches, daemon connection and OCR backends this scan owns."""
+        if self.pool is not None and self.shared is None:
+            self.pool.shutdown()
+        if self.result_cache is not None:
+            self.result_cache.close()
+        if self.daemon is not None:
+            self.daemon.close()
+        keep_open = self.shared is not None and self.daemon is None
+        if self.options.ocr_timeout and not self.parallel:
+            self.stats["ocr_worker_restarts"] = sum(
+                provider.restarts - self.restarts_before[index]
+                for index, provider in self._stage_providers.items()
+            )
+        for provider in self._stage_providers.values():
+            if hasattr(provider, "close") and not keep_open:
+                provider.close()
+
+
+def _discover_waves(images: str, options: ScanOptions, paths: RunPaths, base_dir: str, video: bool,
+                    batches: Iterable[list[Path]] | None, stats: dict[str, float],
+                    image_files: list[Path] | None = None,
+                    ) -> tuple[Iterable[list[Path]], dict[Path, dict], DiscoveryManifest | None]:
+    """The batches of images to scan, in order.
+
+    Returns (waves, video_info, discovery): the image batches, the record
+    fields of each sampled video frame, and the discovery manifest to save
+    when the folder was walked with --stream-discovery.
+    """
+    images_path = Path(images)
+    # Video input: OCR only the frames where the dialogue changed.
+    video_info: dict[Path, dict] = {}
+    if video:
+        if not images_path.is_file():
+            raise ValueError(f"Video file not found: {images}")
+        regions = list(options.roi.values()) if options.roi else None
+        frames = sample_frames(decode_video(images_path), paths.run_dir / "frames", regions, stats)
+        # Decode on a background thread and OCR each batch of sampled frames
+        # while the rest of the video is still being decoded.
+        waves = _video_waves(frames, images_path, video_info, max(1, options.ocr_batch_size))
+        return in_background(waves), video_info, None
+    if batches is not None:
+        return batches, video_info, None
+    if image_files is not None:
+        return [list(image_files)], video_info, None
+    if options.stream_discovery and images_path.is_dir():
+        # Scan each directory's images while the walk goes on; the planning
+        # runs once per batch of newly discovered images.
+        discovery = DiscoveryManifest.load(discovery_manifest_path(base_dir, images_path))
+        return in_background(iter_image_dirs(images_path, IMAGE_EXTENSIONS, discovery)), video_info, discovery
+    files = _collect_images(images_path)
+    if not files:
+        raise ValueError(f"No image files found at: {images}")
+    return [files], video_info, None
+
+
+def _video_waves(frames: Iterable[SampledFrame], video_path: Path, video_info: dict[Path, dict],
+                 batch_size: int) -> Iterator[list[Path]]:
+    """The paths of *frames* in batches of *batch_size*, recording each
+    frame's record fields in *video_info* before its batch is yielded."""
+    wave: list[Path] = []
+    for frame in frames:
+        video_info[frame.path] = {"video": str(video_path), "timestamp": frame.timestamp, "frame": frame.index}
+        wave.append(frame.path)
+        if len(wave) >= batch_size:
+            yield wave
+            wave = []
+    if wave:
+        yield wave
+    if not video_info:
+        raise ValueError(f"No frames with on-screen text changes found in: {video_path}")
+
+
+@dataclass
+class _WavePlan:
+    """What a scan does with each pending image of one wave."""
+
+    pending: list[Path]
+    # Near-duplicate and unchanged images -> the image whose record they reuse.
+    duplicates: dict[Path, str] = field(default_factory=dict)
+    hashes: dict[Path, str] = field(default_factory=dict)
+    unchanged: dict[Path, str] = field(default_factory=dict)
+    diff_boxes: dict[Path, tuple[int, int, int, int]] = field(default_factory=dict)
+    roi_boxes: dict[Path, list[tuple[str, tuple[int, int, int, int]]]] = field(default_factory=dict)
+    crops: dict[Path, dict] = field(default_factory=dict)
+    # The images to OCR, in order, each with the region of every OCR job.
+    job_regions: dict[Path, list[tuple[int, int, int, int] | None]] = field(default_factory=dict)
+
+
+def _plan_wave(wave: list[Path], previous: list[Path], done_images: set[str], options: ScanOptions,
+               duplicate_index: NearDuplicateIndex | None, stats: dict[str, float]) -> _WavePlan:
+    """Decide which images of *wave* need OCR, and of which regions.
+
+    *previous* is the image scanned just before the wave, if any, for
+    sequential diff.
+    """
+    plan = _WavePlan(pending=[f for f in wave if str(f) not in done_images])
+    if duplicate_index is not None:
+        plan.duplicates, plan.hashes = _find_near_duplicates(plan.pending, duplicate_index)
+        logger.info("%d near-duplicate image(s) will reuse earlier OCR", len(plan.duplicates))
+
+    # Reuse or narrow OCR for images that barely differ from the one before them.
+    if options.sequential_diff:
+        plan.unchanged, plan.diff_boxes, changed_whole = _plan_sequential_diff(
+            previous + wave, [f for f in plan.pending if f not in plan.duplicates]
+        )
+        stats["diff_unchanged"] = stats.get("diff_unchanged", 0) + len(plan.unchanged)
+        stats["diff_full"] = stats.get("diff_full", 0) + changed_whole
+
+    to_ocr = [f for f in plan.pending if f not in plan.duplicates and f not in plan.unchanged]
+    if options.roi:
+        plan.roi_boxes = _plan_roi(to_ocr, options.roi)
+        # Configured regions are OCR'd whole even when only part of the frame changed.
+        for image_path in plan.roi_boxes:
+            if plan.diff_boxes.pop(image_path, None) is not None:
+                stats["diff_full"] += 1
+        stats["roi_images"] = stats.get("roi_images", 0) + len(plan.roi_boxes)
+        stats["roi_full_frame"] = stats.get("roi_full_frame", 0) + len(to_ocr) - len(plan.roi_boxes)
+    elif options.autocrop:
+        plan.crops = _plan_autocrop(to_ocr)
+        cropped = sum(1 for crop in plan.crops.values() if crop["crop_box"] is not None)
+        stats["autocrop_cropped"] = stats.get("autocrop_cropped", 0) + cropped
+        stats["autocrop_full_frame"] = stats.get("autocrop_full_frame", 0) + len(plan.crops) - cropped
+    if options.sequential_diff:
+        stats["diff_partial"] = stats.get("diff_partial", 0) + len(plan.diff_boxes)
+    # One OCR job per configured region, else one per image (autocropped or whole).
+    for image_path in to_ocr:
+        if image_path in plan.roi_boxes:
+            plan.job_regions[image_path] = [box for _, box in plan.roi_boxes[image_path]]
+        else:
+            crop = _crop_region(plan.crops.get(image_path))
+            plan.job_regions[image_path] = [_diff_region(plan.diff_boxes.get(image_path), crop)]
+    return plan
+
+
+def _assemble_record(image_path: Path, plan: _WavePlan, ocr_results: Iterator, components: _ScanComponents,
+                     records_by_image: dict[str, dict]) -> dict:
+    """The scan record of one pending image, taking its OCR results from *ocr_results*."""
+    stats = components.stats
+    original = plan.duplicates.get(image_path)
+    if original is not None:
+        record = _duplicate_record(records_by_image[original], image_path)
+        stats["ocr_avoided"] = stats.get("ocr_avoided", 0) + 1
+    elif image_path in plan.unchanged:
+        record = _duplicate_record(records_by_image[plan.unchanged[image_path]], image_path)
+        record["unchanged_from"] = record.pop("duplicate_of")
+    else:
+        if components.parallel or components.pipelined:
+            # The worker or stage already normalized the image into its record.
+            results, record = next(ocr_results)
+        elif image_path in plan.roi_boxes:
+            results = [next(ocr_results) for _ in plan.roi_boxes[image_path]]
+            record = _build_roi_record(image_path, plan.roi_boxes[image_path], results, components.normalizer,
+                                       components.word_exists)
+        else:
+            results = [next(ocr_results)]
+            record = _build_record(image_path, results[0][1], components.normalizer, components.word_exists)
+        job_infos = [info for _, _, info in results]
+        if image_path in plan.roi_boxes:
+            ocr_info = _merge_ocr_info(job_infos)
+        else:
+            ocr_info = job_infos[0]
+            if "orientation" in ocr_info:
+                record["orientation"] = ocr_info["orientation"]
+        _tally_ocr_info(stats, job_infos, ocr_info, components.sweep_stats)
+        if ocr_info.get("timeout"):
+            record["ocr_timeout"] = True
+        if ocr_info.get("crashed"):
+            record["ocr_crashed"] = True
+        if image_path in plan.crops:
+            record.update(plan.crops[image_path])
+        if image_path in plan.diff_boxes:
+            record["diff_box"] = list(plan.diff_boxes[image_path])
+        if _record_ocr_info(ocr_info):
+            record["ocr_info"] = _record_ocr_info(ocr_info)
+    if image_path in plan.hashes:
+        record["phash"] = plan.hashes[image_path]
+    return record
+
+
+def _tally_ocr_info(stats: dict[str, float], job_infos: list[dict], ocr_info: dict,
+                    sweep_stats: SweepStats | None) -> None:
+    """Add one OCR'd image to the scan statistics; *ocr_info* merges its *job_infos*."""
+    for info in job_infos:
+        if sweep_stats is not None:
+            sweep_stats.record(info)
+        if "sweep" in info:
+            counter = f"sweep_{info['sweep']}_images"
+            stats[counter] = stats.get(counter, 0) + 1
+            stats["sweep_drift"] = stats.get("sweep_drift", 0) + int(info.get("drift", False))
+        if "orientation" in info:
+            stats["orientation_checked"] = stats.get("orientation_checked", 0) + 1
+            pruned = int(info["orientation"]["pruned"])
+            stats["orientation_pruned"] = stats.get("orientation_pruned", 0) + pruned
+    if ocr_info.get("timeout"):
+        stats["ocr_timeouts"] = stats.get("ocr_timeouts", 0) + 1
+    if ocr_info.get("crashed"):
+        stats["ocr_crashes"] = stats.get("ocr_crashes", 0) + 1
+    if "escalated" in ocr_info:
+        stats["cascade_images"] = stats.get("cascade_images", 0) + 1
+        stats["cascade_escalated"] = stats.get("cascade_escalated", 0) + int(ocr_info["escalated"])
+    if "calls" in ocr_info:
+        stats["ocr_calls"] = stats.get("ocr_calls", 0) + ocr_info["calls"]
+        stats["ocr_images"] = stats.get("ocr_images", 0) + 1
+    if "cache_hit" in ocr_info:
+        counter = "ocr_cache_hits" if ocr_info["cache_hit"] else "ocr_cache_misses"
+        stats[counter] = stats.get(counter, 0) + 1
+    if "seconds" in ocr_info:
+        stats["ocr_seconds"] = stats.get("ocr_seconds", 0) + ocr_info["seconds"]
+        stats["ocr_timed_images"] = stats.get("ocr_timed_images", 0) + 1
+    if "pixels" in ocr_info:
+        stats["ocr_pixels"] = stats.get("ocr_pixels", 0) + ocr_info["pixels"]
+
+
+def _build_scan_provider(ocr_mode: str, provider_kwargs: dict, mode_kwargs: dict,
+                         ocr_timeout: float | None, daemon):
+    """The OCR provider scan uses in this process."""
+    if ocr_timeout:
+        # The daemon's models cannot be killed mid-image, so a deadline means
+        # a private worker process even when a daemon is running.
+        return supervised_ocr_provider(ocr_mode, ocr_timeout, **provider_kwargs, **mode_kwargs)
+    if ocr_mode == "cascade":
+        provider = build_ocr_provider(ocr_mode, **mode_kwargs, **provider_kwargs)
+        # The quick Tesseract pass stays local; only manga-ocr is worth a warm daemon.
+        if daemon is not None:
+            provider.slow = daemon.ocr_provider({"mode": "manga-ocr", **provider_kwargs})
+        return provider
+    if ocr_mode == "sidecar":
+        return build_ocr_provider(ocr_mode, **mode_kwargs, **provider_kwargs)
+    if daemon is not None:
+        return daemon.ocr_provider({"mode": ocr_mode, **provider_kwargs})
+    return build_ocr_provider(ocr_mode, **provider_kwargs)
+
+
+def _scan_pipelined(items: list[ScanItem], stage_provider, stage_normalizer, word_exists, batch_size: int,
+                    ocr_cache: OcrResultCache | None, cache_key_fn, ocr_threads: int, nlp_threads: int,
+                    stats: dict[str, float]):
+    """Yield (results, record) for each item, in input order, like ``scan_in_pool``.
+
+    Images move through threaded stages in chunks of *batch_size*: ``read``
+    (hash each image and look it up in the OCR cache), ``ocr`` (the cache
+    misses; *stage_provider(i)* gives thread i its provider) and ``nlp``
+    (normalize into a record; *stage_normalizer(i)* gives thread i its
+    normalizer), while the caller writes the previous records.
+    """
+    cache_lock = threading.Lock()
+    size = max(1, batch_size)
+    chunks = [items[start:start + size] for start in range(0, len(items), size)]
+
+    def read(_, chunk: list[ScanItem]):
+        keys = [[cache_key_fn(item.image, region) if ocr_cache is not None else None for region in item.regions]
+                for item in chunk]
+        with cache_lock:
+            cached = [[ocr_cache.get(key) if key is not None else None for key in item_keys] for item_keys in keys]
+        return chunk, keys, cached
+
+    def ocr(provider, work):
+        chunk, keys, cached = work
+        misses = [
+            (item.image, region)
+            for item, hits in zip(chunk, cached, strict=True)
+            for region, hit in zip(item.regions, hits, strict=True)
+            if hit is None
+        ]
+        regions = [region for _, region in misses]
+        fresh = _ocr_images(provider, [path for path, _ in misses], batch_size,
+                            regions=regions if any(r is not None for r in regions) else None)
+        out = []
+        for item, item_keys, hits in zip(chunk, keys, cached, strict=True):
+            results = []
+            for key, hit in zip(item_keys, hits, strict=True):
+                if hit is not None:
+                    results.append((item.image, hit, {"cache_hit": True}))
+                    continue
+                result = next(fresh)
+                if key is not None:
+                    with cache_lock:
+                        _store_ocr_result(ocr_cache, key, result[1], result[2])
+                results.append(result)
+            out.append(results)
+        return chunk, out
+
+    def nlp(normalizer, work):
+        chunk, out = work
+        return [(results, _item_record(item, results, normalizer, word_exists))
+                for item, results in zip(chunk, out, strict=True)]
+
+    stages = [
+        Stage("read", read),
+        Stage("ocr", ocr, ocr_threads, setup=stage_provider),
+        Stage("nlp", nlp, nlp_threads, setup=stage_normalizer),
+    ]
+    for records in run_stages(chunks, stages, stats=stats):
+        yield from records
+
+
+def _item_record(item: ScanItem, results: list[tuple[Path, list[str], dict]], normalizer, word_exists) -> dict:
+    """Scan record for *item* from the OCR results of its jobs."""
+    if item.named_boxes is not None:
+        return _build_roi_record(item.image, item.named_boxes, results, normalizer, word_exists)
+    return _build_record(item.image, results[0][1], normalizer, word_exists)
+
+
+def _build_record(image_path: Path, texts: list[str], normalizer, word_exists) -> dict:
+    """Tokenize and normalize OCR texts for one image into a scan record."""
+    text = texts[0] if texts else ""
+    candidates: list[str] = []
+    normalized_records: list[dict] = []
+    primary_surface_tokens: list[str] = []
+    for candidate_text in texts:
+        sequence = extract_token_sequence(candidate_text)
+        if not primary_surface_tokens:
+            primary_surface_tokens = sequence
+        normalized = normalizer.normalize_text(candidate_text, word_exists=word_exists)
+        base = [entry.lemma for entry in normalized]
+        candidates.extend(base)
+        normalized_records.extend(asdict(entry) for entry in normalized)
+        surface_candidates = {token for token in sequence if is_candidate_token(token)}
+        candidates.extend(_merge_compound_candidates(sequence, surface_candidates, word_exists))
+    candidates = list(dict.fromkeys(candidates))
+    logger.debug("image %s: text=%r candidates=%s", image_path.name, text[:80], candidates)
+    return {
+        "image": str(image_path),
+        "text": text,
+        "alternate_texts": texts[1:6],
+        "surface_tokens": primary_surface_tokens,
+        "normalized_candidates": normalized_records,
+        "candidates": candidates,
+    }
+
+
+def _build_roi_record(image_path: Path, named_boxes: list[tuple[str, tuple[int, int, int, int]]],
+                      results: list[tuple[Path, list[str], dict]], normalizer, word_exists) -> dict:
+    """Scan record for an image OCR'd per configured region.
+
+    Each region becomes a sub-record under ``regions``; the top-level fields
+    combine them so later stages read the record like any other.
+    """
+    regions: list[dict] = []
+    for (name, box), (_, texts, ocr_info) in zip(named_boxes, results, strict=True):
+        region = {"name": name, "box": list(box)}
+        region.update(_build_record(image_path, texts, normalizer, word_exists))
+        del region["image"]
+        if _record_ocr_info(ocr_info):
+            region["ocr_info"] = _record_ocr_info(ocr_info)
+        regions.append(region)
+    return {
+        "image": str(image_path),
+        "text": "\n".join(region["text"] for region in regions if region["text"]),
+        "alternate_texts": [],
+        "surface_tokens": [token for region in regions for token in region["surface_tokens"]],
+        "normalized_candidates": [entry for region in regions for entry in region["normalized_candidates"]],
+        "candidates": list(dict.fromkeys(c for region in regions for c in region["candidates"])),
+        "regions": regions,
+    }
+
+
+# Measurements that differ on every run; they go to the scan stats, not scan.json.
+_RUN_MEASUREMENTS = frozenset({"seconds", "pixels"})
+
+
+def _record_ocr_info(ocr_info: dict) -> dict:
+    """The part of *ocr_info* stored in the scan record."""
+    return {key: value for key, value in ocr_info.items() if key not in _RUN_MEASUREMENTS}
+
+
+def _ocr_abandoned(ocr_info: dict) -> bool:
+    """True when the image's OCR timed out or crashed its worker."""
+    return bool(ocr_info.get("timeout") or ocr_info.get("crashed"))
+
+
+def _store_ocr_result(ocr_cache: OcrResultCache, key: str, texts: list[str], ocr_info: dict) -> None:
+    """Cache a freshly OCR'd image's *texts* under *key*, if they belong there.
+
+    A timed-out or crashed image was never read. A learned-sweep drift adds
+    a combo to the provider for the rest of the run, while *key* still names
+    the combos the run started with, so from the drifting image on nothing
+    is written to the cache.
+    """
+    if _ocr_abandoned(ocr_info):
+        return
+    if ocr_info.get("drift"):
+        ocr_cache.writable = False
+    ocr_cache.put(key, texts)
+    ocr_info["cache_hit"] = False
+
+
+def _merge_ocr_info(infos: list[dict]) -> dict:
+    """Per-image ocr_info from the ocr_info of each of its regions."""
+    merged: dict = {}
+    for key in ("calls", "seconds", "pixels"):
+        if any(key in info for info in infos):
+            merged[key] = sum(info.get(key, 0) for info in infos)
+    if "seconds" in merged:
+        merged["seconds"] = round(merged["seconds"], 4)
+    if any("cache_hit" in info for info in infos):
+        merged["cache_hit"] = all(info.get("cache_hit", False) for info in infos)
+    if any(info.get("timeout") for info in infos):
+        merged["timeout"] = True
+    if any(info.get("crashed") for info in infos):
+        merged["crashed"] = True
+    if any("escalated" in info for info in infos):
+        merged["escalated"] = any(info.get("escalated", False) for info in infos)
+    return merged
+
+
+def _known_word_ratio(text: str, normalizer, word_exists) -> float:
+    """Share of the words normalized from *text* that the dictionary knows."""
+    lemmas = [entry.lemma for entry in normalizer.normalize_text(text, word_exists=word_exists)]
+    if not lemmas:
+        return 0.0
+    return sum(1 for lemma in lemmas if word_exists(lemma)) / len(lemmas)
+
+
+def _duplicate_index(prior_records: list[dict], max_distance: int) -> NearDuplicateIndex:
+    """Near-duplicate index seeded with the records of a resumed scan, so new
+    frames can match them too."""
+    index = NearDuplicateIndex(max_distance)
+    for record in prior_records:
+        if record.get("phash") and not record.get("duplicate_of"):
+            index.add(record["phash"], record["image"])
+    return index
+
+
+def _find_near_duplicates(pending: list[Path], index: NearDuplicateIndex,
+                          ) -> tuple[dict[Path, str], dict[Path, str]]:
+    """Map each pending image that is a near-duplicate of an earlier one to it.
+
+    Returns (duplicates, hashes): duplicate image -> original image path, and
+    the perceptual hash of every pending image that could be decoded. Images
+    that are not duplicates are added to *index* for later ones to match.
+    """
+    duplicates: dict[Path, str] = {}
+    hashes: dict[Path, str] = {}
+    for image_path in pending:
+        try:
+            hashes[image_path] = dhash(image_path)
+        except (OSError, ValueError) as exc:
+            logger.debug("cannot hash %s, scanning it normally: %s", image_path, exc)
+            continue
+        original = index.find(hashes[image_path])
+        if original is not None:
+            duplicates[image_path] = original
+        else:
+            index.add(hashes[image_path], str(image_path))
+    return duplicates, hashes
+
+
+def _plan_sequential_diff(files: list[Path], pending: list[Path],
+                          ) -> tuple[dict[Path, str], dict[Path, tuple[int, int, int, int]], int]:
+    """Compare each pending image with the image before it in scan order.
+
+    Returns (unchanged, boxes, changed_whole): images that match their
+    predecessor -> the predecessor's path, images where only part of the frame
+    changed -> the changed box, and how many must be OCR'd whole (first image,
+    size change, unreadable, or most of the frame changed). Only the previous
+    thumbnail is kept in memory.
+    """
+    pending_set = set(pending)
+    unchanged: dict[Path, str] = {}
+    boxes: dict[Path, tuple[int, int, int, int]] = {}
+    changed_whole = 0
+    previous: tuple | None = None
+    for i, image_path in enumerate(files):
+        if image_path not in pending_set and (i + 1 == len(files) or files[i + 1] not in pending_set):
+            previous = None
+            continue
+        try:
+            current = luma_thumbnail(image_path)
+        except (OSError, ValueError) as exc:
+            logger.debug("cannot diff %s, scanning it whole: %s", image_path, exc)
+            current = None
+        if image_path in pending_set:
+            box = None
+            same_size = previous is not None and current is not None and previous[1] == current[1]
+            if same_size and previous[0].shape == current[0].shape:
+                box = changed_box(previous[0], current[0], current[1])
+                if box is None:
+                    unchanged[image_path] = str(files[i - 1])
+            if box is not None and _box_share(box, current[1]) <= _DIFF_MAX_PARTIAL_SHARE:
+                boxes[image_path] = box
+            elif image_path not in unchanged:
+                changed_whole += 1
+        previous = current
+    return unchanged, boxes, changed_whole
+
+
+def _box_share(box: tuple[int, int, int, int], size: tuple[int, int]) -> float:
+    return (box[2] - box[0]) * (box[3] - box[1]) / (size[0] * size[1])
+
+
+def _plan_autocrop(image_paths: list[Path]) -> dict[Path, dict]:
+    """Detect the text region of each image; low-confidence frames keep the full frame.
+
+    Returns record fields per image: ``crop_box`` (None for the full frame)
+    and the detector's ``crop_confidence``.
+    """
+    crops: dict[Path, dict] = {}
+    for image_path in image_paths:
+        try:
+            region = detect_text_region(image_path)
+        except (OSError, ValueError) as exc:
+            logger.debug("cannot autocrop %s, using the full frame: %s", image_path, exc)
+            continue
+        if region is None:
+            crops[image_path] = {"crop_box": None, "crop_confidence": 0.0}
+            continue
+        confident = region.confidence >= AUTOCROP_MIN_CONFIDENCE
+        crops[image_path] = {
+            "crop_box": list(region.box) if confident else None,
+            "crop_confidence": region.confidence,
+        }
+    return crops
+
+
+def _plan_roi(image_paths: list[Path],
+              roi: dict[str, list[float]]) -> dict[Path, list[tuple[str, tuple[int, int, int, int]]]]:
+    """Resolve the configured ROI rectangles on each image.
+
+    Images whose size cannot be read or that a rectangle does not fit (e.g. a
+    screenshot at another resolution) are left out and scanned whole.
+    """
+    planned: dict[Path, list[tuple[str, tuple[int, int, int, int]]]] = {}
+    for image_path in image_paths:
+        try:
+            width, height = image_size(image_path)
+            planned[image_path] = [(name, resolve_roi(rect, width, height)) for name, rect in roi.items()]
+        except (OSError, ValueError) as exc:
+            logger.warning("roi does not fit %s, scanning the full frame: %s", image_path.name, exc)
+    return planned
+
+
+def _crop_region(crop: dict | None) -> tuple[int, int, int, int] | None:
+    if crop is None or crop["crop_box"] is None:
+        return None
+    return tuple(crop["crop_box"])
+
+
+def _diff_region(box: tuple[int, int, int, int] | None,
+                 crop: tuple[int, int, int, int] | None) -> tuple[int, int, int, int] | None:
+    """The changed rows of a frame, narrowed to its autocrop box when the two overlap."""
+    if box is None or crop is None:
+        return box or crop
+    top, bottom = max(box[1], crop[1]), min(box[3], crop[3])
+    if top >= bottom:
+        return box
+    return crop[0], top, crop[2], bottom
+
+
+def _duplicate_record(original: dict, image_path: Path) -> dict:
+    record = {key: value for key, value in original.items() if key not in {"ocr_info", "phash"}}
+    record["image"] = str(image_path)
+    record["duplicate_of"] = original["image"]
+    return record
+
+
+def _ocr_images(provider, image_paths: list[Path], batch_size: int,
+                ocr_cache: OcrResultCache | None = None, cache_key_fn=None,
+                regions: list[tuple[int, int, int, int] | None] | None = None):
+    """Yield (image_path, texts, ocr_info) for each image, in input order.
+
+    Providers with ``extract_text_batch`` get images in chunks of *batch_size*;
+    everything else is OCR'd one image at a time. *regions*, parallel to
+    *image_paths*, crops each image before OCR (None keeps the whole frame).
+    With *ocr_cache*, images whose content was OCR'd before with the same
+    settings skip OCR entirely. Fresh results report the OCR wall time
+    (``seconds``) and, for providers that read the image, the ``pixels``
+    handed to them; both only feed the scan stats. An image whose
+    OCR times out (see ``watchdog``) yields no texts and ``timeout: True``,
+    one that crashes the OCR worker ``crashed: True``; a batch that times out
+    or crashes is retried one image at a time.
+    """
+    regions = regions or [None] * len(image_paths)
+    reads_images = getattr(provider, "reads_images", True)
+    use_batch = batch_size > 1 and hasattr(provider, "extract_text_batch")
+    step = batch_size if use_batch else 1
+    for start in range(0, len(image_paths), step):
+        indices = range(start, min(start + step, len(image_paths)))
+        keys: dict[int, str] = {}
+        cached: dict[int, list[str]] = {}
+        if ocr_cache is not None:
+            for i in indices:
+                keys[i] = cache_key_fn(image_paths[i], regions[i])
+                hit = ocr_cache.get(keys[i])
+                if hit is not None:
+                    cached[i] = hit
+
+        misses = [i for i in indices if i not in cached]
+        fresh: dict[int, tuple[list[str], dict]] = {}
+        if use_batch and misses:
+            miss_regions = [regions[i] for i in misses]
+            # Only crop-aware callers pass regions, so plain providers keep working.
+            kwargs = {"regions": miss_regions} if any(r is not None for r in miss_regions) else {}
+            started = time.perf_counter()
+            try:
+                texts = provider.extract_text_batch([image_paths[i] for i in misses], batch_size=batch_size, **kwargs)
+            except (OcrTimeout, OcrWorkerCrash) as exc:
+                logger.warning("%s; retrying its %d image(s) one at a time", exc, len(misses))
+            else:
+                seconds = (time.perf_counter() - started) / len(misses)
+                for i, text in zip(misses, texts, strict=True):
+                    fresh[i] = ([text], {"seconds": round(seconds, 4)})
+        for i in misses:
+            if i in fresh:
+                continue
+            kwargs = {"region": regions[i]} if regions[i] is not None else {}
+            started = time.perf_counter()
+            try:
+                if hasattr(provider, "extract_text_candidates"):
+                    texts = provider.extract_text_candidates(image_paths[i], top_n=8, **kwargs)
+                else:
+                    texts = [provider.extract_text(image_paths[i], **kwargs)]
+            except (OcrTimeout, OcrWorkerCrash) as exc:
+                logger.warning("%s", exc)
+                failure = "timeout" if isinstance(exc, OcrTimeout) else "crashed"
+                fresh[i] = ([], {failure: True, "seconds": round(time.perf_counter() - started, 4)})
+                continue
+            # Providers that track per-image work (e.g. tesseract call counts) expose it here.
+            info = dict(getattr(provider, "last_info", None) or {})
+            info["seconds"] = round(time.perf_counter() - started, 4)
+            fresh[i] = (texts, info)
+
+        for i in indices:
+            if i in cached:
+                yield image_paths[i], cached[i], {"cache_hit": True}
+                continue
+            texts, ocr_info = fresh[i]
+            pixels = image_pixels(image_paths[i], regions[i]) if reads_images else None
+            if pixels is not None:
+                ocr_info["pixels"] = pixels
+            if ocr_cache is not None:
+                _store_ocr_result(ocr_cache, keys[i], texts, ocr_info)
+            yield image_paths[i], texts, ocr_info
+
+
 def _merge_compound_candidates(token_sequence: list[str], candidate_set: set[str], exists_fn) -> list[str]:
     merged: list[str] = []
     for i in range(len(token_sequence) - 1):
@@ -0,0 +1,80 @@
+"""Append-only progress journal for scan.
+
+While a scan runs, each finished record is appended to ``scan.jsonl`` in the
+run directory as one line and fsync'd, so progress survives a crash or
+Ctrl+C at the cost of one small write per image. ``scan.json`` is written
+once from the finished records at the end and the journal is then removed;
+``--resume`` reads the journal of an interrupted scan (or ``scan.json`` of a
+finished one).
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+def read_journal(path: Path) -> list[dict]:
+    """Records in *path*, in order; a line cut off by a crash ends the journal."""
+    records: list[dict] = []
+    if not path.exists():
+        return records
+    with path.open("rb") as handle:
+        for number, line in enumerate(handle, start=1):
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                logger.warning("ignoring scan journal %s from incomplete line %d on", path, number)
+                break
+    return records
+
+
+class ScanJournal:
+    """Appends scan records to a JSONL file, one fsync'd line per record.
+
+    The file is only created by the first ``append``, so a scan that fails
+    before finishing an image leaves no journal behind (and a resumed one
+    keeps the journal it was resumed from). That first append writes the
+    resumed records and the new one to a temporary file and moves it over
+    the journal, so a crash never leaves less progress than before.
+    """
+
+    def __init__(self, path: Path, records: list[dict] | None = None):
+        """Start a journal at *path* holding *records* (a resumed scan's);
+        anything already in the file is replaced on the first append."""
+        self.path = path
+        self._records = list(records or [])
+        self._handle = None
+
+    def append(self, record: dict) -> None:
+        if self._handle is None:
+            self._start(record)
+            return
+        self._handle.write(_encode(record))
+        self._handle.flush()
+        os.fsync(self._handle.fileno())
+
+    def close(self, remove: bool = False) -> None:
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+        if remove:
+            self.path.unlink(missing_ok=True)
+
+    def _start(self, record: dict) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = self.path.with_name(self.path.name + ".tmp")
+        with temporary.open("wb") as handle:
+            handle.write(b"".join(_encode(entry) for entry in [*self._records, record]))
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temporary, self.path)
+        self._records = []
+        self._handle = self.path.open("ab")
+
+
+def _encode(record: dict) -> bytes:
+    return json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n"
@@ -0,0 +1,165 @@
+"""Inter-image parallelism for ``scan --workers N``.
+
+Each worker process builds its own OCR provider, normalizer and dictionaries
+once, then OCRs and normalizes whole images, so both the OCR backend and the
+per-image Sudachi work run on every core. The scan process keeps everything
+order-sensitive: it plans the jobs, looks up and fills the OCR result cache,
+and consumes results strictly in submission order, so records reach
+``scan.json`` in the same order as a single-process scan and an interrupted
+run resumes the same way.
+"""
+from __future__ import annotations
+
+import functools
+import logging
+import multiprocessing
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Spawn, like the OCR watchdog: the scan process already runs warm-up threads.
+_MP_CONTEXT = multiprocessing.get_context("spawn")
+# Chunks in flight per worker; enough to keep workers busy while the scan
+# process writes records, without queueing the whole scan up front.
+_CHUNKS_PER_WORKER = 2
+
+
+@dataclass
+class ScanItem:
+    """One image to scan: the regions of its OCR jobs (None for the whole
+    frame) and, for configured ROIs, the region names."""
+
+    image: Path
+    regions: list[tuple[int, int, int, int] | None]
+    named_boxes: list[tuple[str, tuple[int, int, int, int]]] | None = None
+
+
+@dataclass
+class WorkerConfig:
+    """Everything a worker needs to build its components; must pickle."""
+
+    ocr_mode: str
+    provider_kwargs: dict
+    ocr_timeout: float | None
+    base_dir: str
+    online_dict: str
+    word_cache: Path | None = None
+
+
+_state: dict = {}
+
+
+def _init_worker(config: WorkerConfig) -> None:
+    from jp_anki_builder.dictionary import WordExistsCache, build_offline_dictionary, build_online_dictionary
+    from jp_anki_builder.normalization import get_default_normalizer
+    from jp_anki_builder.ocr import build_ocr_provider
+    from jp_anki_builder.scan import _known_word_ratio
+    from jp_anki_builder.warmup import Warmup
+    from jp_anki_builder.watchdog import supervised_ocr_provider
+
+    offline = build_offline_dictionary(config.base_dir)
+    cache = WordExistsCache(offline, build_online_dictionary(config.online_dict))
+    if config.word_cache is not None:
+        cache.load(config.word_cache)
+    # Each chunk reports the words it looked up, whatever earlier runs of a
+    # shared pool already cached.
+    view = cache.view()
+    normalizer = get_default_normalizer()
+    if config.ocr_timeout:
+        provider = supervised_ocr_provider(config.ocr_mode, config.ocr_timeout, **config.provider_kwargs)
+    else:
+        provider = build_ocr_provider(config.ocr_mode, **config.provider_kwargs)
+        if config.ocr_mode == "cascade":
+            provider.known_ratio = functools.partial(
+                _known_word_ratio, normalizer=normalizer, word_exists=view.word_exists
+            )
+    warmup = Warmup()
+    warmup.start("ocr", provider)
+    warmup.start("normalizer", normalizer)
+    warmup.start("dictionary", offline)
+    warmup.wait()
+    _state.update(provider=provider, normalizer=normalizer, view=view)
+
+
+def _scan_chunk(items: list[ScanItem], cached: list[list[list[str] | None]],
+                batch_size: int) -> tuple[list[tuple[list[tuple[Path, list[str], dict]], dict]], dict[str, bool]]:
+    """OCR and normalize *items* in a worker.
+
+    *cached* holds, per item and job, texts from the result cache (None to
+    OCR). Returns each item's (results, record) and the dictionary lookups
+    made for the chunk.
+    """
+    from jp_anki_builder.scan import _item_record, _ocr_images
+
+    provider, normalizer, view = _state["provider"], _state["normalizer"], _state["view"]
+    misses = [
+        (item.image, region)
+        for item, hits in zip(items, cached, strict=True)
+        for region, hit in zip(item.regions, hits, strict=True)
+        if hit is None
+    ]
+    regions = [region for _, region in misses]
+    fresh = _ocr_images(provider, [path for path, _ in misses], batch_size,
+                        regions=regions if any(r is not None for r in regions) else None)
+    out = []
+    for item, hits in zip(items, cached, strict=True):
+        results = [
+            (item.image, hit, {"cache_hit": True}) if hit is not None else next(fresh)
+            for hit in hits
+        ]
+        out.append((results, _item_record(item, results, normalizer, view.word_exists)))
+    lookups = view.entries()
+    view.clear()
+    return out, lookups
+
+
+def start_scan_pool(workers: int, config: WorkerConfig) -> ProcessPoolExecutor:
+    """Worker pool for ``scan_in_pool``; workers start on first use."""
+    return ProcessPoolExecutor(max_workers=workers, mp_context=_MP_CONTEXT,
+                               initializer=_init_worker, initargs=(config,))
+
+
+def scan_in_pool(items: list[ScanItem], executor: ProcessPoolExecutor, workers: int, batch_size: int,
+                 ocr_cache=None, cache_key_fn=None, word_cache=None,
+                 ) -> Iterator[tuple[list[tuple[Path, list[str], dict]], dict]]:
+    """Yield (results, record) for each item, in input order.
+
+    *results* lists (image_path, texts, ocr_info) per job, like
+    ``_ocr_images``. Images go to the *workers* of *executor* in chunks of
+    *batch_size* (batching providers batch within a chunk). Fresh results are
+    written to *ocr_cache*; workers' dictionary lookups are merged into
+    *word_cache*. Closing the generator early cancels the chunks that have
+    not started; the pool belongs to the caller and stays up.
+    """
+    from jp_anki_builder.scan import _store_ocr_result
+
+    chunk_size = max(1, batch_size)
+    chunks = [items[start:start + chunk_size] for start in range(0, len(items), chunk_size)]
+    in_flight: deque = deque()
+    try:
+        next_chunk = 0
+        while next_chunk < len(chunks) or in_flight:
+            while next_chunk < len(chunks) and len(in_flight) < workers * _CHUNKS_PER_WORKER:
+                chunk = chunks[next_chunk]
+                keys = [[cache_key_fn(item.image, region) if ocr_cache is not None else None
+                         for region in item.regions] for item in chunk]
+                cached = [[ocr_cache.get(key) if key is not None else None for key in item_keys]
+                          for item_keys in keys]
+                in_flight.append((executor.submit(_scan_chunk, chunk, cached, batch_size), keys, cached))
+                next_chunk += 1
+            future, keys, cached = in_flight.popleft()
+            out, lookups = future.result()
+            if word_cache is not None:
+                word_cache.update(lookups)
+            for (results, record), item_keys, hits in zip(out, keys, cached, strict=True):
+                for (_, texts, info), key, hit in zip(results, item_keys, hits, strict=True):
+                    if key is not None and hit is None:
+                        _store_ocr_result(ocr_cache, key, texts, info)
+                yield results, record
+    finally:
+        for future, _, _ in in_flight:
+            future.cancel()
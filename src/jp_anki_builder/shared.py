@@ -0,0 +1,52 @@
+"""Components kept loaded across the runs of one ``batch`` process.
+
+A single ``run`` builds its OCR backend, dictionaries and word cache, uses
+them for one folder and throws them away. ``batch`` hands every run the same
+``SharedResources``, so each component is built once, on the first run that
+asks for it, and later runs with the same settings reuse it.
+"""
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable
+from concurrent.futures import Executor
+from typing import Any
+
+from jp_anki_builder.dictionary import WordExistsCache, build_offline_dictionary, build_online_dictionary
+
+logger = logging.getLogger(__name__)
+
+
+class SharedResources:
+    """Memoizes components by key until ``close``."""
+
+    def __init__(self) -> None:
+        self._items: dict[tuple, Any] = {}
+
+    def get(self, key: tuple, build: Callable[[], Any]) -> Any:
+        """The component stored under *key*, built by *build* on first use."""
+        if key not in self._items:
+            self._items[key] = build()
+        return self._items[key]
+
+    def dictionaries(self, base_dir: str, online_dict: str) -> tuple[Any, Any]:
+        offline = self.get(("offline", base_dir), lambda: build_offline_dictionary(base_dir))
+        online = self.get(("online", online_dict), lambda: build_online_dictionary(online_dict))
+        return offline, online
+
+    def word_cache(self, base_dir: str, online_dict: str) -> WordExistsCache:
+        """One lookup cache for every run on the same dictionaries."""
+        return self.get(("word_cache", base_dir, online_dict),
+                        lambda: WordExistsCache(*self.dictionaries(base_dir, online_dict)))
+
+    def close(self) -> None:
+        """Release worker processes, OCR workers and database connections."""
+        for key, item in reversed(list(self._items.items())):
+            try:
+                if isinstance(item, Executor):
+                    item.shutdown(wait=True, cancel_futures=True)
+                elif hasattr(item, "close"):
+                    item.close()
+            except Exception as exc:
+                logger.debug("closing shared %s failed: %s", key[0], exc)
+        self._items.clear()
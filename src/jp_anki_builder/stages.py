@@ -0,0 +1,167 @@
+"""Ordered multi-stage processing on threads with bounded queues.
+
+``scan --pipelined`` splits scanning into stages (reading images for the OCR
+cache, OCR, normalization) that run at the same time on their own threads, so
+Sudachi works on one image while the OCR backend reads the next. The queues
+between stages are bounded and the number of items in flight is capped, so a
+slow stage holds the earlier ones back instead of buffering the whole scan.
+Results come out in input order.
+"""
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from typing import Any
+
+_DONE = object()
+# How often a blocked feeder or stage thread re-checks whether the consumer went away.
+_POLL_S = 0.1
+
+
+@dataclass
+class Stage:
+    name: str
+    # work(state, item) -> the item handed to the next stage.
+    work: Callable[[Any, Any], Any]
+    threads: int = 1
+    # setup(thread_index) -> the state passed to work on that thread.
+    setup: Callable[[int], Any] | None = None
+
+
+def run_stages(items: Iterable, stages: list[Stage], queue_size: int = 2,
+               stats: dict[str, float] | None = None) -> Iterator:
+    """Run *items* through *stages* and yield the last stage's results in input order.
+
+    Each queue holds up to *queue_size* items per thread of the stage reading
+    it; *items* is consumed on a background thread, only as fast as results
+    are taken. An exception raised by a stage (or by *items*) is re-raised
+    here at its item's position. *stats* receives each stage's utilization
+    (``stage_<name>_util``, busy time over wall time per thread) and thread
+    count (``stage_<name>_threads``); the caller's own time between results
+    is reported as the ``write`` stage. Busy and wall times add up over
+    repeated calls with the same *stats*.
+    """
+    stats = stats if stats is not None else {}
+    queues: list[queue.Queue] = [queue.Queue(maxsize=queue_size * max(1, s.threads)) for s in stages]
+    queues.append(queue.Queue())
+    # Queued items plus one per thread at work: caps what the reorder buffer can hold.
+    slots = threading.Semaphore(sum(q.maxsize for q in queues[:-1]) + sum(s.threads for s in stages))
+    stop = threading.Event()
+    lock = threading.Lock()
+    busy = {stage.name: 0.0 for stage in stages}
+    remaining = [stage.threads for stage in stages]
+
+    def put(target: queue.Queue, entry) -> bool:
+        """Put *entry* on *target* unless the consumer stops first."""
+        while not stop.is_set():
+            try:
+                target.put(entry, timeout=_POLL_S)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def get(source: queue.Queue):
+        """The next entry of *source*, or _DONE once the consumer stops."""
+        while not stop.is_set():
+            try:
+                return source.get(timeout=_POLL_S)
+            except queue.Empty:
+                pass
+        return _DONE
+
+    def feed() -> None:
+        count = 0
+        try:
+            for item in items:
+                while not slots.acquire(timeout=_POLL_S):
+                    if stop.is_set():
+                        return
+                if not put(queues[0], (count, item, None)):
+                    return
+                count += 1
+        except Exception as exc:
+            put(queues[0], (count, None, exc))
+        finally:
+            put(queues[0], _DONE)
+
+    def work(index: int, thread_index: int) -> None:
+        stage, inbox, outbox = stages[index], queues[index], queues[index + 1]
+        state = setup_error = None
+        if stage.setup is not None:
+            try:
+                state = stage.setup(thread_index)
+            except Exception as exc:
+                setup_error = exc
+        while True:
+            entry = get(inbox)
+            if entry is _DONE:
+                # Pass the end marker on to this stage's other threads.
+                put(inbox, _DONE)
+                with lock:
+                    remaining[index] -= 1
+                    last = remaining[index] == 0
+                if last:
+                    put(outbox, _DONE)
+                return
+            seq, item, error = entry
+            error = error or setup_error
+            if error is None and not stop.is_set():
+                started = time.perf_counter()
+                try:
+                    item = stage.work(state, item)
+                except Exception as exc:
+                    error = exc
+                with lock:
+                    busy[stage.name] += time.perf_counter() - started
+            if not put(outbox, (seq, item, error)):
+                return
+
+    threads = [threading.Thread(target=feed, name="stage-feed", daemon=True)]
+    for index, stage in enumerate(stages):
+        threads.extend(
+            threading.Thread(target=work, args=(index, n), name=f"stage-{stage.name}-{n}", daemon=True)
+            for n in range(stage.threads)
+        )
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    ready: dict[int, tuple] = {}
+    next_seq = 0
+    writing = 0.0
+    try:
+        while True:
+            entry = queues[-1].get()
+            if entry is _DONE:
+                return
+            seq, item, error = entry
+            ready[seq] = (item, error)
+            while next_seq in ready:
+                item, error = ready.pop(next_seq)
+                if error is not None:
+                    raise error
+                next_seq += 1
+                handed_out = time.perf_counter()
+                yield item
+                writing += time.perf_counter() - handed_out
+                slots.release()
+    finally:
+        stop.set()
+        # Free what the stages already produced; their threads see the stop
+        # within _POLL_S instead of waiting on a queue nobody reads.
+        for pending in queues:
+            while True:
+                try:
+                    pending.get_nowait()
+                except queue.Empty:
+                    break
+        busy["write"] = writing
+        stats["stage_wall_s"] = stats.get("stage_wall_s", 0.0) + time.perf_counter() - started
+        wall = max(stats["stage_wall_s"], 1e-9)
+        for name, threads in [*((stage.name, stage.threads) for stage in stages), ("write", 1)]:
+            stats[f"stage_{name}_busy_s"] = stats.get(f"stage_{name}_busy_s", 0.0) + busy[name]
+            stats[f"stage_{name}_util"] = round(stats[f"stage_{name}_busy_s"] / (wall * threads), 3)
+            stats[f"stage_{name}_threads"] = threads
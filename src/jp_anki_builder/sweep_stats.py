@@ -0,0 +1,96 @@
+"""Per-source statistics of which Tesseract sweep jobs win.
+
+Every image OCR'd with the Tesseract sweep has one winning (config, language,
+preprocessing variant) combination, recorded in ``ocr_info.winner``. Scan
+tallies full-sweep winners in ``data/<source>/ocr_sweep_stats.json``; once a
+source has enough of them, later scans run only the top-K combinations and
+still give every Nth image the full sweep, so a change of font or background
+shows up (and is adopted) instead of silently degrading OCR.
+"""
+from __future__ import annotations
+
+import json
+import logging
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TOP_K = 2
+# Full-sweep winners needed before a source's statistics are trusted.
+LEARN_MIN_IMAGES = 30
+# Learned scans give every Nth image the full sweep as a drift check.
+SAMPLE_EVERY = 20
+
+
+def combo_key(combo) -> str:
+    """``config|language|variant`` label of a sweep job."""
+    return "|".join(combo)
+
+
+def combo_from_key(key: str) -> tuple[str, str, str]:
+    config, language, variant = key.split("|")
+    return config, language, variant
+
+
+@dataclass
+class SweepStats:
+    path: Path
+    wins: Counter[str] = field(default_factory=Counter)
+    full_sweeps: int = 0
+    learned: int = 0
+    sampled: int = 0
+    drift: int = 0
+
+    @classmethod
+    def load(cls, path: Path) -> SweepStats:
+        stats = cls(path=path)
+        if not path.exists():
+            return stats
+        try:
+            data = json.loads(path.read_text(encoding="utf-8-sig"))
+            stats.wins = Counter({key: int(count) for key, count in data.get("wins", {}).items()})
+            for name in ("full_sweeps", "learned", "sampled", "drift"):
+                setattr(stats, name, int(data.get(name, 0)))
+        except (ValueError, AttributeError) as exc:
+            logger.warning("ignoring unreadable sweep statistics %s: %s", path, exc)
+            return cls(path=path)
+        return stats
+
+    def top(self, k: int = DEFAULT_TOP_K) -> list[tuple[str, str, str]]:
+        """The *k* most frequent winners, or [] while the source is still being learned."""
+        if k <= 0 or self.full_sweeps < LEARN_MIN_IMAGES:
+            return []
+        return [combo_from_key(key) for key, _ in self.wins.most_common(k)]
+
+    def record(self, info: dict) -> None:
+        """Tally one image's ``ocr_info`` from a Tesseract provider."""
+        if "winner" not in info:
+            return
+        sweep = info.get("sweep", "full")
+        if sweep == "learned":
+            self.learned += 1
+            return
+        # Tiered and quick searches stop early, so only full sweeps rank the combos.
+        if sweep not in ("full", "sample"):
+            return
+        # An orientation-pruned sweep only had one job to choose from.
+        if info.get("orientation", {}).get("pruned"):
+            return
+        self.full_sweeps += 1
+        self.wins[combo_key(info["winner"])] += 1
+        if sweep == "sample":
+            self.sampled += 1
+            self.drift += int(info.get("drift", False))
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "full_sweeps": self.full_sweeps,
+            "learned": self.learned,
+            "sampled": self.sampled,
+            "drift": self.drift,
+            "wins": dict(self.wins.most_common()),
+        }
+        self.path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
@@ -0,0 +1,152 @@
+"""Scene-change frame sampling for gameplay recordings.
+
+``scan --video`` decodes the recording one frame at a time (PyAV, the
+``video`` extra) and compares a downscaled luma copy of each frame with the
+last frame it kept. A frame is kept once the text region differs from that
+frame and has stopped changing, so a typewriter-style text reveal yields its
+final frame only. Kept frames are written as PNGs under the run directory and
+OCR'd like screenshots; nothing else is held in memory, so memory use does not
+grow with the length of the video.
+"""
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+from jp_anki_builder.imaging import cell_difference, resolve_roi
+
+logger = logging.getLogger(__name__)
+
+VIDEO_EXTENSIONS = {".mp4", ".mkv", ".webm", ".mov", ".avi"}
+
+# Frames are compared at this width; a line of dialogue still spans many cells.
+THUMB_WIDTH = 320
+# Frames closer together than this are not compared at all.
+_CHECK_INTERVAL_S = 0.1
+# Per-cell mean luma difference (0-255) below which two frames look the same...
+_STILL_DIFF = 3.0
+# ...and above which the text region counts as changed since the kept frame.
+_CHANGE_DIFF = 12.0
+# A changed region must hold still this long before its frame is kept (text
+# reveal animations), unless it keeps moving for longer than _MAX_WAIT_S.
+_SETTLE_S = 0.3
+_MAX_WAIT_S = 3.0
+# Slack for comparing float timestamps (0.3 - 0.2 < 0.1).
+_SLACK_S = 1e-3
+# A region this flat holds no text (a cleared dialogue box or a fade).
+_BLANK_STD = 4.0
+
+
+@dataclass
+class VideoFrame:
+    timestamp: float
+    # Downscaled grayscale copy, THUMB_WIDTH pixels wide.
+    luma: np.ndarray
+    # Full-resolution (width, height).
+    size: tuple[int, int]
+    # Decodes the full-resolution frame; only called for kept frames.
+    image: Callable[[], Image.Image]
+
+
+@dataclass(frozen=True)
+class SampledFrame:
+    path: Path
+    timestamp: float
+    index: int
+
+
+def decode_video(video_path: Path) -> Iterator[VideoFrame]:
+    """Stream the frames of *video_path*; raises ValueError if it cannot be read."""
+    try:
+        import av
+    except ImportError as exc:
+        raise ValueError(
+            "Video input requires 'av' (PyAV). Install it with: pip install -e \".[video]\""
+        ) from exc
+
+    try:
+        container = av.open(str(video_path))
+    except av.error.FFmpegError as exc:
+        raise ValueError(f"Cannot read video {video_path}: {exc}") from exc
+    with container:
+        if not container.streams.video:
+            raise ValueError(f"No video stream in {video_path}")
+        stream = container.streams.video[0]
+        stream.thread_type = "AUTO"
+        for frame in container.decode(stream):
+            if frame.time is None:
+                continue
+            height = max(1, round(frame.height * THUMB_WIDTH / frame.width))
+            luma = frame.reformat(width=THUMB_WIDTH, height=height, format="gray").to_ndarray()
+            yield VideoFrame(frame.time, luma, (frame.width, frame.height), frame.to_image)
+
+
+def sample_frames(frames: Iterable[VideoFrame], output_dir: Path,
+                  regions: list[list[float]] | None = None,
+                  stats: dict[str, float] | None = None) -> Iterator[SampledFrame]:
+    """Write the frames where the text region changed to *output_dir* as PNGs.
+
+    *regions* are ROI rectangles (see ``resolve_roi``); when given, only their
+    bounding box is compared. *stats* receives decoded/sampled frame counts
+    and the video duration.
+    """
+    stats = stats if stats is not None else {}
+    output_dir.mkdir(parents=True, exist_ok=True)
+    crop: tuple[slice, slice] | None = None
+    previous = kept = None
+    last_check = changed_since = None
+    still_since = 0.0
+    for index, frame in enumerate(frames):
+        stats["video_frames"] = stats.get("video_frames", 0) + 1
+        stats["video_seconds"] = frame.timestamp
+        if last_check is not None and frame.timestamp - last_check < _CHECK_INTERVAL_S - _SLACK_S:
+            continue
+        last_check = frame.timestamp
+        if crop is None:
+            crop = _thumb_crop(frame, regions)
+        luma = frame.luma[crop]
+        if previous is None or previous.shape != luma.shape or cell_difference(luma, previous).max() > _STILL_DIFF:
+            still_since = frame.timestamp
+        previous = luma
+        if kept is not None and kept.shape == luma.shape and cell_difference(luma, kept).max() <= _CHANGE_DIFF:
+            changed_since = None
+            continue
+        if changed_since is None:
+            changed_since = frame.timestamp
+        settled = frame.timestamp - still_since >= _SETTLE_S - _SLACK_S
+        if not settled and frame.timestamp - changed_since < _MAX_WAIT_S - _SLACK_S:
+            continue
+        kept, changed_since = luma, None
+        if float(luma.std()) < _BLANK_STD:
+            continue
+        path = output_dir / f"t{round(frame.timestamp * 1000):09d}.png"
+        frame.image().save(path)
+        stats["video_sampled"] = stats.get("video_sampled", 0) + 1
+        yield SampledFrame(path=path, timestamp=round(frame.timestamp, 3), index=index)
+
+
+def _thumb_crop(frame: VideoFrame, regions: list[list[float]] | None) -> tuple[slice, slice]:
+    """Thumbnail slices covering the union of *regions* (the whole frame without them)."""
+    if not regions:
+        return slice(None), slice(None)
+    width, height = frame.size
+    boxes = []
+    for rect in regions:
+        try:
+            boxes.append(resolve_roi(rect, width, height))
+        except ValueError as exc:
+            logger.warning("ignoring roi %s for video change detection: %s", rect, exc)
+    if not boxes:
+        return slice(None), slice(None)
+    scale_x = frame.luma.shape[1] / width
+    scale_y = frame.luma.shape[0] / height
+    left = int(min(box[0] for box in boxes) * scale_x)
+    top = int(min(box[1] for box in boxes) * scale_y)
+    right = int(np.ceil(max(box[2] for box in boxes) * scale_x))
+    bottom = int(np.ceil(max(box[3] for box in boxes) * scale_y))
+    return slice(top, bottom), slice(left, right)
@@ -0,0 +1,54 @@
+"""Background warm-up of the resources scan loads lazily on first use.
+
+The OCR engine, the Sudachi dictionary and the offline dictionary each take
+from a fraction of a second to several seconds to load. Starting them on
+background threads lets that overlap with image discovery and resume loading
+instead of stalling the first image. Warm-up is best effort: a failed load is
+only logged, and the normal lazy path retries it and reports the error.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class Warmup:
+    """Runs each component's ``warm_up`` hook on its own daemon thread."""
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.timings: dict[str, float] = {}
+        self._threads: list[threading.Thread] = []
+
+    def start(self, name: str, component) -> None:
+        load = getattr(component, "warm_up", None)
+        if load is None:
+            return
+
+        def run() -> None:
+            start = time.perf_counter()
+            try:
+                load()
+            except Exception as exc:
+                logger.debug("warm-up of %s failed, it will load on first use: %s", name, exc)
+                return
+            self.timings[name] = time.perf_counter() - start
+            logger.debug("warmed up %s in %.2fs", name, self.timings[name])
+
+        thread = threading.Thread(target=run, name=f"warmup-{name}", daemon=True)
+        self._threads.append(thread)
+        thread.start()
+
+    def wait(self) -> float:
+        """Block until every warm-up has finished; returns the seconds spent waiting.
+
+        Lazy loaders are not locked, so callers wait here before first use to
+        avoid loading the same model twice.
+        """
+        start = time.perf_counter()
+        for thread in self._threads:
+            thread.join()
+        return time.perf_counter() - start
@@ -0,0 +1,198 @@
+"""Folder watching for ``jp-anki-build watch``.
+
+``ImageWatcher`` yields the images already in a folder, then each batch of
+new ones shortly after they are written, so one long-running scan (with its
+OCR backend, Sudachi and dictionaries loaded once) can pick up screenshots as
+they are taken. On Linux it sleeps on inotify and only re-lists the tree when
+something in it changed; elsewhere, or when inotify is unavailable, it polls.
+Either way the tree is re-listed through the discovery manifest, so only
+directories whose modification time changed are read again.
+
+A file counts as written once its modification time is *settle* seconds old,
+which skips screenshots that are still being saved without waiting for a
+close event the polling fallback cannot see.
+"""
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import errno
+import logging
+import os
+import select
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+from jp_anki_builder.discovery import DiscoveryManifest, iter_image_dirs
+
+logger = logging.getLogger(__name__)
+
+_IN_CLOSE_WRITE = 0x008
+_IN_MOVED_TO = 0x080
+_IN_CREATE = 0x100
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+# Creations also catch new subdirectories; close-write and moved-to mark finished files.
+_WATCH_MASK = _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE
+
+
+class _Inotify:
+    """Minimal inotify binding: one descriptor, one watch per directory."""
+
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        # AttributeError on platforms without inotify.
+        self._add_watch = libc.inotify_add_watch
+        fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.fd = fd
+        self._watched: set[Path] = set()
+
+    def add(self, directory: Path) -> bool:
+        """Watch *directory*; True if it was not watched before."""
+        if directory in self._watched:
+            return False
+        if self._add_watch(self.fd, os.fsencode(directory), _WATCH_MASK) < 0:
+            code = ctypes.get_errno()
+            # A directory removed since it was listed is simply not watched.
+            if code != errno.ENOENT:
+                raise OSError(code, f"inotify_add_watch failed for {directory}")
+            return False
+        self._watched.add(directory)
+        return True
+
+    def wait(self, timeout: float | None) -> bool:
+        """Block until an event arrives (True) or *timeout* passes (False)."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return False
+        # What changed is found by re-listing, so the events are only drained.
+        while True:
+            try:
+                if not os.read(self.fd, 64 * 1024):
+                    break
+            except BlockingIOError:
+                break
+        return True
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class ImageWatcher:
+    """Reports the images of a folder tree and the ones added to it later."""
+
+    def __init__(self, root: Path, extensions: set[str], manifest: DiscoveryManifest,
+                 poll_interval: float = 0.5, settle: float = 0.25, use_inotify: bool = True):
+        self.root = root
+        self.extensions = extensions
+        self.manifest = manifest
+        self.poll_interval = poll_interval
+        self.settle = settle
+        self._known: set[Path] = set()
+        self._checked = False
+        # Set when a directory was watched only after it was listed.
+        self._relist = False
+        # New files still being written, rechecked until they settle.
+        self._unsettled: set[Path] = set()
+        self._inotify: _Inotify | None = None
+        if use_inotify:
+            try:
+                self._inotify = _Inotify()
+            except (AttributeError, OSError) as exc:
+                logger.info("inotify unavailable (%s); polling every %.1fs", exc, poll_interval)
+
+    @property
+    def mode(self) -> str:
+        return "inotify" if self._inotify is not None else "polling"
+
+    def batches(self, tick: float | None = None, idle_exit: float | None = None) -> Iterator[list[Path]]:
+        """Yield the images already present, then each batch of new ones.
+
+        With *tick*, an empty batch is yielded once *tick* seconds after the
+        last new image, so the caller can act on a quiet folder. With
+        *idle_exit*, the batches end after that many seconds without a new
+        image; otherwise they end on Ctrl+C.
+        """
+        try:
+            existing = self._check()
+            yield existing
+            last_new = time.monotonic()
+            ticked = not existing
+            while True:
+                now = time.monotonic()
+                deadlines = []
+                if self._relist:
+                    deadlines.append(now)
+                if self._unsettled:
+                    deadlines.append(now + self.settle)
+                if self._inotify is None:
+                    deadlines.append(now + self.poll_interval)
+                if tick is not None and not ticked:
+                    deadlines.append(last_new + tick)
+                if idle_exit is not None:
+                    deadlines.append(last_new + idle_exit)
+                timeout = max(0.0, min(deadlines) - now) if deadlines else None
+                if self._inotify is not None:
+                    changed = self._inotify.wait(timeout)
+                else:
+                    time.sleep(timeout)
+                    changed = True
+                new = self._check() if changed or self._unsettled or self._relist else []
+                if new:
+                    yield new
+                    last_new = time.monotonic()
+                    ticked = False
+                    continue
+                now = time.monotonic()
+                if tick is not None and not ticked and now - last_new >= tick:
+                    ticked = True
+                    yield []
+                elif idle_exit is not None and now - last_new >= idle_exit:
+                    return
+        except KeyboardInterrupt:
+            # Ends the batches, so the scan still writes its artifact.
+            return
+
+    def close(self) -> None:
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+    def _check(self) -> list[Path]:
+        """Images that appeared and settled since the last check."""
+        listed = [path for batch in iter_image_dirs(self.root, self.extensions, self.manifest) for path in batch]
+        if self._inotify is not None:
+            try:
+                # Files created between the listing and a new watch are found
+                # by listing once more.
+                added = [self._inotify.add(self.root / key) for key in self.manifest.dirs]
+                self._relist = any(added)
+            except OSError as exc:
+                # Usually the per-user watch limit (fs.inotify.max_user_watches).
+                logger.warning("%s; falling back to polling every %.1fs", exc, self.poll_interval)
+                self.close()
+                self._relist = False
+        now = time.time()
+        ready: list[tuple[float, Path]] = []
+        self._unsettled.clear()
+        for path in listed:
+            if path in self._known:
+                continue
+            try:
+                mtime = path.stat().st_mtime
+            except OSError:
+                continue
+            if now - mtime < self.settle:
+                self._unsettled.add(path)
+                continue
+            self._known.add(path)
+            ready.append((mtime, path))
+        if self._checked:
+            # New screenshots in the order they were taken; the first check
+            # keeps the folder order of a normal scan.
+            ready.sort(key=lambda entry: entry[0])
+        self._checked = True
+        return [path for _, path in ready]
@@ -0,0 +1,241 @@
+"""Per-image OCR deadline enforced by a killable worker process.
+
+With ``--ocr-timeout`` the OCR provider is built and run in a child process
+instead of in the scan process. Each request waits at most the deadline; if
+the worker has not answered by then it is killed, a fresh one is started and
+warmed up, and the caller gets ``OcrTimeout`` for that image so the scan can
+record it and move on. A worker that dies on an image (say, the engine
+segfaults on a corrupt file) is replaced the same way and the caller gets
+``OcrWorkerCrash``. A hung Tesseract call or a transformer stuck on a
+corrupt or enormous image can then no longer stall a long unattended scan.
+"""
+from __future__ import annotations
+
+import functools
+import logging
+import multiprocessing
+import threading
+from pathlib import Path
+
+from jp_anki_builder.ocr import OcrError, OcrTimeout, OcrWorkerCrash, build_ocr_provider
+
+logger = logging.getLogger(__name__)
+
+# Spawn rather than fork: the scan process already runs warm-up threads, and
+# spawn behaves the same on Windows, Linux and macOS.
+_MP_CONTEXT = multiprocessing.get_context("spawn")
+_STOP_TIMEOUT_S = 5.0
+
+
+def build_worker_provider(mode: str, **kwargs):
+    """Provider factory run inside the worker process."""
+    provider = build_ocr_provider(mode, **kwargs)
+    if mode == "cascade":
+        # The scan process's dictionary cache cannot cross the process
+        # boundary, so the worker checks cascade output against its own
+        # offline dictionary.
+        from jp_anki_builder.dictionary import WordExistsCache, build_offline_dictionary
+        from jp_anki_builder.normalization import get_default_normalizer
+        from jp_anki_builder.scan import _known_word_ratio
+
+        word_exists = WordExistsCache(build_offline_dictionary(kwargs.get("base_dir", "data"))).word_exists
+        provider.known_ratio = functools.partial(
+            _known_word_ratio, normalizer=get_default_normalizer(), word_exists=word_exists
+        )
+    return provider
+
+
+def _worker_main(conn, factory, mode: str, kwargs: dict) -> None:
+    try:
+        provider = factory(mode, **kwargs)
+        startup_error = None
+    except Exception as exc:
+        provider = None
+        startup_error = {"ok": False, "kind": exc.__class__.__name__, "error": str(exc)}
+    while True:
+        try:
+            request = conn.recv()
+        except EOFError:
+            return
+        if startup_error is not None:
+            conn.send(startup_error)
+            continue
+        op = request["op"]
+        try:
+            if op == "describe":
+                version = provider.cache_version() if hasattr(provider, "cache_version") else None
+                result = {"batch": hasattr(provider, "extract_text_batch"), "cache_version": version}
+            elif op == "warm_up":
+                warm_up = getattr(provider, "warm_up", None)
+                if warm_up is not None:
+                    warm_up()
+                result = None
+            elif op == "ocr":
+                kwargs = {"region": tuple(request["region"])} if request["region"] else {}
+                if hasattr(provider, "extract_text_candidates"):
+                    texts = provider.extract_text_candidates(request["image"], top_n=request["top_n"], **kwargs)
+                else:
+                    texts = [provider.extract_text(request["image"], **kwargs)]
+                result = {"texts": texts, "info": dict(getattr(provider, "last_info", None) or {})}
+            elif op == "batch":
+                regions = request["regions"]
+                kwargs = {"regions": regions} if regions else {}
+                result = provider.extract_text_batch(request["images"], batch_size=request["batch_size"], **kwargs)
+            else:
+                raise ValueError(f"unknown worker op: {op!r}")
+        except Exception as exc:
+            conn.send({"ok": False, "kind": exc.__class__.__name__, "error": str(exc)})
+        else:
+            conn.send({"ok": True, "result": result})
+
+
+class SupervisedOcrProvider:
+    """Runs another OCR provider in a worker process with a per-image deadline.
+
+    Mirrors the provider API (``extract_text_candidates``, ``last_info``,
+    ``cache_version``, ``warm_up`` and ``extract_text_batch`` when the wrapped
+    provider batches; a batch gets the deadline times its size). ``restarts``
+    counts workers replaced after a timeout or crash.
+    """
+
+    def __init__(self, mode: str, timeout: float, factory=build_worker_provider, **kwargs):
+        self.mode = mode
+        self.timeout = timeout
+        self.restarts = 0
+        self.last_info: dict = {}
+        self.reads_images = mode != "sidecar"
+        self._factory = factory
+        self._kwargs = kwargs
+        self._process = None
+        self._conn = None
+        self._lock = threading.Lock()
+        self._description: dict | None = None
+        self._warm = False
+
+    def __getattr__(self, name: str):
+        # Only expose cache_version and the batch API when the worker's
+        # provider has them, so run_scan treats it like the provider itself.
+        if name == "cache_version":
+            version = self._describe()["cache_version"]
+            if version is not None:
+                return lambda: version
+        if name == "extract_text_batch" and self._describe()["batch"]:
+            return self._extract_text_batch
+        raise AttributeError(name)
+
+    def warm_up(self) -> None:
+        with self._lock:
+            self._warm_up_locked()
+
+    def extract_text(self, image_path: Path, region: tuple[int, int, int, int] | None = None) -> str:
+        texts = self.extract_text_candidates(image_path, top_n=1, region=region)
+        return texts[0] if texts else ""
+
+    def extract_text_candidates(self, image_path: Path, top_n: int = 8,
+                                region: tuple[int, int, int, int] | None = None) -> list[str]:
+        response = self._request(
+            {"op": "ocr", "image": Path(image_path), "top_n": top_n, "region": region},
+            self.timeout,
+            f"OCR of {Path(image_path).name}",
+        )
+        self.last_info = response["info"]
+        return response["texts"]
+
+    def _extract_text_batch(self, image_paths: list[Path], batch_size: int = 8,
+                            regions: list[tuple[int, int, int, int] | None] | None = None) -> list[str]:
+        return self._request(
+            {"op": "batch", "images": list(image_paths), "batch_size": batch_size, "regions": regions},
+            self.timeout * len(image_paths),
+            f"OCR of a {len(image_paths)}-image batch",
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            self._stop()
+
+    def _describe(self) -> dict:
+        if self._description is None:
+            with self._lock:
+                if self._description is None:
+                    self._description = self._call({"op": "describe"}, None, "worker start-up")
+        return self._description
+
+    def _request(self, request: dict, timeout: float, what: str):
+        with self._lock:
+            # Model loading is not part of any image's deadline.
+            self._warm_up_locked()
+            return self._call(request, timeout, what)
+
+    def _warm_up_locked(self) -> None:
+        if not self._warm:
+            self._call({"op": "warm_up"}, None, "warm-up")
+            self._warm = True
+
+    def _call(self, request: dict, timeout: float | None, what: str):
+        if self._process is None or not self._process.is_alive():
+            self._start()
+        self._conn.send(request)
+        if timeout is not None and not self._conn.poll(timeout):
+            logger.warning("%s exceeded %.0fs; restarting the OCR worker", what, timeout)
+            self._restart()
+            raise OcrTimeout(f"{what} exceeded the {timeout:g}s OCR timeout")
+        try:
+            response = self._conn.recv()
+        except (EOFError, OSError) as exc:
+            self._process.join(_STOP_TIMEOUT_S)
+            exit_code = self._process.exitcode
+            self._restart()
+            message = f"The OCR worker exited during {what} (exit code {exit_code})."
+            # Only an image request is the image's fault; a worker that cannot
+            # start or warm up would fail the same way for every image.
+            if timeout is not None:
+                raise OcrWorkerCrash(message) from exc
+            raise OcrError(message) from exc
+        if not response["ok"]:
+            if response["kind"] == "ValueError":
+                raise ValueError(response["error"])
+            raise OcrError(response["error"])
+        return response["result"]
+
+    def _start(self) -> None:
+        parent_conn, child_conn = _MP_CONTEXT.Pipe()
+        self._process = _MP_CONTEXT.Process(
+            target=_worker_main,
+            args=(child_conn, self._factory, self.mode, self._kwargs),
+            name=f"ocr-worker-{self.mode}",
+            daemon=True,
+        )
+        self._process.start()
+        child_conn.close()
+        self._conn = parent_conn
+        self._warm = False
+
+    def _stop(self) -> None:
+        if self._process is None:
+            return
+        self._conn.close()
+        self._process.join(_STOP_TIMEOUT_S)
+        if self._process.is_alive():
+            self._process.kill()
+            self._process.join()
+        self._process = None
+        self._conn = None
+
+    def _restart(self) -> None:
+        self._process.kill()
+        self._process.join()
+        self._conn.close()
+        self._process = None
+        self._conn = None
+        self.restarts += 1
+        # The replacement starts lazily on the next request, which warms it
+        # up before its deadline starts.
+        self._warm = False
+
+
+def supervised_ocr_provider(mode: str, timeout: float, factory=build_worker_provider,
+                            **kwargs) -> SupervisedOcrProvider:
+    """Start a worker that builds the *mode* provider and wrap it with *timeout*."""
+    provider = SupervisedOcrProvider(mode, timeout, factory=factory, **kwargs)
+    provider._describe()
+    return provider
@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from jp_anki_builder.batch import discover_runs
+from jp_anki_builder.cli import app
+
+
+def _shot(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"fake")
+    path.with_suffix(".txt").write_text(text, encoding="utf-8")
+
+
+def test_discover_runs_names_each_image_folder_after_its_path(tmp_path: Path):
+    root = tmp_path / "screenshots"
+    for name in ("GameX/ch10/1.png", "GameX/ch2/1.png", "GameX/ch2/2.png", "GameX/ch2/extra/1.png"):
+        _shot(root / name, "冒険")
+
+    runs = discover_runs(root)
+
+    assert [(run.source, run.run_id, len(run.images)) for run in runs] == [
+        ("GameX", "ch2", 2), ("ch2", "extra", 1), ("GameX", "ch10", 1),
+    ]
+
+    _shot(root / "GameY" / "GameX" / "ch10" / "1.png", "勇者")
+    with pytest.raises(ValueError, match="would both be run GameX/ch10"):
+        discover_runs(root)
+
+
+def test_batch_builds_every_run_with_one_ocr_provider(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    pytest.importorskip("genanki")
+    from jp_anki_builder import scan as scan_module
+
+    root = tmp_path / "screenshots"
+    _shot(root / "GameX" / "ch1" / "001.png", "冒険")
+    _shot(root / "GameX" / "ch2" / "001.png", "勇者")
+    _shot(root / "GameX" / "ch3" / "001.png", "魔法")
+    data_dir = tmp_path / "data"
+    dict_dir = data_dir / "dictionaries"
+    dict_dir.mkdir(parents=True)
+    (dict_dir / "offline.json").write_text(
+        json.dumps(
+            {
+                "冒険": {"reading": "ぼうけん", "meanings": ["adventure"]},
+                "勇者": {"reading": "ゆうしゃ", "meanings": ["hero"]},
+            },
+            ensure_ascii=False,
+        ),
+        encoding="utf-8",
+    )
+    built: list[str] = []
+
+    class TextFileProvider:
+        def extract_text(self, image_path: Path) -> str:
+            return image_path.with_suffix(".txt").read_text(encoding="utf-8")
+
+    def build_provider(mode, language="jpn", tesseract_cmd=None, preprocess=True, **kwargs):
+        built.append(mode)
+        return TextFileProvider()
+
+    monkeypatch.setattr(scan_module, "build_ocr_provider", build_provider)
+
+    result = CliRunner().invoke(
+        app, ["batch", "--root", str(root), "--data-dir", str(data_dir), "--ocr-mode", "manga-ocr"]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert built == ["manga-ocr"]
+    assert "[INFO] Found 3 run folder(s)" in result.output
+    lines = result.output.splitlines()
+    table = lines[lines.index("[SUMMARY]") + 1:lines.index("[SUMMARY]") + 5]
+    assert table[0].split() == ["Source", "Run", "Images", "Candidates", "Approved", "Notes", "Time", "Status"]
+    assert [line.split()[:2] + line.split()[-1:] for line in table[1:]] == [
+        ["GameX", "ch1", "ok"], ["GameX", "ch2", "ok"], ["GameX", "ch3", "meanings"],
+    ]
+    for run_id in ("ch1", "ch2"):
+        assert (data_dir / "GameX" / run_id / "deck.apkg").exists()
+    assert json.loads((data_dir / "GameX" / "ch3" / "scan.json").read_text(encoding="utf-8"))["candidates"] == ["魔法"]
+    # The shared word cache answers every run, but each run saves only its own lookups.
+    ch1_words = json.loads((data_dir / "GameX" / "ch1" / "word_cache.json").read_text(encoding="utf-8"))
+    assert "冒険" in ch1_words
+    assert not {"勇者", "魔法"} & set(ch1_words)
+
+
+def test_batch_records_an_unexpected_failure_and_moves_on(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    from jp_anki_builder import scan as scan_module
+
+    root = tmp_path / "screenshots"
+    _shot(root / "GameX" / "ch1" / "001.png", "冒険")
+    _shot(root / "GameX" / "ch2" / "001.png", "勇者")
+    data_dir = tmp_path / "data"
+    built: list[object] = []
+
+    class FlakyProvider:
+        closed = False
+
+        def extract_text(self, image_path: Path) -> str:
+            if image_path.parent.name == "ch1":
+                raise KeyError("decoder state")
+            return image_path.with_suffix(".txt").read_text(encoding="utf-8")
+
+        def close(self) -> None:
+            self.closed = True
+
+    def build_provider(mode, language="jpn", tesseract_cmd=None, preprocess=True, **kwargs):
+        built.append(FlakyProvider())
+        return built[-1]
+
+    monkeypatch.setattr(scan_module, "build_ocr_provider", build_provider)
+
+    result = CliRunner().invoke(
+        app, ["batch", "--root", str(root), "--data-dir", str(data_dir), "--ocr-mode", "manga-ocr"]
+    )
+
+    assert result.exit_code == 1, result.output
+    assert "1 run(s) failed" in result.output
+    lines = result.output.splitlines()
+    table = lines[lines.index("[SUMMARY]") + 2:lines.index("[SUMMARY]") + 4]
+    assert [line.split()[1] for line in table] == ["ch1", "ch2"]
+    assert table[0].split()[-1] == "failed"
+    assert table[1].split()[-1] != "failed"
+    # The failed run's provider was closed and the next run built a fresh one.
+    assert len(built) == 2
+    assert built[0].closed
+
+
+def test_batch_shares_the_worker_pool_across_runs(tmp_path: Path):
+    root = tmp_path / "screenshots"
+    _shot(root / "GameX" / "ch1" / "001.png", "冒険")
+    _shot(root / "GameX" / "ch1" / "002.png", "勇者")
+    _shot(root / "GameX" / "ch2" / "001.png", "魔法")
+    data_dir = tmp_path / "data"
+
+    result = CliRunner().invoke(
+        app,
+        ["batch", "--root", str(root), "--data-dir", str(data_dir), "--ocr-mode", "sidecar", "--workers", "2"],
+    )
+
+    # No dictionary, so no deck; both runs are still scanned by the same workers.
+    assert result.exit_code == 0, result.output
+    assert "failed" not in result.output
+    for run_id, candidates in (("ch1", ["冒険", "勇者"]), ("ch2", ["魔法"])):
+        payload = json.loads((data_dir / "GameX" / run_id / "scan.json").read_text(encoding="utf-8"))
+        assert payload["candidates"] == candidates
+
+
+def test_batch_writes_the_same_scan_json_as_scan(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    from jp_anki_builder import scan as scan_module
+
+    root = tmp_path / "screenshots"
+    for name, text in (("p10.png", "勇者"), ("p2.png", "冒険"), ("p1.png", "魔法")):
+        _shot(root / "GameX" / "ch1" / name, text)
+    writes: list[Path] = []
+    write_artifact = scan_module._write_scan_artifact
+
+    def counting_write(paths, *args, **kwargs):
+        writes.append(paths.scan_artifact)
+        write_artifact(paths, *args, **kwargs)
+
+    monkeypatch.setattr(scan_module, "_write_scan_artifact", counting_write)
+
+    scanned = CliRunner().invoke(
+        app,
+        [
+            "scan", "--images", str(root / "GameX" / "ch1"), "--data-dir", str(tmp_path / "scan-data"),
+            "--ocr-mode", "sidecar",
+        ],
+    )
+    batched = CliRunner().invoke(
+        app, ["batch", "--root", str(root), "--data-dir", str(tmp_path / "batch-data"), "--ocr-mode", "sidecar"]
+    )
+
+    assert scanned.exit_code == 0, scanned.output
+    assert batched.exit_code == 0, batched.output
+    artifacts = [tmp_path / data / "GameX" / "ch1" / "scan.json" for data in ("scan-data", "batch-data")]
+    assert writes == artifacts
+    assert artifacts[0].read_text(encoding="utf-8") == artifacts[1].read_text(encoding="utf-8")
@@ -0,0 +1,112 @@
+import json
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from jp_anki_builder import daemon as daemon_module
+from jp_anki_builder import ocr as ocr_module
+from jp_anki_builder.cli import app
+
+pytestmark = pytest.mark.skipif(not daemon_module.daemon_supported(), reason="needs Unix domain sockets")
+
+
+class _DaemonSideProvider:
+    calls: list[str] = []
+
+    def cache_version(self) -> str:
+        return "fake/1"
+
+    def extract_text_candidates(self, image_path: Path, top_n: int = 8) -> list[str]:
+        _DaemonSideProvider.calls.append(image_path.name)
+        return ["冒険に行く"]
+
+
+@pytest.fixture
+def running_daemon(tmp_path, monkeypatch):
+    # Unix socket paths are length-limited, so keep it out of the deep tmp_path.
+    socket_dir = Path(tempfile.mkdtemp(prefix="jpa"))
+    monkeypatch.setattr(daemon_module, "daemon_socket_path", lambda base_dir="data": socket_dir / "w.sock")
+    monkeypatch.setattr(
+        ocr_module,
+        "build_ocr_provider",
+        lambda mode, language="jpn", tesseract_cmd=None, preprocess=True, **kwargs: _DaemonSideProvider(),
+    )
+    _DaemonSideProvider.calls = []
+    data_dir = tmp_path / "data"
+    worker = daemon_module.WorkerDaemon(base_dir=str(data_dir))
+    thread = threading.Thread(target=worker.serve_forever, daemon=True)
+    thread.start()
+    for _ in range(200):
+        if daemon_module.ping(str(data_dir)) is not None:
+            break
+        time.sleep(0.01)
+    yield data_dir
+    worker.shutdown()
+    thread.join(timeout=5)
+
+
+def _scan(tmp_path: Path, data_dir: Path, *extra: str):
+    from jp_anki_builder import scan as scan_module
+
+    images_dir = tmp_path / "images"
+    images_dir.mkdir(exist_ok=True)
+    (images_dir / "001.png").write_bytes(b"fake")
+    return scan_module, [
+        "scan",
+        "--images", str(images_dir),
+        "--source", "game-a",
+        "--run-id", "daemon-1",
+        "--data-dir", str(data_dir),
+        "--ocr-mode", "tesseract",
+        "--no-ocr-cache",
+        *extra,
+    ]
+
+
+def test_scan_uses_running_daemon_for_ocr_and_tokenization(tmp_path, monkeypatch, running_daemon):
+    scan_module, args = _scan(tmp_path, running_daemon)
+
+    def local_provider(*args, **kwargs):
+        raise AssertionError("scan should not build a local provider while the daemon runs")
+
+    monkeypatch.setattr(scan_module, "build_ocr_provider", local_provider)
+
+    result = CliRunner().invoke(app, args)
+
+    assert result.exit_code == 0, result.output
+    assert "serve daemon" in result.output
+    assert _DaemonSideProvider.calls == ["001.png"]
+    payload = json.loads((running_daemon / "game-a" / "daemon-1" / "scan.json").read_text(encoding="utf-8"))
+    record = payload["records"][0]
+    assert record["text"] == "冒険に行く"
+    assert "冒険" in record["candidates"]
+    assert "行く" in record["candidates"]
+
+
+def test_scan_no_daemon_flag_keeps_work_local(tmp_path, monkeypatch, running_daemon):
+    scan_module, args = _scan(tmp_path, running_daemon, "--no-daemon")
+
+    class LocalProvider:
+        def extract_text_candidates(self, image_path: Path, top_n: int = 8) -> list[str]:
+            return ["勇者"]
+
+    monkeypatch.setattr(
+        scan_module,
+        "build_ocr_provider",
+        lambda mode, language="jpn", tesseract_cmd=None, preprocess=True, **kwargs: LocalProvider(),
+    )
+
+    result = CliRunner().invoke(app, args)
+
+    assert result.exit_code == 0, result.output
+    assert "serve daemon" not in result.output
+    assert _DaemonSideProvider.calls == []
+
+
+def test_connect_daemon_returns_none_without_daemon(tmp_path):
+    assert daemon_module.connect_daemon(str(tmp_path / "data")) is None
+    assert daemon_module.stop_daemon(str(tmp_path / "data")) is False
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import os
+import threading
+from pathlib import Path
+
+import pytest
+
+from jp_anki_builder.discovery import DiscoveryManifest, in_background, iter_image_dirs, natural_key
+
+_IMAGES = {".png", ".jpg"}
+
+
+def _touch(path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"x")
+
+
+def test_iter_image_dirs_yields_each_folder_in_natural_order(tmp_path: Path):
+    for name in ("p10.png", "p2.png", "P1.jpg", "notes.txt", "ch2/a.png", "ch10/b.png", "ch2/sub/c.png"):
+        _touch(tmp_path / name)
+
+    batches = [[path.relative_to(tmp_path).as_posix() for path in batch]
+               for batch in iter_image_dirs(tmp_path, _IMAGES)]
+
+    assert batches == [["P1.jpg", "p2.png", "p10.png"], ["ch2/a.png"], ["ch2/sub/c.png"], ["ch10/b.png"]]
+    assert sorted(["x10", "x9", "X1"], key=natural_key) == ["X1", "x9", "x10"]
+
+
+def test_manifest_reuses_listings_of_unchanged_folders(tmp_path: Path):
+    root = tmp_path / "shots"
+    for name in ("a/1.png", "b/1.png"):
+        _touch(root / name)
+    # Listings are only reused once the folder has been unchanged for a moment.
+    for folder in (root, root / "a", root / "b"):
+        stat = os.stat(folder)
+        os.utime(folder, ns=(stat.st_atime_ns, stat.st_mtime_ns - 10 * 10**9))
+    manifest_path = tmp_path / "manifest.json"
+
+    first = DiscoveryManifest.load(manifest_path)
+    assert len(list(iter_image_dirs(root, _IMAGES, first))) == 2
+    first.save()
+    _touch(root / "b" / "2.png")
+
+    second = DiscoveryManifest.load(manifest_path)
+    batches = list(iter_image_dirs(root, _IMAGES, second))
+
+    assert [path.name for batch in batches for path in batch] == ["1.png", "1.png", "2.png"]
+    assert (second.listed, second.reused) == (1, 2)
+
+
+def test_in_background_reraises_walk_errors():
+    def walk():
+        yield [Path("a.png")]
+        raise OSError("share went away")
+
+    with pytest.raises(OSError, match="share went away"):
+        list(in_background(walk()))
+
+
+def test_in_background_stops_the_walk_when_the_caller_stops():
+    walked = []
+    stopped = threading.Event()
+
+    def walk():
+        try:
+            for index in range(10_000):
+                walked.append(index)
+                yield [Path(f"{index}.png")]
+        finally:
+            stopped.set()
+
+    waves = in_background(walk())
+    next(waves)
+    waves.close()
+
+    assert stopped.wait(timeout=5)
+    # The bounded queue keeps the walk from running far ahead of the scan.
+    assert len(walked) < 100
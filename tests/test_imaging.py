@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image, ImageDraw
+
+from jp_anki_builder.imaging import (
+    AUTOCROP_MIN_CONFIDENCE,
+    ORIENTATION_MIN_CONFIDENCE,
+    NearDuplicateIndex,
+    changed_box,
+    classify_orientation,
+    detect_text_region,
+    dhash,
+    luma_thumbnail,
+    resolve_roi,
+)
+
+
+def _dialogue_frame(path: Path, line: str, cursor: bool = False) -> Path:
+    image = Image.new("RGB", (320, 180), (30, 30, 60))
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((10, 120, 310, 170), fill=(240, 240, 240))
+    draw.text((20, 130), line, fill=(0, 0, 0))
+    if cursor:
+        draw.rectangle((296, 160, 299, 163), fill=(0, 0, 0))
+    image.save(path)
+    return path
+
+
+def test_dhash_is_stable_for_identical_frames(tmp_path: Path):
+    a = _dialogue_frame(tmp_path / "a.png", "hello there")
+    b = _dialogue_frame(tmp_path / "b.png", "hello there")
+    assert dhash(a) == dhash(b)
+    assert len(bytes.fromhex(dhash(a))) * 8 == 256
+
+
+def test_index_matches_cursor_blink_but_not_new_line(tmp_path: Path):
+    base = _dialogue_frame(tmp_path / "base.png", "hello there")
+    blink = _dialogue_frame(tmp_path / "blink.png", "hello there", cursor=True)
+    new_line = _dialogue_frame(tmp_path / "new.png", "a completely different line of dialogue")
+
+    index = NearDuplicateIndex(max_distance=4)
+    index.add(dhash(base), "base.png")
+
+    assert index.find(dhash(blink)) == "base.png"
+    assert index.find(dhash(new_line)) is None
+
+
+def test_index_grows_past_initial_capacity():
+    index = NearDuplicateIndex(max_distance=0)
+    for value in range(200):
+        index.add(value.to_bytes(32, "big").hex(), f"img{value}")
+    assert index.find((150).to_bytes(32, "big").hex()) == "img150"
+
+
+def _text_box_frame(path: Path) -> Path:
+    image = Image.new("RGB", (640, 360), (30, 30, 60))
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((20, 250, 620, 345), fill=(240, 240, 240))
+    for row in range(3):
+        draw.text((40, 262 + row * 26), "the quick brown fox jumps over the lazy dog " * 2, fill=(0, 0, 0))
+    image.save(path)
+    return path
+
+
+def test_detect_text_region_finds_dialogue_box(tmp_path: Path):
+    region = detect_text_region(_text_box_frame(tmp_path / "frame.png"))
+
+    assert region is not None
+    assert region.confidence >= AUTOCROP_MIN_CONFIDENCE
+    left, top, right, bottom = region.box
+    assert top >= 200 and bottom <= 360
+    assert left < 60 and right > 560
+
+
+def test_detect_text_region_is_unsure_on_noise_and_blank(tmp_path: Path):
+    noise = tmp_path / "noise.png"
+    rng = np.random.default_rng(0)
+    Image.fromarray(rng.integers(0, 255, (360, 640, 3), dtype=np.uint8)).save(noise)
+    blank = tmp_path / "blank.png"
+    Image.new("RGB", (640, 360), (30, 30, 60)).save(blank)
+
+    noisy = detect_text_region(noise)
+    assert noisy is None or noisy.confidence < AUTOCROP_MIN_CONFIDENCE
+    assert detect_text_region(blank) is None
+
+
+def test_resolve_roi_accepts_relative_and_absolute_rectangles():
+    assert resolve_roi([0.05, 0.7, 0.95, 1], 1920, 1080) == (96, 756, 1824, 1080)
+    assert resolve_roi([40, 600, 400, 660], 1920, 1080) == (40, 600, 400, 660)
+    with pytest.raises(ValueError, match="extends past"):
+        resolve_roi([0, 600, 1920, 1200], 1920, 1080)
+    with pytest.raises(ValueError, match="empty"):
+        resolve_roi([0.5, 0.5, 0.5, 0.9], 1920, 1080)
+
+
+def _glyph_lines(vertical: bool, lines: int = 3) -> Image.Image:
+    # Blocks of glyph-sized squares stand in for CJK characters.
+    image = Image.new("L", (400, 400), 255)
+    draw = ImageDraw.Draw(image)
+    for line in range(lines):
+        for glyph in range(10):
+            x, y = 40 + line * 60, 40 + glyph * 30
+            if not vertical:
+                x, y = y, x
+            draw.rectangle((x, y, x + 20, y + 20), fill=0)
+    return image
+
+
+def test_classify_orientation_tells_vertical_from_horizontal_lines():
+    horizontal = classify_orientation(_glyph_lines(vertical=False))
+    vertical = classify_orientation(_glyph_lines(vertical=True))
+
+    assert horizontal is not None and horizontal.direction == "horizontal"
+    assert horizontal.lines == 3
+    assert horizontal.confidence >= ORIENTATION_MIN_CONFIDENCE
+    assert vertical is not None and vertical.direction == "vertical"
+    assert vertical.confidence >= ORIENTATION_MIN_CONFIDENCE
+
+
+def test_classify_orientation_has_no_answer_for_blank_frames():
+    assert classify_orientation(Image.new("L", (400, 400), 255)) is None
+
+
+def test_changed_box_keeps_the_shared_prefix_of_a_growing_line(tmp_path: Path):
+    before = _dialogue_frame(tmp_path / "before.png", "hello there")
+    after = _dialogue_frame(tmp_path / "after.png", "hello there, traveller")
+
+    (a, size), (b, _) = luma_thumbnail(before), luma_thumbnail(after)
+
+    assert size == (320, 180)
+    assert changed_box(a, a, size) is None
+    left, top, right, bottom = changed_box(a, b, size)
+    # The unchanged "hello there" prefix (x 20-86) is read with the rest of the line.
+    assert left <= 20 and right == 320
+    # Only the rows of that line, not the scenery above the dialogue box.
+    assert 110 <= top and bottom <= 170
@@ -17,6 +17,7 @@ from jp_anki_builder.dictionary import (
     WordExistsCache,
     build_offline_dictionary,
 )
+from jp_anki_builder.ocr import OcrError
 
 
 # --- Rate-limit Jisho ---
@@ -129,6 +130,83 @@ def test_scan_resume_skips_completed_images(tmp_path: Path):
     assert len(scan_data2["records"]) == 2
 
 
+
+def test_scan_resumes_from_journal_after_interruption(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    from jp_anki_builder import scan as scan_module
+
+    images_dir = tmp_path / "images"
+    images_dir.mkdir()
+    texts = {"a.png": "冒険", "b.png": "勇者", "c.png": "魔法"}
+    for name in texts:
+        (images_dir / name).write_bytes(b"x")
+    failing = {"c.png"}
+    calls: list[str] = []
+
+    class Provider:
+        def extract_text(self, image_path: Path) -> str:
+            calls.append(image_path.name)
+            if image_path.name in failing:
+                raise OcrError("worker crashed")
+            return texts[image_path.name]
+
+    monkeypatch.setattr(
+        scan_module,
+        "build_ocr_provider",
+        lambda mode, language="jpn", tesseract_cmd=None, preprocess=True, **kwargs: Provider(),
+    )
+    data_dir = tmp_path / "data"
+    args = ["scan", "--images", str(images_dir), "--source", "test", "--run-id", "r1",
+            "--data-dir", str(data_dir), "--ocr-mode", "tesseract", "--no-ocr-cache"]
+
+    assert CliRunner().invoke(app, args).exit_code != 0
+
+    run_dir = data_dir / "test" / "r1"
+    journal = run_dir / "scan.jsonl"
+    assert not (run_dir / "scan.json").exists()
+    lines = journal.read_text(encoding="utf-8").splitlines()
+    assert [Path(json.loads(line)["image"]).name for line in lines] == ["a.png", "b.png"]
+    # A line cut off mid-write is dropped on resume.
+    with journal.open("a", encoding="utf-8") as handle:
+        handle.write('{"image": "')
+
+    failing.clear()
+    calls.clear()
+    result = CliRunner().invoke(app, [*args, "--resume"])
+
+    assert result.exit_code == 0, result.output
+    assert calls == ["c.png"]
+    assert not journal.exists()
+    payload = json.loads((run_dir / "scan.json").read_text(encoding="utf-8"))
+    assert [Path(r["image"]).name for r in payload["records"]] == ["a.png", "b.png", "c.png"]
+    assert payload["candidates"] == ["冒険", "勇者", "魔法"]
+
+
+def test_resumed_journal_survives_a_crash_during_its_first_rewrite(tmp_path: Path,
+                                                                   monkeypatch: pytest.MonkeyPatch):
+    from jp_anki_builder import scan_journal
+    from jp_anki_builder.scan_journal import ScanJournal, read_journal
+
+    path = tmp_path / "scan.jsonl"
+    earlier = [{"image": "a.png"}, {"image": "b.png"}]
+    path.write_text("".join(json.dumps(r) + "\n" for r in earlier) + '{"image": "', encoding="utf-8")
+
+    def crash(source, target):
+        raise OSError("power lost")
+
+    monkeypatch.setattr(scan_journal.os, "replace", crash)
+    journal = ScanJournal(path, read_journal(path))
+    with pytest.raises(OSError):
+        journal.append({"image": "c.png"})
+    assert read_journal(path) == earlier
+
+    monkeypatch.undo()
+    journal = ScanJournal(path, read_journal(path))
+    journal.append({"image": "c.png"})
+    journal.append({"image": "d.png"})
+    journal.close()
+    assert [r["image"] for r in read_journal(path)] == ["a.png", "b.png", "c.png", "d.png"]
+
+
 # --- Dry-run ---
 
 def test_run_dry_run_does_not_create_deck(tmp_path: Path):
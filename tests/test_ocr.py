@@ -1,5 +1,5 @@
 from jp_anki_builder import ocr as ocr_module
-from jp_anki_builder.ocr import OcrCandidate, TesseractOcrProvider, build_ocr_provider
+from jp_anki_builder.ocr import CascadeOcrProvider, OcrCandidate, TesseractOcrProvider, build_ocr_provider
 
 
 def test_ocr_candidate_scoring_prefers_japanese_and_confidence():
@@ -42,3 +42,471 @@ def test_configure_manga_ocr_runtime_sets_default_env(monkeypatch):
     assert ocr_module.os.environ["TRANSFORMERS_VERBOSITY"] == "error"
     assert ocr_module.os.environ["HF_HUB_DISABLE_PROGRESS_BARS"] == "1"
     assert ocr_module.os.environ["TOKENIZERS_PARALLELISM"] == "false"
+
+
+def _fake_sweep(monkeypatch, provider):
+    # Deterministic fake OCR keyed by the sweep job so serial/parallel runs can be compared.
+    def fake_ocr_candidate(pytesseract, image, config, preprocessed, language):
+        psm = config.rsplit(" ", 1)[-1]
+        text = "足が痛い" if psm == "6" else "足" * (len(language) % 3 + 1)
+        return OcrCandidate(
+            text=text,
+            confidence=float(image.size[0] % 97),
+            config=config,
+            preprocessed=preprocessed,
+            language=language,
+        )
+
+    monkeypatch.setattr(provider, "_ocr_candidate", fake_ocr_candidate)
+
+
+def test_tesseract_parallel_sweep_matches_serial(tmp_path, monkeypatch):
+    from PIL import Image
+
+    image_path = tmp_path / "shot.png"
+    Image.new("RGB", (40, 20), "white").save(image_path)
+
+    serial = TesseractOcrProvider(workers=1)
+    parallel = TesseractOcrProvider(workers=4)
+    _fake_sweep(monkeypatch, serial)
+    _fake_sweep(monkeypatch, parallel)
+
+    assert parallel.extract_text_candidates(image_path) == serial.extract_text_candidates(image_path)
+
+
+def test_tesseract_close_shuts_down_the_sweep_pool(tmp_path, monkeypatch):
+    import threading
+
+    from PIL import Image
+
+    from jp_anki_builder.shared import SharedResources
+
+    image_path = tmp_path / "shot.png"
+    Image.new("RGB", (40, 20), "white").save(image_path)
+    before = set(threading.enumerate())
+
+    with TesseractOcrProvider(workers=4) as provider:
+        _fake_sweep(monkeypatch, provider)
+        provider.extract_text_candidates(image_path)
+        assert provider._pool is not None
+    assert provider._pool is None
+    assert set(threading.enumerate()) <= before
+
+    shared = SharedResources()
+    provider = shared.get(("provider",), lambda: TesseractOcrProvider(workers=4))
+    _fake_sweep(monkeypatch, provider)
+    provider.extract_text_candidates(image_path)
+    shared.close()
+    assert provider._pool is None
+
+
+def test_build_ocr_provider_passes_tesseract_workers():
+    provider = build_ocr_provider("tesseract", tesseract_workers=3)
+    assert provider.workers == 3
+
+
+def test_tesseract_tiered_search_stops_after_agreeing_first_tier(tmp_path, monkeypatch):
+    from PIL import Image
+
+    image_path = tmp_path / "shot.png"
+    Image.new("RGB", (40, 20), "white").save(image_path)
+
+    calls: list[tuple[str, str]] = []
+
+    def fake_ocr_candidate(pytesseract, image, config, preprocessed, language):
+        calls.append((config, language))
+        return OcrCandidate(text="冒険に行く", confidence=90.0, config=config,
+                            preprocessed=preprocessed, language=language)
+
+    provider = TesseractOcrProvider(search="tiered")
+    monkeypatch.setattr(provider, "_ocr_candidate", fake_ocr_candidate)
+
+    assert provider.extract_text_candidates(image_path) == ["冒険に行く"]
+    assert provider.last_info == {"calls": 2, "winner": ["--oem 1 --psm 6", "jpn", "orig"], "sweep": "tiered"}
+    assert all(config == "--oem 1 --psm 6" and language == "jpn" for config, language in calls)
+
+
+def test_tesseract_tiered_search_widens_when_candidates_disagree(tmp_path, monkeypatch):
+    from PIL import Image
+
+    image_path = tmp_path / "shot.png"
+    Image.new("RGB", (40, 20), "white").save(image_path)
+
+    def fake_ocr_candidate(pytesseract, image, config, preprocessed, language):
+        text = "冒険に行く" if preprocessed else "冒険"
+        return OcrCandidate(text=text, confidence=90.0, config=config,
+                            preprocessed=preprocessed, language=language)
+
+    tiered = TesseractOcrProvider(search="tiered", min_score=1e9)
+    full = TesseractOcrProvider()
+    monkeypatch.setattr(tiered, "_ocr_candidate", fake_ocr_candidate)
+    monkeypatch.setattr(full, "_ocr_candidate", fake_ocr_candidate)
+
+    assert tiered.extract_text_candidates(image_path) == full.extract_text_candidates(image_path)
+    assert tiered.last_info == {"calls": 30, "winner": full.last_info["winner"], "sweep": "tiered"}
+
+
+def test_tesseract_orientation_runs_only_the_matching_config(tmp_path, monkeypatch):
+    from PIL import Image, ImageDraw
+
+    image_path = tmp_path / "vertical.png"
+    image = Image.new("RGB", (400, 400), "white")
+    draw = ImageDraw.Draw(image)
+    for column in range(3):
+        for glyph in range(10):
+            x, y = 40 + column * 60, 40 + glyph * 30
+            draw.rectangle((x, y, x + 20, y + 20), fill="black")
+    image.save(image_path)
+
+    calls: list[tuple[str, str]] = []
+
+    def fake_ocr_candidate(pytesseract, image, config, preprocessed, language):
+        calls.append((config, language))
+        return OcrCandidate(text="冒険に行く", confidence=90.0, config=config,
+                            preprocessed=preprocessed, language=language)
+
+    provider = build_ocr_provider("tesseract", tesseract_orientation=True)
+    monkeypatch.setattr(provider, "_ocr_candidate", fake_ocr_candidate)
+
+    assert provider.extract_text_candidates(image_path) == ["冒険に行く"]
+    assert provider.last_info["calls"] == 5
+    assert provider.last_info["orientation"]["direction"] == "vertical"
+    assert provider.last_info["orientation"]["pruned"] is True
+    assert set(calls) == {("--oem 1 --psm 5", "jpn+jpn_vert")}
+    assert provider.cache_version().endswith("+orientation")
+
+
+def test_tesseract_learned_combos_restrict_sweep_and_sample_for_drift(tmp_path, monkeypatch):
+    from PIL import Image
+
+    image_path = tmp_path / "shot.png"
+    Image.new("RGB", (40, 20), "white").save(image_path)
+
+    def fake_ocr_candidate(pytesseract, image, config, preprocessed, language):
+        # The font changed: thresholded variants now read better than the original.
+        return OcrCandidate(text="冒険に行く", confidence=90.0 if preprocessed else 50.0, config=config,
+                            preprocessed=preprocessed, language=language)
+
+    provider = build_ocr_provider("tesseract", tesseract_combos=[["--oem 1 --psm 6", "jpn", "orig"]])
+    provider.sample_every = 2
+    monkeypatch.setattr(provider, "_ocr_candidate", fake_ocr_candidate)
+
+    provider.extract_text_candidates(image_path)
+    assert provider.last_info == {"calls": 1, "winner": ["--oem 1 --psm 6", "jpn", "orig"], "sweep": "learned"}
+
+    provider.extract_text_candidates(image_path)
+    assert provider.last_info["calls"] == 30
+    assert provider.last_info["sweep"] == "sample"
+    assert provider.last_info["drift"] is True
+    winner = tuple(provider.last_info["winner"])
+    assert winner[2] != "orig"
+    assert provider.combos == (("--oem 1 --psm 6", "jpn", "orig"), winner)
+
+    provider.extract_text_candidates(image_path)
+    assert provider.last_info["calls"] == 2
+    assert provider.last_info["winner"] == list(winner)
+    learned_version = provider.cache_version()
+    assert "+learned:" in learned_version
+    provider.combos = provider.combos[:1]
+    assert provider.cache_version() != learned_version
+
+
+def test_sweep_stats_learn_only_from_full_sweeps(tmp_path):
+    from jp_anki_builder.sweep_stats import SweepStats
+
+    stats = SweepStats(path=tmp_path / "stats.json")
+    winner = ["--oem 1 --psm 6", "jpn", "orig"]
+    for sweep in (None, "sample", "tiered", "quick", "learned"):
+        info = {"calls": 2, "winner": winner}
+        if sweep is not None:
+            info["sweep"] = sweep
+        stats.record(info)
+
+    assert stats.full_sweeps == 2
+    assert stats.wins == {"--oem 1 --psm 6|jpn|orig": 2}
+    assert stats.sampled == 1
+    assert stats.learned == 1
+
+
+def _cascade(monkeypatch, fast_text: str, confidence: float, **kwargs) -> tuple[CascadeOcrProvider, list[str]]:
+    slow_calls: list[str] = []
+
+    class FakeMangaOcr:
+        def extract_text(self, image_path, region=None):
+            slow_calls.append(image_path.name)
+            return "冒険に行く"
+
+    def fake_ocr_candidate(pytesseract, image, config, preprocessed, language):
+        return OcrCandidate(text=fast_text, confidence=confidence, config=config,
+                            preprocessed=preprocessed, language=language)
+
+    provider = build_ocr_provider("cascade", tesseract_min_score=40.0, **kwargs)
+    provider.slow = FakeMangaOcr()
+    monkeypatch.setattr(provider.fast, "_ocr_candidate", fake_ocr_candidate)
+    return provider, slow_calls
+
+
+def test_cascade_keeps_confident_fast_pass(tmp_path, monkeypatch):
+    from PIL import Image
+
+    image_path = tmp_path / "shot.png"
+    Image.new("RGB", (40, 20), "white").save(image_path)
+    provider, slow_calls = _cascade(monkeypatch, "冒険に行く", 90.0)
+
+    assert provider.extract_text_candidates(image_path) == ["冒険に行く"]
+    assert slow_calls == []
+    assert provider.fast.search == "quick"
+    assert provider.last_info["calls"] == 2
+    assert provider.last_info["escalated"] is False
+    assert provider.last_info["fast_text"] == "冒険に行く"
+
+
+def test_cascade_escalates_on_low_score_or_unknown_words(tmp_path, monkeypatch):
+    from PIL import Image
+
+    image_path = tmp_path / "shot.png"
+    Image.new("RGB", (40, 20), "white").save(image_path)
+
+    noisy, slow_calls = _cascade(monkeypatch, "?l", 10.0)
+    assert noisy.extract_text_candidates(image_path) == ["冒険に行く"]
+    assert slow_calls == ["shot.png"]
+    assert noisy.last_info["fast_text"] == "?l"
+    assert noisy.last_info["escalated"] is True
+
+    unknown, slow_calls = _cascade(monkeypatch, "冒険に行く", 90.0, cascade_min_known=0.8)
+    unknown.known_ratio = lambda text: 0.5
+    assert unknown.extract_text(image_path) == "冒険に行く"
+    assert slow_calls == ["shot.png"]
+    assert unknown.last_info["known_ratio"] == 0.5
+    assert unknown.last_info["escalated"] is True
+
+
+def test_tesseract_rejects_unknown_search_mode():
+    import pytest
+
+    with pytest.raises(ValueError, match="unsupported tesseract search mode"):
+        TesseractOcrProvider(search="greedy")
+
+
+def _fake_words(psm, language, image):
+    if psm == 6:
+        return [("足", 80.0 + image.size[0] % 7), ("が", 75.0), ("痛い", 70.0)]
+    return [("足", float(len(language))), ("", -1.0)]
+
+
+class _FakeTessApi:
+    created: list[tuple[str, int]] = []
+
+    def __init__(self, lang, oem):
+        self.lang = lang
+        self.psm = None
+        self.image = None
+        _FakeTessApi.created.append((lang, oem))
+
+    def SetPageSegMode(self, psm):
+        self.psm = psm
+
+    def SetImage(self, image):
+        self.image = image
+
+    def MapWordConfidences(self):
+        return _fake_words(self.psm, self.lang, self.image)
+
+
+def _install_fake_tesserocr(monkeypatch):
+    import sys
+    import types
+
+    _FakeTessApi.created = []
+    module = types.SimpleNamespace(PyTessBaseAPI=_FakeTessApi, tesseract_version=lambda: "tesseract 5.3.0")
+    monkeypatch.setitem(sys.modules, "tesserocr", module)
+    return module
+
+
+def test_tesseract_api_matches_cli_ranking_and_reuses_engines(tmp_path, monkeypatch):
+    import pytesseract
+    from PIL import Image
+
+    _install_fake_tesserocr(monkeypatch)
+
+    def fake_image_to_data(image, lang, config, output_type):
+        words = _fake_words(int(config.rsplit(" ", 1)[-1]), lang, image)
+        return {"text": [word for word, _ in words], "conf": [str(conf) for _, conf in words]}
+
+    monkeypatch.setattr(pytesseract, "image_to_data", fake_image_to_data)
+
+    paths = []
+    for index in range(3):
+        path = tmp_path / f"shot{index}.png"
+        Image.new("RGB", (40 + index, 20), "white").save(path)
+        paths.append(path)
+
+    cli = build_ocr_provider("tesseract")
+    api = build_ocr_provider("tesseract-api")
+
+    for path in paths:
+        assert api.extract_text_candidates(path) == cli.extract_text_candidates(path)
+    # One engine per language for the single thread, reused across all images.
+    assert sorted(_FakeTessApi.created) == [("jpn", 1), ("jpn+jpn_vert", 1)]
+    assert api.cache_version() == "tesseract/tesseract 5.3.0/full"
+
+
+def test_tesseract_api_keeps_one_engine_per_worker_thread(tmp_path, monkeypatch):
+    from PIL import Image
+
+    _install_fake_tesserocr(monkeypatch)
+    api = build_ocr_provider("tesseract-api", tesseract_workers=2)
+    for index in range(4):
+        path = tmp_path / f"shot{index}.png"
+        Image.new("RGB", (40, 20), "white").save(path)
+        api.extract_text_candidates(path)
+
+    # At most one engine per (thread, language): not one per call or per image.
+    assert len(_FakeTessApi.created) <= 2 * 2
+
+
+def test_tesseract_api_without_tesserocr_explains_install(tmp_path, monkeypatch):
+    import sys
+
+    import pytest
+    from PIL import Image
+
+    monkeypatch.setitem(sys.modules, "tesserocr", None)
+    image_path = tmp_path / "shot.png"
+    Image.new("RGB", (40, 20), "white").save(image_path)
+
+    with pytest.raises(ocr_module.OcrError, match="tesserocr"):
+        build_ocr_provider("tesseract-api").extract_text_candidates(image_path)
+
+
+class _FakeTensor(list):
+    def to(self, device):
+        return self
+
+
+class _FakeMangaEngine:
+    """Stands in for MangaOcr: batched processor/model/tokenizer plus per-image __call__."""
+
+    def __init__(self):
+        self.batch_sizes: list[int] = []
+        self.model = self
+        self.device = "cpu"
+        self.processor = self._process
+        self.tokenizer = self
+
+    def __call__(self, path):
+        from PIL import Image
+
+        with Image.open(path) as image:
+            return f"幅 {image.size[0]}"
+
+    def _process(self, images, return_tensors="pt"):
+        class Output:
+            pixel_values = _FakeTensor(image.size[0] for image in images)
+
+        return Output()
+
+    def generate(self, pixel_values, **kwargs):
+        self.batch_sizes.append(len(pixel_values))
+        return list(pixel_values)
+
+    def batch_decode(self, token_ids, skip_special_tokens=True):
+        return [f"幅 {width}" for width in token_ids]
+
+
+def test_manga_ocr_batch_returns_results_in_input_order(tmp_path, monkeypatch):
+    from PIL import Image
+
+    from jp_anki_builder.ocr import MangaOcrProvider
+
+    paths = []
+    for width in (11, 12, 13, 14, 15):
+        path = tmp_path / f"shot{width}.png"
+        Image.new("RGB", (width, 8), "white").save(path)
+        paths.append(path)
+
+    engine = _FakeMangaEngine()
+    monkeypatch.setattr(MangaOcrProvider, "_engine", engine)
+
+    texts = MangaOcrProvider().extract_text_batch(paths, batch_size=2)
+
+    assert texts == ["幅11", "幅12", "幅13", "幅14", "幅15"]
+    # The trailing single image takes the per-image path.
+    assert engine.batch_sizes == [2, 2]
+
+
+def test_preprocessed_variants_match_point_thresholds_and_release_buffers():
+    import numpy as np
+    from PIL import Image, ImageDraw
+
+    from jp_anki_builder.ocr import PreprocessedVariants
+
+    image = Image.new("RGB", (120, 40), (40, 90, 200))
+    ImageDraw.Draw(image).text((5, 10), "hello", fill=(250, 250, 250))
+    up2 = image.convert("L").resize((240, 80))
+
+    variants = PreprocessedVariants(image)
+    variants.schedule(variants.names)
+    for name, threshold in (("up2_thr140", 140), ("up2_thr160", 160), ("up2_thr180", 180)):
+        expected = up2.point(lambda p, t=threshold: 255 if p > t else 0)
+        assert np.array_equal(np.asarray(variants.acquire(name)), np.asarray(expected))
+        variants.release(name)
+    assert variants.acquire("orig") is image
+    variants.release("orig")
+    assert set(np.unique(np.asarray(variants.acquire("up2_otsu")))) <= {0, 255}
+    variants.release("up2_otsu")
+
+    assert variants._built == {}
+    assert variants._up2 is None
+
+
+def test_otsu_threshold_splits_bimodal_histogram():
+    import numpy as np
+
+    from jp_anki_builder.imaging import otsu_threshold
+
+    histogram = np.zeros(256, dtype=np.int64)
+    histogram[30] = 500
+    histogram[220] = 500
+    assert 30 <= otsu_threshold(histogram) < 220
+
+
+def test_sidecar_manifest_matches_paths_names_and_hashes(tmp_path):
+    import json
+
+    from jp_anki_builder.ocr_cache import content_hash
+
+    images = tmp_path / "shots"
+    images.mkdir()
+    for name in ("001.png", "002.png", "003.png", "004.png"):
+        (images / name).write_bytes(name.encode())
+    (images / "004.txt").write_text("per-file text", encoding="utf-8")
+    manifest = tmp_path / "hook.jsonl"
+    lines = [
+        {"image": "shots/001.png", "text": "冒険に行く"},
+        {"image": "002.png", "text": "勇者"},
+        {"hash": content_hash(images / "003.png"), "text": "魔法"},
+    ]
+    manifest.write_text("\n".join(json.dumps(line, ensure_ascii=False) for line in lines) + "\n", encoding="utf-8")
+
+    provider = build_ocr_provider("sidecar", sidecar_manifest=str(manifest))
+
+    assert [provider.extract_text(images / name) for name in ("001.png", "002.png", "003.png", "004.png")] == [
+        "冒険に行く", "勇者", "魔法", "per-file text",
+    ]
+
+
+def test_sidecar_tsv_manifest_unescapes_text_and_reports_bad_lines(tmp_path):
+    import pytest
+
+    from jp_anki_builder.ocr import OcrError, SidecarOcrProvider
+
+    image = tmp_path / "001.png"
+    image.write_bytes(b"x")
+    manifest = tmp_path / "hook.tsv"
+    manifest.write_text("image\ttext\n001.png\t一行目\\n二行目\n", encoding="utf-8")
+    assert SidecarOcrProvider(manifest=manifest).extract_text(image) == "一行目\n二行目"
+
+    manifest.write_text("001.png without a tab\n", encoding="utf-8")
+    with pytest.raises(OcrError, match="hook.tsv:1"):
+        SidecarOcrProvider(manifest=manifest).extract_text(image)
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from jp_anki_builder.cli import app
+from jp_anki_builder.ocr_cache import OcrResultCache, cache_key, content_hash, ocr_cache_path
+
+
+def test_cache_round_trip_and_key_includes_settings(tmp_path: Path):
+    image = tmp_path / "a.png"
+    image.write_bytes(b"pixels")
+    digest = content_hash(image)
+
+    cache = OcrResultCache(tmp_path / "cache.db")
+    key = cache_key(digest, "tesseract", "jpn", True, "tesseract/5.3/full")
+    cache.put(key, ["冒険", "冒検"])
+
+    assert cache.get(key) == ["冒険", "冒検"]
+    assert cache.get(cache_key(digest, "tesseract", "jpn", False, "tesseract/5.3/full")) is None
+    cache.close()
+
+    # Persisted across instances.
+    assert OcrResultCache(tmp_path / "cache.db").get(key) == ["冒険", "冒検"]
+
+
+def test_cache_evicts_least_recently_used(tmp_path: Path):
+    cache = OcrResultCache(tmp_path / "cache.db", max_bytes=10_000)
+    cache.put("a", ["x" * 3000])
+    cache.put("b", ["y" * 3000])
+    cache.put("c", ["z" * 3000])
+    cache.get("a")  # refresh a, so b is now the oldest
+    cache.put("d", ["w" * 3000])
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("d") is not None
+    assert cache.stats().total_bytes <= 10_000
+
+
+def test_cache_prune_all(tmp_path: Path):
+    cache = OcrResultCache(tmp_path / "cache.db")
+    cache.put("a", ["冒険"])
+    cache.put("b", ["勇者"])
+
+    assert cache.prune(0) == 2
+    assert cache.stats().entry_count == 0
+
+
+def test_rescan_reuses_cached_ocr_across_runs(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    from jp_anki_builder import scan as scan_module
+
+    images_dir = tmp_path / "images"
+    images_dir.mkdir()
+    (images_dir / "a.png").write_bytes(b"frame-a")
+    (images_dir / "b.png").write_bytes(b"frame-b")
+
+    ocr_calls: list[str] = []
+
+    class CountingProvider:
+        def cache_version(self) -> str:
+            return "fake/1"
+
+        def extract_text_candidates(self, image_path: Path, top_n: int = 8) -> list[str]:
+            ocr_calls.append(image_path.name)
+            return ["冒険"]
+
+    monkeypatch.setattr(
+        scan_module,
+        "build_ocr_provider",
+        lambda mode, language="jpn", tesseract_cmd=None, preprocess=True, **kwargs: CountingProvider(),
+    )
+    data_dir = tmp_path / "data"
+
+    def scan(run_id: str):
+        return CliRunner().invoke(
+            app,
+            [
+                "scan",
+                "--images", str(images_dir),
+                "--source", "manga-a",
+                "--run-id", run_id,
+                "--data-dir", str(data_dir),
+                "--ocr-mode", "tesseract",
+            ],
+        )
+
+    first = scan("r1")
+    assert first.exit_code == 0
+    assert ocr_calls == ["a.png", "b.png"]
+
+    # A renamed file with identical content is still a hit.
+    (images_dir / "b.png").rename(images_dir / "c.png")
+    second = scan("r2")
+    assert second.exit_code == 0
+    assert ocr_calls == ["a.png", "b.png"]
+    assert "OCR cache: 2 hit(s), 0 miss(es)" in second.output
+    payload = json.loads((data_dir / "manga-a" / "r2" / "scan.json").read_text(encoding="utf-8"))
+    assert [r["text"] for r in payload["records"]] == ["冒険", "冒険"]
+    assert ocr_cache_path(str(data_dir)).exists()
+
+
+def test_scan_stops_caching_once_the_learned_sweep_drifts(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    from jp_anki_builder import scan as scan_module
+
+    images_dir = tmp_path / "images"
+    images_dir.mkdir()
+    for name in ("a.png", "b.png", "c.png"):
+        (images_dir / name).write_bytes(f"frame-{name}".encode())
+    ocr_calls: list[str] = []
+
+    class DriftingProvider:
+        """Learned sweep whose drift sample on b.png widens its combos."""
+
+        last_info: dict = {}
+
+        def cache_version(self) -> str:
+            return "fake/learned"
+
+        def extract_text_candidates(self, image_path: Path, top_n: int = 8) -> list[str]:
+            ocr_calls.append(image_path.name)
+            self.last_info = {"sweep": "sample", "drift": True} if image_path.name == "b.png" else {}
+            return ["冒険"]
+
+    monkeypatch.setattr(
+        scan_module,
+        "build_ocr_provider",
+        lambda mode, language="jpn", tesseract_cmd=None, preprocess=True, **kwargs: DriftingProvider(),
+    )
+    data_dir = tmp_path / "data"
+
+    def scan(run_id: str):
+        return CliRunner().invoke(
+            app,
+            [
+                "scan", "--images", str(images_dir), "--source", "manga-a", "--run-id", run_id,
+                "--data-dir", str(data_dir), "--ocr-mode", "tesseract",
+            ],
+        )
+
+    assert scan("r1").exit_code == 0
+    ocr_calls.clear()
+    second = scan("r2")
+
+    assert second.exit_code == 0
+    # Only a.png was read with the combos the cache version names.
+    assert ocr_calls == ["b.png", "c.png"]
+    assert "OCR cache: 1 hit(s), 2 miss(es)" in second.output
+
+
+def test_cache_cli_stats_and_prune(tmp_path: Path):
+    cache = OcrResultCache(ocr_cache_path(str(tmp_path)))
+    cache.put("a", ["冒険"])
+    cache.close()
+
+    stats = CliRunner().invoke(app, ["cache", "stats", "--data-dir", str(tmp_path)])
+    assert stats.exit_code == 0
+    assert "1 cached image result(s)" in stats.output
+
+    pruned = CliRunner().invoke(app, ["cache", "prune", "--all", "--data-dir", str(tmp_path)])
+    assert pruned.exit_code == 0
+    assert "Removed 1 cached image result(s)." in pruned.output
@@ -0,0 +1,114 @@
+import json
+import sys
+import types
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from jp_anki_builder.ocr import OcrError, build_ocr_provider
+from jp_anki_builder.onnx_ocr import OnnxMangaOcrProvider, onnx_model_dir
+
+# Token ids: 0 [PAD], 1 [UNK], 2 [CLS] (decoder start), 3 [SEP] (eos).
+_VOCAB = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "冒", "険", "足", "##る"]
+# Bright images decode to 冒険, dark ones to 足る.
+_TARGETS = {True: [4, 5, 3], False: [6, 7, 3]}
+
+
+class _FakeSession:
+    def __init__(self, path, sess_options=None, providers=None):
+        self.kind = Path(path).stem
+        self.options = sess_options
+
+    def run(self, output_names, feeds):
+        if self.kind == "encoder":
+            pixel_values = feeds["pixel_values"]
+            return [pixel_values.mean(axis=(1, 2, 3)).reshape(-1, 1, 1).astype(np.float32)]
+        input_ids = feeds["input_ids"]
+        bright = feeds["encoder_hidden_states"].reshape(-1) > 0
+        step = input_ids.shape[1] - 1
+        logits = np.zeros((len(input_ids), input_ids.shape[1], len(_VOCAB)), dtype=np.float32)
+        for row, is_bright in enumerate(bright):
+            target = _TARGETS[bool(is_bright)]
+            logits[row, -1, target[min(step, len(target) - 1)]] = 1.0
+        return [logits]
+
+
+def _install_fake_onnxruntime(monkeypatch):
+    created: list[_FakeSession] = []
+
+    class SessionOptions:
+        intra_op_num_threads = 0
+        graph_optimization_level = None
+
+    def inference_session(path, sess_options=None, providers=None):
+        session = _FakeSession(path, sess_options, providers)
+        created.append(session)
+        return session
+
+    module = types.SimpleNamespace(
+        SessionOptions=SessionOptions,
+        InferenceSession=inference_session,
+        GraphOptimizationLevel=types.SimpleNamespace(ORT_ENABLE_ALL="all"),
+    )
+    monkeypatch.setitem(sys.modules, "onnxruntime", module)
+    return created
+
+
+def _write_model(base_dir: Path) -> Path:
+    model_dir = onnx_model_dir(str(base_dir))
+    model_dir.mkdir(parents=True)
+    (model_dir / "encoder.onnx").write_bytes(b"")
+    (model_dir / "decoder.onnx").write_bytes(b"")
+    (model_dir / "vocab.txt").write_text("\n".join(_VOCAB) + "\n", encoding="utf-8")
+    meta = {
+        "manga_ocr_version": "0.1.14",
+        "quantized": True,
+        "exported_at": 1,
+        "image_size": [8, 8],
+        "image_mean": [0.5, 0.5, 0.5],
+        "image_std": [0.5, 0.5, 0.5],
+        "rescale_factor": 1 / 255,
+        "decoder_start_token_id": 2,
+        "eos_token_id": 3,
+        "pad_token_id": 0,
+        "special_token_ids": [0, 1, 2, 3],
+    }
+    (model_dir / "model.json").write_text(json.dumps(meta), encoding="utf-8")
+    return model_dir
+
+
+def test_onnx_provider_greedy_decodes_batches_in_order(tmp_path, monkeypatch):
+    created = _install_fake_onnxruntime(monkeypatch)
+    _write_model(tmp_path / "data")
+    paths = []
+    for index, shade in enumerate(("white", "black", "white")):
+        path = tmp_path / f"{index}.png"
+        Image.new("RGB", (20, 10), shade).save(path)
+        paths.append(path)
+
+    provider = build_ocr_provider("onnx-manga-ocr", onnx_threads=3, base_dir=str(tmp_path / "data"))
+
+    assert provider.extract_text_batch(paths, batch_size=2) == ["冒険", "足る", "冒険"]
+    assert provider.extract_text(paths[1]) == "足る"
+    assert [session.kind for session in created] == ["encoder", "decoder"]
+    assert created[0].options.intra_op_num_threads == 3
+    assert provider.cache_version() == "onnx-manga-ocr/0.1.14/int8/1"
+
+
+def test_onnx_provider_without_exported_model_explains_export(tmp_path, monkeypatch):
+    _install_fake_onnxruntime(monkeypatch)
+    provider = OnnxMangaOcrProvider(model_dir=tmp_path / "missing")
+
+    with pytest.raises(OcrError, match="export-onnx-model"):
+        provider.warm_up()
+    assert provider.cache_version() == "onnx-manga-ocr/unknown"
+
+
+def test_onnx_provider_without_onnxruntime_explains_install(tmp_path, monkeypatch):
+    monkeypatch.setitem(sys.modules, "onnxruntime", None)
+    provider = OnnxMangaOcrProvider(model_dir=_write_model(tmp_path / "data"))
+
+    with pytest.raises(OcrError, match="onnxruntime"):
+        provider.warm_up()
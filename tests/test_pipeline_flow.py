@@ -7,7 +7,7 @@ def test_run_executes_stages_in_order(monkeypatch):
     monkeypatch.setattr(
         p,
         "scan",
-        lambda images, source, run_id, ocr_mode="sidecar", ocr_language="jpn", tesseract_cmd=None, preprocess=True, online_dict="off", resume=False: {
+        lambda images, source, run_id, ocr_mode="sidecar", ocr_language="jpn", tesseract_cmd=None, preprocess=True, online_dict="off", resume=False, **kwargs: {
             "stage": "scan",
             "image_count": 1,
         },
@@ -3,6 +3,7 @@ from __future__ import annotations
 import json
 from pathlib import Path
 
+import pytest
 from typer.testing import CliRunner
 
 from jp_anki_builder.cli import app
@@ -162,3 +163,45 @@ def test_review_reports_skipped_words_by_reason_in_cli_output(tmp_path: Path):
     assert "[WARN] Known (1): 勇者" in result.stdout
     assert "[WARN] Particle (1): は" in result.stdout
     assert "[WARN] Already seen (1): 冒険" in result.stdout
+
+
+@pytest.mark.parametrize(
+    ("keep_run_approved", "approved", "excluded_seen"),
+    [
+        # watch --rebuild: the run's own earlier words are not "already seen".
+        (True, ["冒険", "魔法"], ["勇者"]),
+        # A plain re-review still treats every word in seen_words as seen.
+        (False, ["魔法"], ["冒険", "勇者"]),
+    ],
+)
+def test_review_again_keeps_the_run_approved_words_only_for_watch(
+    tmp_path: Path, keep_run_approved: bool, approved: list[str], excluded_seen: list[str]
+):
+    from jp_anki_builder.pipeline import Pipeline
+
+    data_dir = tmp_path / "data"
+    run_dir = data_dir / "manga-a" / "run-again"
+    run_dir.mkdir(parents=True)
+    (data_dir / "manga-a" / "seen_words.json").write_text(
+        json.dumps({"seen_words": ["勇者"]}, ensure_ascii=False), encoding="utf-8"
+    )
+
+    def write_scan(candidates: list[str]) -> None:
+        (run_dir / "scan.json").write_text(
+            json.dumps({"source": "manga-a", "run_id": "run-again", "candidates": candidates}, ensure_ascii=False),
+            encoding="utf-8",
+        )
+
+    write_scan(["冒険", "勇者"])
+    review_args = ["review", "--source", "manga-a", "--run-id", "run-again", "--data-dir", str(data_dir)]
+    assert CliRunner().invoke(app, review_args).exit_code == 0
+    # More screenshots arrived and the run is reviewed again.
+    write_scan(["冒険", "勇者", "魔法"])
+    if keep_run_approved:
+        Pipeline(data_dir=str(data_dir)).review(source="manga-a", run_id="run-again", keep_run_approved=True)
+    else:
+        assert CliRunner().invoke(app, review_args).exit_code == 0
+
+    payload = json.loads((run_dir / "review.json").read_text(encoding="utf-8"))
+    assert payload["approved_candidates"] == approved
+    assert payload["excluded_seen"] == excluded_seen
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import json
+import os
 from pathlib import Path
 
 import pytest
@@ -135,7 +136,7 @@ def test_scan_surfaces_ocr_errors(tmp_path: Path, monkeypatch: pytest.MonkeyPatc
     monkeypatch.setattr(
         scan_module,
         "build_ocr_provider",
-        lambda mode, language="jpn", tesseract_cmd=None, preprocess=True: BrokenProvider(),
+        lambda mode, language="jpn", tesseract_cmd=None, preprocess=True, **kwargs: BrokenProvider(),
     )
 
     result = CliRunner().invoke(
@@ -150,6 +151,8 @@ def test_scan_surfaces_ocr_errors(tmp_path: Path, monkeypatch: pytest.MonkeyPatc
             "manga-a-ch03",
             "--ocr-mode",
             "tesseract",
+            "--data-dir",
+            str(tmp_path / "data"),
         ],
     )
 
@@ -157,6 +160,42 @@ def test_scan_surfaces_ocr_errors(tmp_path: Path, monkeypatch: pytest.MonkeyPatc
     assert "tesseract executable not found" in result.output
 
 
+def test_scan_failing_ocr_leaves_no_journal(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    from jp_anki_builder import scan as scan_module
+
+    images_dir = tmp_path / "images"
+    images_dir.mkdir()
+    (images_dir / "panel1.png").write_bytes(b"fake")
+    closed = []
+
+    class BrokenProvider:
+        def extract_text(self, image_path: Path) -> str:
+            raise OcrError("tesseract executable not found")
+
+        def close(self) -> None:
+            closed.append(True)
+
+    monkeypatch.setattr(
+        scan_module,
+        "build_ocr_provider",
+        lambda mode, language="jpn", tesseract_cmd=None, preprocess=True, **kwargs: BrokenProvider(),
+    )
+
+    result = CliRunner().invoke(
+        app,
+        [
+            "scan", "--images", str(images_dir), "--source", "manga-a", "--run-id", "manga-a-ch03",
+            "--ocr-mode", "tesseract", "--data-dir", str(tmp_path / "data"),
+        ],
+    )
+
+    assert result.exit_code != 0
+    run_dir = tmp_path / "data" / "manga-a" / "manga-a-ch03"
+    assert not (run_dir / "scan.jsonl").exists()
+    assert not (run_dir / "scan.json").exists()
+    assert closed
+
+
 def test_scan_adds_compound_candidates_from_offline_dictionary(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
     from jp_anki_builder import scan as scan_module
 
@@ -392,7 +431,7 @@ def test_scan_uses_alternate_text_candidates_and_dedupes(tmp_path: Path, monkeyp
     monkeypatch.setattr(
         scan_module,
         "build_ocr_provider",
-        lambda mode, language="jpn", tesseract_cmd=None, preprocess=True: FakeProvider(),
+        lambda mode, language="jpn", tesseract_cmd=None, preprocess=True, **kwargs: FakeProvider(),
     )
 
     data_dir = tmp_path / "data"
@@ -449,3 +488,864 @@ def test_scan_rejects_invalid_online_dict_value(tmp_path: Path):
 
     assert result.exit_code != 0
     assert "unsupported online dictionary mode" in result.output
+
+
+def test_scan_records_provider_call_counts(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    from jp_anki_builder import scan as scan_module
+
+    images_dir = tmp_path / "images"
+    images_dir.mkdir()
+    (images_dir / "panel1.png").write_bytes(b"fake")
+    (images_dir / "panel2.png").write_bytes(b"fake")
+
+    class CountingProvider:
+        last_info: dict = {}
+
+        def extract_text_candidates(self, image_path: Path, top_n: int = 8) -> list[str]:
+            self.last_info = {"calls": 2 if image_path.name == "panel1.png" else 6}
+            return ["冒険"]
+
+    monkeypatch.setattr(
+        scan_module,
+        "build_ocr_provider",
+        lambda mode, language="jpn", tesseract_cmd=None, preprocess=True, **kwargs: CountingProvider(),
+    )
+
+    data_dir = tmp_path / "data"
+    result = CliRunner().invoke(
+        app,
+        [
+            "scan",
+            "--images", str(images_dir),
+            "--source", "manga-a",
+            "--run-id", "calls-1",
+            "--data-dir", str(data_dir),
+            "--ocr-mode", "tesseract",
+            "--tesseract-search", "tiered",
+        ],
+    )
+
+    assert result.exit_code == 0
+    assert "OCR calls: 8 (4.0 per image)" in result.output
+    payload = json.loads((data_dir / "manga-a" / "calls-1" / "scan.json").read_text(encoding="utf-8"))
+    assert [r["ocr_info"]["calls"] for r in payload["records"]] == [2, 6]
+
+
+def test_scan_uses_batch_api_when_provider_supports_it(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    from jp_anki_builder import scan as scan_module
+
+    images_dir = tmp_path / "images"
+    images_dir.mkdir()
+    for name in ("a", "b", "c"):
+        (images_dir / f"{name}.png").write_bytes(b"fake")
+
+    batches: list[list[str]] = []
+
+    class BatchProvider:
+        def extract_text(self, image_path: Path) -> str:
+            raise AssertionError("per-image OCR should not be used")
+
+        def extract_text_batch(self, image_paths: list[Path], batch_size: int = 8) -> list[str]:
+            batches.append([p.name for p in image_paths])
+            return [{"a.png": "冒険", "b.png": "勇者", "c.png": "魔法"}[p.name] for p in image_paths]
+
+    monkeypatch.setattr(
+        scan_module,
+        "build_ocr_provider",
+        lambda mode, language="jpn", tesseract_cmd=None, preprocess=True, **kwargs: BatchProvider(),
+    )
+
+    data_dir = tmp_path / "data"
+    result = CliRunner().invoke(
+        app,
+        [
+            "scan",
+            "--images", str(images_dir),
+            "--source", "manga-a",
+            "--run-id", "batch-1",
+            "--data-dir", str(data_dir),
+            "--ocr-mode", "manga-ocr",
+            "--ocr-batch-size", "2",
+        ],
+    )
+
+    assert result.exit_code == 0
+    assert batches == [["a.png", "b.png"], ["c.png"]]
+    payload = json.loads((data_dir / "manga-a" / "batch-1" / "scan.json").read_text(encoding="utf-8"))
+    assert [r["text"] for r in payload["records"]] == ["冒険", "勇者", "魔法"]
+
+
+def test_scan_reuses_ocr_for_near_duplicate_frames(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    from PIL import Image, ImageDraw
+
+    from jp_anki_builder import scan as scan_module
+
+    images_dir = tmp_path / "images"
+    images_dir.mkdir()
+    for name, line in (("001", "first line"), ("002", "first line"), ("003", "something else entirely!")):
+        image = Image.new("RGB", (320, 180), (30, 30, 60))
+        draw = ImageDraw.Draw(image)
+        draw.rectangle((10, 120, 310, 170), fill=(240, 240, 240))
+        draw.text((20, 130), line, fill=(0, 0, 0))
+        image.save(images_dir / f"{name}.png")
+
+    ocr_calls: list[str] = []
+
+    class RecordingProvider:
+        def extract_text_candidates(self, image_path: Path, top_n: int = 8) -> list[str]:
+            ocr_calls.append(image_path.name)
+            return ["冒険" if image_path.name == "001.png" else "勇者"]
+
+    monkeypatch.setattr(
+        scan_module,
+        "build_ocr_provider",
+        lambda mode, language="jpn", tesseract_cmd=None, preprocess=True, **kwargs: RecordingProvider(),
+    )
+
+    data_dir = tmp_path / "data"
+    result = CliRunner().invoke(
+        app,
+        [
+            "scan",
+            "--images", str(images_dir),
+            "--source", "game-a",
+            "--run-id", "dup-1",
+            "--data-dir", str(data_dir),
+            "--ocr-mode", "tesseract",
+            "--dedup-distance", "4",
+        ],
+    )
+
+    assert result.exit_code == 0
+    assert ocr_calls == ["001.png", "003.png"]
+    assert "OCR calls avoided: 1" in result.output
+    payload = json.loads((data_dir / "game-a" / "dup-1" / "scan.json").read_text(encoding="utf-8"))
+    records = payload["records"]
+    assert [Path(r["image"]).name for r in records] == ["001.png", "002.png", "003.png"]
+    assert records[1]["duplicate_of"] == records[0]["image"]
+    assert records[1]["text"] == "冒険"
+    assert "duplicate_of" not in records[2]
+
+
+def test_scan_warms_up_provider_in_background_and_reports_first_result(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    import threading
+
+    from jp_anki_builder import scan as scan_module
+
+    images_dir = tmp_path / "images"
+    images_dir.mkdir()
+    (images_dir / "001.png").write_bytes(b"fake")
+
+    warm_threads: list[str] = []
+    loaded = threading.Event()
+
+    class WarmingProvider:
+        def warm_up(self) -> None:
+            warm_threads.append(threading.current_thread().name)
+            loaded.set()
+
+        def extract_text_candidates(self, image_path: Path, top_n: int = 8) -> list[str]:
+            assert loaded.is_set()
+            return ["冒険"]
+
+    monkeypatch.setattr(
+        scan_module,
+        "build_ocr_provider",
+        lambda mode, language="jpn", tesseract_cmd=None, preprocess=True, **kwargs: WarmingProvider(),
+    )
+
+    result = CliRunner().invoke(
+        app,
+        [
+            "scan",
+            "--images", str(images_dir),
+            "--source", "game-a",
+            "--run-id", "warm-1",
+            "--data-dir", str(tmp_path / "data"),
+            "--ocr-mode", "tesseract",
+        ],
+    )
+
+    assert result.exit_code == 0
+    assert warm_threads == ["warmup-ocr"]
+    assert "Time to first result:" in result.output
+
+
+def test_scan_warmup_failure_falls_back_to_lazy_load(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    from jp_anki_builder import scan as scan_module
+
+    images_dir = tmp_path / "images"
+    images_dir.mkdir()
+    (images_dir / "001.png").write_bytes(b"fake")
+
+    class BrokenProvider:
+        def warm_up(self) -> None:
+            raise OcrError("model missing")
+
+        def extract_text_candidates(self, image_path: Path, top_n: int = 8) -> list[str]:
+            raise OcrError("model missing")
+
+    monkeypatch.setattr(
+        scan_module,
+        "build_ocr_provider",
+        lambda mode, language="jpn", tesseract_cmd=None, preprocess=True, **kwargs: BrokenProvider(),
+    )
+
+    result = CliRunner().invoke(
+        app,
+        [
+            "scan",
+            "--images", str(images_dir),
+            "--source", "game-a",
+            "--run-id", "warm-2",
+            "--data-dir", str(tmp_path / "data"),
+            "--ocr-mode", "tesseract",
+        ],
+    )
+
+    assert result.exit_code != 0
+    assert "model missing" in result.output
+
+
+def test_scan_autocrop_passes_region_and_records_crop_box(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    from PIL import Image, ImageDraw
+
+    from jp_anki_builder import scan as scan_module
+
+    images_dir = tmp_path / "images"
+    images_dir.mkdir()
+    frame = Image.new("RGB", (640, 360), (30, 30, 60))
+    draw = ImageDraw.Draw(frame)
+    draw.rectangle((20, 250, 620, 345), fill=(240, 240, 240))
+    for row in range(3):
+        draw.text((40, 262 + row * 26), "the quick brown fox jumps over the lazy dog " * 2, fill=(0, 0, 0))
+    frame.save(images_dir / "001.png")
+    Image.new("RGB", (640, 360), (30, 30, 60)).save(images_dir / "002.png")
+
+    seen_regions: dict[str, tuple | None] = {}
+
+    class RegionProvider:
+        def extract_text_candidates(self, image_path: Path, top_n: int = 8, region=None) -> list[str]:
+            seen_regions[image_path.name] = region
+            return ["冒険"]
+
+    monkeypatch.setattr(
+        scan_module,
+        "build_ocr_provider",
+        lambda mode, language="jpn", tesseract_cmd=None, preprocess=True, **kwargs: RegionProvider(),
+    )
+
+    result = CliRunner().invoke(
+        app,
+        [
+            "scan",
+            "--images", str(images_dir),
+            "--source", "game-a",
+            "--run-id", "crop-1",
+            "--data-dir", str(tmp_path / "data"),
+            "--ocr-mode", "tesseract",
+            "--autocrop",
+        ],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "Autocrop: 1 image(s) cropped" in result.output
+    assert seen_regions["001.png"] is not None
+    assert seen_regions["002.png"] is None
+    payload = json.loads((tmp_path / "data" / "game-a" / "crop-1" / "scan.json").read_text(encoding="utf-8"))
+    records = {Path(record["image"]).name: record for record in payload["records"]}
+    assert records["001.png"]["crop_box"] == list(seen_regions["001.png"])
+    assert records["002.png"]["crop_box"] is None
+    assert "MP per image" in result.output
+    assert all("seconds" not in record.get("ocr_info", {}) for record in records.values())
+
+
+def test_scan_sidecar_json_is_reproducible_and_skips_image_headers(tmp_path: Path,
+                                                                   monkeypatch: pytest.MonkeyPatch):
+    from jp_anki_builder import scan as scan_module
+
+    images_dir = tmp_path / "images"
+    images_dir.mkdir()
+    for name in ("001", "002"):
+        (images_dir / f"{name}.png").write_bytes(b"not an image")
+        (images_dir / f"{name}.txt").write_text("冒険に行く", encoding="utf-8")
+
+    def no_header_reads(*args, **kwargs):
+        raise AssertionError("sidecar OCR does not read images")
+
+    monkeypatch.setattr(scan_module, "image_pixels", no_header_reads)
+    artifacts = []
+    for attempt in range(2):
+        result = CliRunner().invoke(
+            app,
+            [
+                "scan", "--images", str(images_dir), "--source", "game-a", "--run-id", "ch01",
+                "--data-dir", str(tmp_path / "data"), "--ocr-mode", "sidecar", "--no-ocr-cache",
+            ],
+        )
+        assert result.exit_code == 0, result.output
+        artifacts.append((tmp_path / "data" / "game-a" / "ch01" / "scan.json").read_text(encoding="utf-8"))
+
+    assert "MP per image" not in result.output
+    assert artifacts[0] == artifacts[1]
+
+
+def test_scan_ocrs_each_configured_roi_as_sub_record(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    from PIL import Image
+
+    from jp_anki_builder import scan as scan_module
+    from jp_anki_builder.project_config import set_config
+
+    images_dir = tmp_path / "images"
+    images_dir.mkdir()
+    Image.new("RGB", (1280, 720)).save(images_dir / "001.png")
+    Image.new("RGB", (640, 360)).save(images_dir / "002.png")
+    data_dir = tmp_path / "data"
+    set_config("roi", "dialogue=0,0.75,1,1;speaker=40,500,400,540", data_dir=str(data_dir), source="game-a")
+
+    texts = {(0, 540, 1280, 720): "冒険に行く", (40, 500, 400, 540): "勇者"}
+    calls: list[tuple[str, tuple | None]] = []
+
+    class RegionProvider:
+        def extract_text_candidates(self, image_path: Path, top_n: int = 8, region=None) -> list[str]:
+            calls.append((image_path.name, region))
+            return [texts.get(region, "魔法")]
+
+    monkeypatch.setattr(
+        scan_module,
+        "build_ocr_provider",
+        lambda mode, language="jpn", tesseract_cmd=None, preprocess=True, **kwargs: RegionProvider(),
+    )
+
+    result = CliRunner().invoke(
+        app,
+        [
+            "scan",
+            "--images", str(images_dir),
+            "--source", "game-a",
+            "--run-id", "roi-1",
+            "--data-dir", str(data_dir),
+            "--ocr-mode", "tesseract",
+            "--autocrop",
+        ],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "[INFO] Configured roi rectangles replace --autocrop for this scan" in result.output
+    assert "ROI: 1 image(s) OCR'd by configured region, 1 scanned whole" in result.output
+    # 002.png is too small for the absolute speaker box, so it is OCR'd whole.
+    assert calls == [("001.png", (0, 540, 1280, 720)), ("001.png", (40, 500, 400, 540)), ("002.png", None)]
+    payload = json.loads((data_dir / "game-a" / "roi-1" / "scan.json").read_text(encoding="utf-8"))
+    records = {Path(record["image"]).name: record for record in payload["records"]}
+    regions = records["001.png"]["regions"]
+    assert [(region["name"], region["box"], region["text"]) for region in regions] == [
+        ("dialogue", [0, 540, 1280, 720], "冒険に行く"),
+        ("speaker", [40, 500, 400, 540], "勇者"),
+    ]
+    assert records["001.png"]["text"] == "冒険に行く\n勇者"
+    assert {"冒険", "勇者"} <= set(records["001.png"]["candidates"])
+    assert "regions" not in records["002.png"]
+
+
+def test_scan_cascade_reports_escalations_and_keeps_fast_text(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    from jp_anki_builder import scan as scan_module
+
+    images_dir = tmp_path / "images"
+    images_dir.mkdir()
+    (images_dir / "001.png").write_bytes(b"clean")
+    (images_dir / "002.png").write_bytes(b"noisy")
+
+    class FakeCascade:
+        known_ratio = None
+
+        def extract_text_candidates(self, image_path: Path, top_n: int = 8) -> list[str]:
+            escalated = image_path.name == "002.png"
+            fast_text = "勇者" if not escalated else "?l"
+            self.last_info = {"fast_text": fast_text, "escalated": escalated}
+            assert self.known_ratio is not None
+            return ["冒険" if escalated else "勇者"]
+
+    monkeypatch.setattr(
+        scan_module,
+        "build_ocr_provider",
+        lambda mode, language="jpn", tesseract_cmd=None, preprocess=True, **kwargs: FakeCascade(),
+    )
+
+    result = CliRunner().invoke(
+        app,
+        [
+            "scan",
+            "--images", str(images_dir),
+            "--source", "game-a",
+            "--run-id", "cascade-1",
+            "--data-dir", str(tmp_path / "data"),
+            "--ocr-mode", "cascade",
+            "--no-daemon",
+        ],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "Cascade: 1 of 2 image(s) escalated from Tesseract to manga-ocr" in result.output
+    payload = json.loads((tmp_path / "data" / "game-a" / "cascade-1" / "scan.json").read_text(encoding="utf-8"))
+    escalated = payload["records"][1]
+    assert escalated["text"] == "冒険"
+    assert escalated["ocr_info"]["fast_text"] == "?l"
+
+
+def test_scan_reads_sidecar_text_from_manifest(tmp_path: Path):
+    images_dir = tmp_path / "images"
+    images_dir.mkdir()
+    (images_dir / "001.png").write_bytes(b"fake")
+    (images_dir / "002.png").write_bytes(b"fake2")
+    manifest = tmp_path / "hook.tsv"
+    manifest.write_text("001.png\t冒険に行く\n002.png\t勇者\n", encoding="utf-8")
+
+    result = CliRunner().invoke(
+        app,
+        [
+            "scan",
+            "--images", str(images_dir),
+            "--source", "game-a",
+            "--run-id", "manifest-1",
+            "--data-dir", str(tmp_path / "data"),
+            "--ocr-mode", "sidecar",
+            "--sidecar-manifest", str(manifest),
+        ],
+    )
+
+    assert result.exit_code == 0, result.output
+    payload = json.loads((tmp_path / "data" / "game-a" / "manifest-1" / "scan.json").read_text(encoding="utf-8"))
+    assert [record["text"] for record in payload["records"]] == ["冒険に行く", "勇者"]
+
+
+def test_scan_restricts_tesseract_to_learned_combos_and_updates_stats(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    from jp_anki_builder import scan as scan_module
+
+    images_dir = tmp_path / "images"
+    images_dir.mkdir()
+    for name in ("001.png", "002.png"):
+        (images_dir / name).write_bytes(b"fake")
+    data_dir = tmp_path / "data"
+    stats_path = data_dir / "game-a" / "ocr_sweep_stats.json"
+    stats_path.parent.mkdir(parents=True)
+    stats_path.write_text(json.dumps({
+        "full_sweeps": 40,
+        "wins": {"--oem 1 --psm 6|jpn|orig": 30, "--oem 1 --psm 7|jpn|up2_thr160": 8, "--oem 1 --psm 11|jpn|orig": 2},
+    }), encoding="utf-8")
+    seen_kwargs: list[dict] = []
+
+    class LearnedProvider:
+        last_info: dict = {}
+
+        def extract_text_candidates(self, image_path: Path, top_n: int = 8) -> list[str]:
+            if image_path.name == "001.png":
+                self.last_info = {"calls": 2, "winner": ["--oem 1 --psm 6", "jpn", "orig"], "sweep": "learned"}
+            else:
+                self.last_info = {"calls": 30, "winner": ["--oem 1 --psm 6", "jpn+jpn_vert", "orig"],
+                                  "sweep": "sample", "drift": True}
+            return ["冒険"]
+
+    def fake_build(mode, language="jpn", tesseract_cmd=None, preprocess=True, **kwargs):
+        seen_kwargs.append(kwargs)
+        return LearnedProvider()
+
+    monkeypatch.setattr(scan_module, "build_ocr_provider", fake_build)
+
+    result = CliRunner().invoke(
+        app,
+        [
+            "scan",
+            "--images", str(images_dir),
+            "--source", "game-a",
+            "--run-id", "learned-1",
+            "--data-dir", str(data_dir),
+            "--ocr-mode", "tesseract",
+        ],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert seen_kwargs[0]["tesseract_combos"] == [
+        ["--oem 1 --psm 6", "jpn", "orig"],
+        ["--oem 1 --psm 7", "jpn", "up2_thr160"],
+    ]
+    assert "Learned sweep: top 2 combo(s) on 1 image(s), full-sweep samples 1 (1 drifted)" in result.output
+    saved = json.loads(stats_path.read_text(encoding="utf-8"))
+    assert saved["full_sweeps"] == 41
+    assert saved["learned"] == 1
+    assert saved["drift"] == 1
+    assert saved["wins"]["--oem 1 --psm 6|jpn+jpn_vert|orig"] == 1
+
+    shown = CliRunner().invoke(app, ["sweep-stats", "--source", "game-a", "--data-dir", str(data_dir)])
+    assert shown.exit_code == 0, shown.output
+    assert "41 full-sweep image(s), 1 learned, 1 drift sample(s) (1 drifted)" in shown.output
+    assert "* --oem 1 --psm 6 | jpn | orig: 30 (73%)" in shown.output
+
+    reset = CliRunner().invoke(app, ["sweep-stats", "--source", "game-a", "--data-dir", str(data_dir), "--reset"])
+    assert reset.exit_code == 0
+    assert not stats_path.exists()
+
+
+def test_scan_video_ocrs_sampled_frames_with_timestamps(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    import numpy as np
+    from PIL import Image
+
+    from jp_anki_builder import scan as scan_module
+    from jp_anki_builder.video import VideoFrame
+
+    video = tmp_path / "recordings" / "game-a" / "ch01.mp4"
+    video.parent.mkdir(parents=True)
+    video.write_bytes(b"fake")
+
+    def fake_decode(path: Path):
+        assert path == video
+        for i in range(60):
+            luma = np.full((90, 160), 200, dtype=np.uint8)
+            luma[40:60, 10:10 + (60 if i < 30 else 120)] = 0
+            yield VideoFrame(i / 10, luma, (640, 360), lambda luma=luma: Image.fromarray(luma))
+
+    class FrameProvider:
+        def extract_text_candidates(self, image_path: Path, top_n: int = 8) -> list[str]:
+            return ["冒険"]
+
+    monkeypatch.setattr(scan_module, "decode_video", fake_decode)
+    monkeypatch.setattr(
+        scan_module,
+        "build_ocr_provider",
+        lambda mode, language="jpn", tesseract_cmd=None, preprocess=True, **kwargs: FrameProvider(),
+    )
+
+    data_dir = tmp_path / "data"
+    result = CliRunner().invoke(
+        app,
+        ["scan", "--video", str(video), "--data-dir", str(data_dir), "--ocr-mode", "tesseract", "--no-ocr-cache"],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "Video: 2 frame(s) with changed text sampled from 60 decoded" in result.output
+    payload = json.loads((data_dir / "game-a" / "ch01" / "scan.json").read_text(encoding="utf-8"))
+    records = payload["records"]
+    assert [record["frame"] for record in records] == [3, 33]
+    assert [record["timestamp"] for record in records] == [0.3, 3.3]
+    assert all(record["video"] == str(video) for record in records)
+    assert all(Path(record["image"]).parent == data_dir / "game-a" / "ch01" / "frames" for record in records)
+
+
+def test_scan_video_ocrs_frames_while_the_video_is_still_decoding(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    import threading
+
+    import numpy as np
+    from PIL import Image
+
+    from jp_anki_builder import scan as scan_module
+    from jp_anki_builder.video import VideoFrame
+
+    video = tmp_path / "recordings" / "game-a" / "ch01.mp4"
+    video.parent.mkdir(parents=True)
+    video.write_bytes(b"fake")
+    first_ocr = threading.Event()
+    ocr_before_decoded = []
+
+    def fake_decode(path: Path):
+        for i in range(60):
+            if i == 50:
+                # Both text changes are sampled by now; decoding waits for OCR.
+                ocr_before_decoded.append(first_ocr.wait(timeout=10))
+            luma = np.full((90, 160), 200, dtype=np.uint8)
+            luma[40:60, 10:10 + (60 if i < 30 else 120)] = 0
+            yield VideoFrame(i / 10, luma, (640, 360), lambda luma=luma: Image.fromarray(luma))
+
+    class FrameProvider:
+        def extract_text_candidates(self, image_path: Path, top_n: int = 8) -> list[str]:
+            first_ocr.set()
+            return ["冒険"]
+
+    monkeypatch.setattr(scan_module, "decode_video", fake_decode)
+    monkeypatch.setattr(
+        scan_module,
+        "build_ocr_provider",
+        lambda mode, language="jpn", tesseract_cmd=None, preprocess=True, **kwargs: FrameProvider(),
+    )
+
+    data_dir = tmp_path / "data"
+    result = CliRunner().invoke(
+        app,
+        [
+            "scan", "--video", str(video), "--data-dir", str(data_dir), "--ocr-mode", "tesseract",
+            "--no-ocr-cache", "--ocr-batch-size", "1",
+        ],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert ocr_before_decoded == [True]
+    payload = json.loads((data_dir / "game-a" / "ch01" / "scan.json").read_text(encoding="utf-8"))
+    assert [record["frame"] for record in payload["records"]] == [3, 33]
+
+
+def test_scan_requires_exactly_one_of_images_and_video(tmp_path: Path):
+    result = CliRunner().invoke(app, ["scan", "--data-dir", str(tmp_path / "data")])
+
+    assert result.exit_code != 0
+    assert "exactly one of --images or --video" in result.output
+
+
+def test_scan_sequential_diff_reuses_unchanged_and_crops_partial_changes(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    from PIL import Image, ImageDraw
+
+    from jp_anki_builder import scan as scan_module
+
+    images_dir = tmp_path / "images"
+    images_dir.mkdir()
+
+    def frame(lines: int) -> Image.Image:
+        image = Image.new("RGB", (640, 360), (30, 30, 60))
+        draw = ImageDraw.Draw(image)
+        draw.rectangle((20, 200, 620, 345), fill=(240, 240, 240))
+        for row in range(lines):
+            draw.rectangle((40, 215 + row * 40, 580, 235 + row * 40), fill=(0, 0, 0))
+        return image
+
+    frame(1).save(images_dir / "001.png")
+    frame(1).save(images_dir / "002.png")
+    frame(2).save(images_dir / "003.png")
+
+    seen_regions: dict[str, tuple | None] = {}
+
+    class RegionProvider:
+        def extract_text_candidates(self, image_path: Path, top_n: int = 8, region=None) -> list[str]:
+            seen_regions[image_path.name] = region
+            return ["冒険"]
+
+    monkeypatch.setattr(
+        scan_module,
+        "build_ocr_provider",
+        lambda mode, language="jpn", tesseract_cmd=None, preprocess=True, **kwargs: RegionProvider(),
+    )
+
+    result = CliRunner().invoke(
+        app,
+        [
+            "scan",
+            "--images", str(images_dir),
+            "--source", "vn-a",
+            "--run-id", "diff-1",
+            "--data-dir", str(tmp_path / "data"),
+            "--ocr-mode", "tesseract",
+            "--no-ocr-cache",
+            "--sequential-diff",
+        ],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "Sequential diff: 1 image(s) unchanged (OCR skipped), 1 OCR'd on the changed box only, 1 OCR'd whole" in (
+        result.output
+    )
+    assert set(seen_regions) == {"001.png", "003.png"}
+    assert seen_regions["001.png"] is None
+    left, top, right, bottom = seen_regions["003.png"]
+    assert top <= 255 and bottom >= 275 and top > 200
+    assert left <= 40 and right >= 580
+    payload = json.loads((tmp_path / "data" / "vn-a" / "diff-1" / "scan.json").read_text(encoding="utf-8"))
+    records = {Path(record["image"]).name: record for record in payload["records"]}
+    assert Path(records["002.png"]["unchanged_from"]).name == "001.png"
+    assert records["002.png"]["text"] == records["001.png"]["text"]
+    assert records["003.png"]["diff_box"] == list(seen_regions["003.png"])
+
+
+def test_scan_workers_keep_input_order_and_resume(tmp_path: Path):
+    images_dir = tmp_path / "images"
+    images_dir.mkdir()
+    words = ["冒険", "勇者", "魔法", "王様", "剣士", "宝箱", "迷宮"]
+    for i, word in enumerate(words):
+        image = images_dir / f"panel{i}.png"
+        image.write_bytes(b"fake")
+        image.with_suffix(".txt").write_text(f"{word}に行く", encoding="utf-8")
+    data_dir = tmp_path / "data"
+
+    def scan(run_id: str, *extra: str):
+        return CliRunner().invoke(
+            app,
+            [
+                "scan", "--images", str(images_dir), "--source", "game-a", "--run-id", run_id,
+                "--data-dir", str(data_dir), "--ocr-mode", "sidecar", "--ocr-batch-size", "2", *extra,
+            ],
+        )
+
+    assert scan("serial").exit_code == 0
+    serial = json.loads((data_dir / "game-a" / "serial" / "scan.json").read_text(encoding="utf-8"))
+    # An interrupted parallel run that got through the first three images.
+    partial = dict(serial, records=serial["records"][:3])
+    (data_dir / "game-a" / "parallel").mkdir(parents=True)
+    (data_dir / "game-a" / "parallel" / "scan.json").write_text(json.dumps(partial), encoding="utf-8")
+
+    result = scan("parallel", "--workers", "2", "--resume")
+
+    assert result.exit_code == 0, result.output
+    assert "[INFO] Workers: OCR and tokenization ran in 2 worker processes." in result.output
+    parallel = json.loads((data_dir / "game-a" / "parallel" / "scan.json").read_text(encoding="utf-8"))
+    assert [Path(r["image"]).name for r in parallel["records"]] == [f"panel{i}.png" for i in range(7)]
+    assert [r["candidates"] for r in parallel["records"]] == [r["candidates"] for r in serial["records"]]
+    assert parallel["candidates"] == serial["candidates"]
+
+
+def test_scan_pipelined_stages_keep_order_with_per_thread_providers(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    from jp_anki_builder import scan as scan_module
+
+    images_dir = tmp_path / "images"
+    images_dir.mkdir()
+    words = ["冒険", "勇者", "魔法", "王様", "剣士", "宝箱", "迷宮", "洞窟", "魔王"]
+    for i in range(len(words)):
+        (images_dir / f"panel{i}.png").write_bytes(f"fake{i}".encode())
+    providers = []
+
+    class Provider:
+        def __init__(self):
+            self.last_info: dict = {}
+            providers.append(self)
+
+        def cache_version(self) -> str:
+            return "fake-1"
+
+        def extract_text_candidates(self, image_path: Path, top_n: int = 8) -> list[str]:
+            index = int(image_path.stem.removeprefix("panel"))
+            self.last_info = {"calls": index + 1}
+            return [f"{words[index]}に行く"]
+
+    monkeypatch.setattr(
+        scan_module,
+        "build_ocr_provider",
+        lambda mode, language="jpn", tesseract_cmd=None, preprocess=True, **kwargs: Provider(),
+    )
+    data_dir = tmp_path / "data"
+
+    def scan(run_id: str):
+        return CliRunner().invoke(
+            app,
+            [
+                "scan", "--images", str(images_dir), "--source", "game-a", "--run-id", run_id,
+                "--data-dir", str(data_dir), "--ocr-mode", "tesseract", "--ocr-batch-size", "2",
+                "--pipelined", "--ocr-threads", "2", "--nlp-threads", "2",
+            ],
+        )
+
+    result = scan("first")
+
+    assert result.exit_code == 0, result.output
+    assert "[INFO] Pipeline stage utilization: read " in result.output
+    assert "ocr " in result.output and "(2 threads)" in result.output
+    assert len(providers) == 2
+    payload = json.loads((data_dir / "game-a" / "first" / "scan.json").read_text(encoding="utf-8"))
+    assert [Path(r["image"]).name for r in payload["records"]] == [f"panel{i}.png" for i in range(len(words))]
+    assert [r["ocr_info"]["calls"] for r in payload["records"]] == list(range(1, len(words) + 1))
+    assert [r["text"] for r in payload["records"]] == [f"{word}に行く" for word in words]
+    assert payload["candidates"][:2] == ["冒険", "行く"]
+
+    # The read stage answers a repeat scan from the OCR cache.
+    rescan = scan("second")
+    assert rescan.exit_code == 0, rescan.output
+    assert "OCR cache: 9 hit(s), 0 miss(es)" in rescan.output
+
+
+def test_scan_pipelined_keeps_one_ocr_thread_for_manga_ocr(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    from jp_anki_builder import scan as scan_module
+
+    images_dir = tmp_path / "images"
+    images_dir.mkdir()
+    for i in range(4):
+        (images_dir / f"panel{i}.png").write_bytes(f"fake{i}".encode())
+    providers = []
+
+    class Provider:
+        def __init__(self):
+            providers.append(self)
+
+        def extract_text(self, image_path: Path) -> str:
+            return "冒険"
+
+    def fake_build(mode, language="jpn", tesseract_cmd=None, preprocess=True, **kwargs):
+        return Provider()
+
+    monkeypatch.setattr(scan_module, "build_ocr_provider", fake_build)
+
+    result = CliRunner().invoke(
+        app,
+        [
+            "scan", "--images", str(images_dir), "--source", "game-a", "--run-id", "one-model",
+            "--data-dir", str(tmp_path / "data"), "--ocr-mode", "manga-ocr",
+            "--pipelined", "--ocr-threads", "3",
+        ],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert len(providers) == 1
+    assert "ocr " in result.output and "(3 threads)" not in result.output
+    assert "[INFO] manga-ocr runs one model per process; using 1 OCR thread instead of 3" in result.output
+
+
+def test_scan_stream_discovery_scans_folders_in_natural_order(tmp_path: Path):
+    images_dir = tmp_path / "images"
+    texts = {"p2.png": "冒険", "p10.png": "勇者", "ch1/p1.png": "魔法", "ch1/p3.png": "冒険"}
+    for name, text in texts.items():
+        image = images_dir / name
+        image.parent.mkdir(parents=True, exist_ok=True)
+        image.write_bytes(b"fake")
+        image.with_suffix(".txt").write_text(text, encoding="utf-8")
+    # Folder listings are reused once the folder has been unchanged for a moment.
+    for folder in (images_dir, images_dir / "ch1"):
+        stat = os.stat(folder)
+        os.utime(folder, ns=(stat.st_atime_ns, stat.st_mtime_ns - 10 * 10**9))
+    data_dir = tmp_path / "data"
+
+    def scan(run_id: str):
+        return CliRunner().invoke(
+            app,
+            [
+                "scan", "--images", str(images_dir), "--source", "game-a", "--run-id", run_id,
+                "--data-dir", str(data_dir), "--ocr-mode", "sidecar", "--stream-discovery",
+            ],
+        )
+
+    result = scan("first")
+
+    assert result.exit_code == 0, result.output
+    assert "[INFO] Discovery: 2 folder(s) listed, 0 unchanged since the last run" in result.output
+    payload = json.loads((data_dir / "game-a" / "first" / "scan.json").read_text(encoding="utf-8"))
+    assert [Path(r["image"]).relative_to(images_dir).as_posix() for r in payload["records"]] == [
+        "p2.png", "p10.png", "ch1/p1.png", "ch1/p3.png",
+    ]
+    assert payload["image_count"] == 4
+    assert payload["candidates"] == ["冒険", "勇者", "魔法"]
+
+    repeat = scan("second")
+    assert repeat.exit_code == 0, repeat.output
+    assert "[INFO] Discovery: 0 folder(s) listed, 2 unchanged since the last run" in repeat.output
+
+
+def test_scan_stream_discovery_reports_the_image_count_as_folders_are_found(tmp_path: Path,
+                                                                            monkeypatch: pytest.MonkeyPatch):
+    from jp_anki_builder import scan as scan_module
+
+    images_dir = tmp_path / "images"
+    for name in ("p1.png", "p2.png", "ch1/p1.png", "ch1/p2.png", "ch1/p3.png"):
+        image = images_dir / name
+        image.parent.mkdir(parents=True, exist_ok=True)
+        image.write_bytes(b"fake")
+        image.with_suffix(".txt").write_text("冒険", encoding="utf-8")
+    # One wave per folder, instead of whatever the walker thread has found meanwhile.
+    monkeypatch.setattr(scan_module, "in_background", iter)
+
+    result = CliRunner().invoke(
+        app,
+        [
+            "scan", "--images", str(images_dir), "--source", "game-a", "--run-id", "ch01",
+            "--data-dir", str(tmp_path / "data"), "--ocr-mode", "sidecar", "--stream-discovery",
+        ],
+    )
+
+    assert result.exit_code == 0, result.output
+    progress = [line for line in result.output.splitlines() if line.startswith("[INFO] Discovered")]
+    assert progress == ["[INFO] Discovered 2 image(s) so far", "[INFO] Discovered 5 image(s) so far"]
+    assert "[OK] I processed 5 image(s)." in result.output
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import random
+import threading
+import time
+
+import pytest
+
+from jp_anki_builder.stages import Stage, run_stages
+
+
+def test_run_stages_keeps_input_order_across_threads():
+    def jitter(value):
+        time.sleep(random.uniform(0, 0.003))
+        return value
+
+    stats: dict[str, float] = {}
+    stages = [
+        Stage("double", lambda _, value: jitter(value * 2), threads=3),
+        Stage("label", lambda state, value: f"{state}:{jitter(value)}", threads=2, setup=lambda i: "t"),
+    ]
+
+    out = list(run_stages(range(50), stages, stats=stats))
+
+    assert out == [f"t:{value * 2}" for value in range(50)]
+    assert stats["stage_double_threads"] == 3
+    assert stats["stage_label_threads"] == 2
+    assert 0 <= stats["stage_double_util"] <= 1
+    assert "stage_write_util" in stats
+
+
+def test_run_stages_applies_back_pressure_to_the_source():
+    pulled = []
+
+    def source():
+        for value in range(1000):
+            pulled.append(value)
+            yield value
+
+    results = run_stages(source(), [Stage("same", lambda _, value: value)], queue_size=2)
+    assert next(results) == 0
+    time.sleep(0.05)
+
+    # A consumer that stops after one result holds the source to a few items.
+    assert len(pulled) < 10
+    results.close()
+
+
+def test_run_stages_raises_stage_errors_at_their_position():
+    seen = []
+
+    def fail_on_three(_, value):
+        if value == 3:
+            raise ValueError("bad item")
+        return value
+
+    with pytest.raises(ValueError, match="bad item"):
+        for value in run_stages(range(10), [Stage("check", fail_on_three, threads=2)]):
+            seen.append(value)
+
+    assert seen == [0, 1, 2]
+
+
+def test_run_stages_builds_state_once_per_thread():
+    setups = []
+    lock = threading.Lock()
+
+    def setup(index):
+        with lock:
+            setups.append(index)
+        return index
+
+    list(run_stages(range(20), [Stage("work", lambda state, value: value, threads=3, setup=setup)]))
+
+    assert sorted(setups) == [0, 1, 2]
+
+
+def test_run_stages_threads_exit_when_the_consumer_raises():
+    def consume():
+        stages = [Stage("early", lambda _, value: value, threads=2), Stage("late", lambda _, value: value)]
+        for value in run_stages(range(200), stages, queue_size=1):
+            if value == 2:
+                raise RuntimeError("write failed")
+
+    with pytest.raises(RuntimeError, match="write failed"):
+        consume()
+
+    # Stage threads blocked on full queues see the stop and exit.
+    def running():
+        return [thread for thread in threading.enumerate() if thread.name.startswith(("stage-early", "stage-late"))]
+
+    deadline = time.monotonic() + 2
+    while running() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert not running()
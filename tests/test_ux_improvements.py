@@ -82,6 +82,22 @@ def test_defaults_merge():
     assert merged.online_dict == "off"
 
 
+def test_resolve_defaults_builds_scan_options_from_config_and_flags(tmp_path: Path):
+    from jp_anki_builder.cli import _resolve_defaults
+    from jp_anki_builder.scan import ScanOptions
+
+    data_dir = str(tmp_path)
+    set_config("tesseract_search", "tiered", data_dir=data_dir)
+    set_config("workers", "3", data_dir=data_dir)
+    set_config("no_daemon", "true", data_dir=data_dir, source="game-a")
+
+    d = _resolve_defaults(images="shots", source="game-a", run_id="ch1", data_dir=data_dir,
+                          ocr_mode="tesseract", workers=2, no_preprocess=None)
+
+    assert d["source"] == "game-a" and d["run_id"] == "ch1"
+    assert d["scan"] == ScanOptions(ocr_mode="tesseract", tesseract_search="tiered", workers=2, use_daemon=False)
+
+
 # --- Auto-derive in CLI ---
 
 def test_run_auto_derives_source_and_run_id(tmp_path: Path):
@@ -188,6 +204,22 @@ def test_config_set_rejects_invalid_key(tmp_path: Path):
         set_config("bad_key", "value", data_dir=str(tmp_path))
 
 
+def test_config_set_coerces_integer_keys(tmp_path: Path):
+    updated = set_config("tesseract_workers", "4", data_dir=str(tmp_path))
+    assert updated["tesseract_workers"] == 4
+    assert load_project_config(data_dir=str(tmp_path)).tesseract_workers == 4
+
+    with pytest.raises(ValueError, match="expects an integer"):
+        set_config("tesseract_workers", "many", data_dir=str(tmp_path))
+
+
+def test_config_set_validates_tesseract_search(tmp_path: Path):
+    assert set_config("tesseract_search", "quick", data_dir=str(tmp_path))["tesseract_search"] == "quick"
+
+    with pytest.raises(ValueError, match="expects one of full, tiered, quick"):
+        set_config("tesseract_search", "fast", data_dir=str(tmp_path))
+
+
 def test_config_set_source_level(tmp_path: Path):
     data_dir = str(tmp_path)
     (tmp_path / "Miharu").mkdir()
@@ -223,3 +255,37 @@ def test_config_cli_set_and_show(tmp_path: Path):
     ])
     assert result.exit_code == 0
     assert "removed ocr_mode" in result.output
+
+
+def test_config_set_roi_parses_named_rectangles(tmp_path: Path):
+    updated = set_config("roi", "dialogue=0.05,0.7,0.95,0.98; name=40,600,400,660", data_dir=str(tmp_path))
+    assert updated["roi"] == {"dialogue": [0.05, 0.7, 0.95, 0.98], "name": [40, 600, 400, 660]}
+    assert load_project_config(data_dir=str(tmp_path)).roi == updated["roi"]
+
+    with pytest.raises(ValueError, match="four values"):
+        set_config("roi", "dialogue=0.1,0.2,0.3", data_dir=str(tmp_path))
+    with pytest.raises(ValueError, match="empty"):
+        set_config("roi", "dialogue=0.9,0.7,0.1,0.98", data_dir=str(tmp_path))
+
+
+def test_config_cli_set_roi_validates_against_sample(tmp_path: Path):
+    from PIL import Image
+
+    sample = tmp_path / "sample.png"
+    Image.new("RGB", (1280, 720)).save(sample)
+    data_dir = str(tmp_path / "data")
+
+    result = CliRunner().invoke(app, [
+        "config", "set", "roi", "dialogue=0,0.75,1,1",
+        "--sample", str(sample), "--data-dir", data_dir, "--source", "game-a",
+    ])
+    assert result.exit_code == 0, result.output
+    assert "roi dialogue: pixels (0, 540, 1280, 720), 25% of the sample frame" in result.output
+
+    result = CliRunner().invoke(app, [
+        "config", "set", "roi", "dialogue=0,600,1920,1080",
+        "--sample", str(sample), "--data-dir", data_dir, "--source", "game-a",
+    ])
+    assert result.exit_code == 1
+    assert "extends past the 1280x720 frame" in result.output
+    assert get_config(data_dir=data_dir, source="game-a")["roi"] == {"dialogue": [0, 0.75, 1, 1]}
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import sys
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from jp_anki_builder.video import VideoFrame, decode_video, sample_frames
+
+_FPS = 30
+
+
+def _frame(t: float, chars: int, line: int = 0, corner: int = 0) -> VideoFrame:
+    """320x180 frame: a grey scene with an animated corner and a dialogue box
+    showing *chars* glyph blocks of dialogue line *line*."""
+    luma = np.full((180, 320), 90, dtype=np.uint8)
+    luma[:40, :40] = corner
+    luma[120:170, 10:310] = 235
+    for glyph in range(chars):
+        x = 20 + glyph * 24
+        top = 130 + (line % 2) * 12
+        luma[top:top + 16, x:x + 16] = 20
+    return VideoFrame(t, luma, (1280, 720), lambda: Image.fromarray(luma))
+
+
+def _clip(*segments: tuple[float, float, Callable[[float], VideoFrame]]) -> list[VideoFrame]:
+    frames = []
+    for start, end, make in segments:
+        for i in range(round(start * _FPS), round(end * _FPS)):
+            frames.append(make(i / _FPS))
+    return frames
+
+
+def test_sample_frames_keeps_one_settled_frame_per_dialogue_line(tmp_path: Path):
+    clip = _clip(
+        (0.0, 1.0, lambda t: _frame(t, 0)),
+        # Typewriter reveal, then the full line holds.
+        (1.0, 1.6, lambda t: _frame(t, 1 + int((t - 1.0) * 20))),
+        (1.6, 3.0, lambda t: _frame(t, 12)),
+        (3.0, 5.0, lambda t: _frame(t, 9, line=1)),
+    )
+    stats: dict[str, float] = {}
+
+    # The dialogue box in full-resolution pixels; it is empty for the first second.
+    sampled = list(sample_frames(clip, tmp_path / "frames", regions=[[40, 480, 1240, 680]], stats=stats))
+
+    assert len(sampled) == 2
+    assert 1.6 <= sampled[0].timestamp <= 2.2
+    assert 3.0 <= sampled[1].timestamp <= 3.6
+    assert all(frame.path.exists() for frame in sampled)
+    assert sampled[0].path.name == f"t{round(sampled[0].timestamp * 1000):09d}.png"
+    assert stats["video_frames"] == len(clip)
+    assert stats["video_sampled"] == 2
+
+
+def test_sample_frames_ignores_motion_outside_roi(tmp_path: Path):
+    # The corner flickers constantly while the dialogue line stays put.
+    clip = _clip((0.0, 4.0, lambda t: _frame(t, 8, corner=255 if int(t * _FPS) % 2 else 0)))
+
+    whole = list(sample_frames(clip, tmp_path / "whole"))
+    boxed = list(sample_frames(clip, tmp_path / "boxed", regions=[[40, 480, 1240, 680]]))
+
+    # Without roi the flicker keeps the frame from settling until the 3s cap.
+    assert [frame.timestamp for frame in boxed] == [0.3]
+    assert [frame.timestamp for frame in whole] == [3.0]
+
+
+def test_decode_video_without_pyav_explains_install(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setitem(sys.modules, "av", None)
+
+    with pytest.raises(ValueError, match=r"\[video\]"):
+        next(decode_video(tmp_path / "clip.mp4"))
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from jp_anki_builder.cli import app
+from jp_anki_builder.discovery import DiscoveryManifest
+from jp_anki_builder.watch import ImageWatcher
+
+_IMAGES = {".png"}
+
+
+def _shot(path: Path, text: str, age: float = 0.0) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.with_suffix(".txt").write_text(text, encoding="utf-8")
+    path.write_bytes(b"fake")
+    if age:
+        written = time.time() - age
+        os.utime(path, (written, written))
+
+
+@pytest.mark.parametrize("use_inotify", [False, True])
+def test_watcher_yields_existing_images_then_new_ones_once_settled(tmp_path: Path, use_inotify: bool):
+    _shot(tmp_path / "p2.png", "冒険", age=5)
+    _shot(tmp_path / "p10.png", "勇者", age=5)
+    watcher = ImageWatcher(tmp_path, _IMAGES, DiscoveryManifest(tmp_path / "manifest.json"),
+                           poll_interval=0.05, settle=0.1, use_inotify=use_inotify)
+    batches = watcher.batches(tick=0.3, idle_exit=1.0)
+
+    assert [path.name for path in next(batches)] == ["p2.png", "p10.png"]
+    _shot(tmp_path / "ch2" / "p1.png", "魔法")
+    started = time.monotonic()
+    assert [path.relative_to(tmp_path).as_posix() for path in next(batches)] == ["ch2/p1.png"]
+    assert time.monotonic() - started < 1.0
+    # A quiet folder yields one empty batch, then ends after idle_exit.
+    assert next(batches) == []
+    assert list(batches) == []
+    watcher.close()
+
+
+def test_watch_scans_new_screenshots_and_rebuilds_the_deck(tmp_path: Path):
+    pytest.importorskip("genanki")
+
+    images_dir = tmp_path / "shots"
+    _shot(images_dir / "001.png", "冒険", age=5)
+    data_dir = tmp_path / "data"
+    dict_dir = data_dir / "dictionaries"
+    dict_dir.mkdir(parents=True)
+    (dict_dir / "offline.json").write_text(
+        json.dumps(
+            {
+                "冒険": {"reading": "ぼうけん", "meanings": ["adventure"]},
+                "勇者": {"reading": "ゆうしゃ", "meanings": ["hero"]},
+            },
+            ensure_ascii=False,
+        ),
+        encoding="utf-8",
+    )
+
+    def take_screenshot():
+        time.sleep(0.5)
+        _shot(images_dir / "002.png", "勇者")
+
+    screenshot = threading.Thread(target=take_screenshot)
+    screenshot.start()
+    result = CliRunner().invoke(
+        app,
+        [
+            "watch", "--images", str(images_dir), "--source", "game-a", "--run-id", "live",
+            "--data-dir", str(data_dir), "--ocr-mode", "sidecar", "--poll", "--poll-interval", "0.1",
+            "--rebuild", "--debounce", "0.3", "--idle-exit", "1.5",
+        ],
+    )
+    screenshot.join()
+
+    assert result.exit_code == 0, result.output
+    assert "[OK] Caught up: scanned 1 image(s) that were not in the run yet." in result.output
+    assert "[OK] 002.png: 1 candidate(s)" in result.output
+    assert "[INFO] Latency from file write to candidates:" in result.output
+    assert "[OK] Deck rebuilt: " in result.output
+    run_dir = data_dir / "game-a" / "live"
+    payload = json.loads((run_dir / "scan.json").read_text(encoding="utf-8"))
+    assert [Path(r["image"]).name for r in payload["records"]] == ["001.png", "002.png"]
+    assert payload["candidates"] == ["冒険", "勇者"]
+    assert not (run_dir / "scan.jsonl").exists()
+    review = json.loads((run_dir / "review.json").read_text(encoding="utf-8"))
+    assert review["approved_candidates"] == ["冒険", "勇者"]
+    assert (run_dir / "deck.apkg").exists()
@@ -0,0 +1,135 @@
+import json
+import os
+import signal
+import time
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from jp_anki_builder.cli import app
+from jp_anki_builder.ocr import OcrTimeout, OcrWorkerCrash
+from jp_anki_builder.watchdog import supervised_ocr_provider
+
+
+class _HangingProvider:
+    """Reads 冒険 from every image except ones named stuck*, where it hangs,
+    and crash*, where the worker process dies."""
+
+    def cache_version(self) -> str:
+        return "hanging/1"
+
+    def extract_text_candidates(self, image_path: Path, top_n: int = 8) -> list[str]:
+        if image_path.name.startswith("stuck"):
+            time.sleep(60)
+        if image_path.name.startswith("crash"):
+            os.kill(os.getpid(), signal.SIGKILL)
+        return ["冒険"]
+
+
+def _hanging_factory(mode: str, **kwargs):
+    # Module-level so the spawned worker process can import it.
+    return _HangingProvider()
+
+
+def test_supervised_provider_times_out_and_restarts_worker(tmp_path):
+    provider = supervised_ocr_provider("tesseract", 1.0, factory=_hanging_factory)
+    try:
+        assert provider.cache_version() == "hanging/1"
+        assert not hasattr(provider, "extract_text_batch")
+        assert provider.extract_text_candidates(tmp_path / "001.png") == ["冒険"]
+
+        with pytest.raises(OcrTimeout, match="stuck.png"):
+            provider.extract_text_candidates(tmp_path / "stuck.png")
+
+        assert provider.restarts == 1
+        assert provider.extract_text_candidates(tmp_path / "002.png") == ["冒険"]
+    finally:
+        provider.close()
+
+
+def test_scan_records_ocr_timeout_and_continues(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    from jp_anki_builder import scan as scan_module
+
+    images_dir = tmp_path / "images"
+    images_dir.mkdir()
+    for name in ("001.png", "stuck.png", "003.png"):
+        (images_dir / name).write_bytes(name.encode())
+    monkeypatch.setattr(
+        scan_module,
+        "supervised_ocr_provider",
+        lambda mode, timeout, **kwargs: supervised_ocr_provider(mode, timeout, factory=_hanging_factory),
+    )
+
+    result = CliRunner().invoke(
+        app,
+        [
+            "scan",
+            "--images", str(images_dir),
+            "--source", "game-a",
+            "--run-id", "timeout-1",
+            "--data-dir", str(tmp_path / "data"),
+            "--ocr-mode", "tesseract",
+            "--ocr-timeout", "1",
+            "--no-daemon",
+        ],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "OCR timeouts: 1 image(s) skipped, 1 worker restart(s)" in result.output
+    payload = json.loads((tmp_path / "data" / "game-a" / "timeout-1" / "scan.json").read_text(encoding="utf-8"))
+    records = {Path(record["image"]).name: record for record in payload["records"]}
+    assert records["stuck.png"]["ocr_timeout"] is True
+    assert records["stuck.png"]["text"] == ""
+    assert "ocr_timeout" not in records["003.png"]
+    assert records["003.png"]["text"] == "冒険"
+
+
+def test_supervised_provider_restarts_a_crashed_worker(tmp_path):
+    provider = supervised_ocr_provider("tesseract", 10.0, factory=_hanging_factory)
+    try:
+        with pytest.raises(OcrWorkerCrash, match="crash.png"):
+            provider.extract_text_candidates(tmp_path / "crash.png")
+
+        assert provider.restarts == 1
+        assert provider.extract_text_candidates(tmp_path / "002.png") == ["冒険"]
+    finally:
+        provider.close()
+
+
+def test_scan_records_a_worker_crash_and_continues(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    from jp_anki_builder import scan as scan_module
+
+    images_dir = tmp_path / "images"
+    images_dir.mkdir()
+    for name in ("001.png", "crash.png", "003.png"):
+        (images_dir / name).write_bytes(name.encode())
+    monkeypatch.setattr(
+        scan_module,
+        "supervised_ocr_provider",
+        lambda mode, timeout, **kwargs: supervised_ocr_provider(mode, timeout, factory=_hanging_factory),
+    )
+
+    result = CliRunner().invoke(
+        app,
+        [
+            "scan",
+            "--images", str(images_dir),
+            "--source", "game-a",
+            "--run-id", "crash-1",
+            "--data-dir", str(tmp_path / "data"),
+            "--ocr-mode", "tesseract",
+            "--ocr-timeout", "10",
+            "--no-daemon",
+        ],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "OCR timeouts: 0 image(s) skipped, 1 worker restart(s)" in result.output
+    assert "OCR worker crashes: 1 image(s) skipped" in result.output
+    payload = json.loads((tmp_path / "data" / "game-a" / "crash-1" / "scan.json").read_text(encoding="utf-8"))
+    records = {Path(record["image"]).name: record for record in payload["records"]}
+    assert records["crash.png"]["ocr_crashed"] is True
+    assert records["crash.png"]["text"] == ""
+    assert "ocr_crashed" not in records["003.png"]
+    assert records["003.png"]["text"] == "冒険"